@@ -28,6 +28,10 @@ DEBUG = True
 
 ALLOWED_HOSTS = ['127.0.0.1', 'localhost', '0.0.0.0']
 
+# Serve the admin and the OpenAPI schema/docs. Production settings turn both off unless asked for.
+ADMIN_ENABLED = True
+API_DOCS_ENABLED = True
+
 
 # Application definition
 
@@ -49,11 +53,17 @@ THIRD_PARTY_APPS = [
 PROJECT_APPS = [
     "transactions",
     "authentication",
+    "metrics",
+    "api_schema",
+    "replicas",
+    "logs",
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + PROJECT_APPS
 
 MIDDLEWARE = [
+    'metrics.middleware.RequestMetricsMiddleware',
+    'replicas.middleware.ReplicaReadsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -81,10 +91,15 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
+
+# Serve balance, deposit and withdraw as native async views (see transactions.async_urls).
+# Only worth enabling when running under an ASGI server such as uvicorn.
+API_ASYNC_VIEWS = os.environ.get('API_ASYNC_VIEWS', 'false').lower() == 'true'
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "authentication.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -97,11 +112,41 @@ SPECTACULAR_SETTINGS = {
     'TITLE': 'Transactions API',
     'DESCRIPTION': 'API for deposit, withdrawal, and account balance operations.',
     'VERSION': '1.0.0',
+    'ENUM_NAME_OVERRIDES': {
+        'TransactionTypeEnum': 'transactions.models.transaction.Transaction.TransactionType',
+    },
 }
 
+# The schema served at /schema/ is generated once per process. When set, it is also read from (and saved to) this
+# directory; `manage.py build_api_schema` writes it there ahead of time. Only set it where the code cannot change
+# underneath it (e.g. a built image), otherwise a stale schema would be served.
+API_SCHEMA_CACHE_DIR = os.environ.get('API_SCHEMA_CACHE_DIR') or None
+
+# Write-behind deposits: POST /api/deposit/ records a pending Transaction and answers 202 without touching the
+# balance; the apply_pending_transactions worker adds pending deposits to balances in batches.
+DEPOSIT_WRITE_BEHIND = os.environ.get('DEPOSIT_WRITE_BEHIND', 'false').lower() == 'true'
+
+# Maximum number of operations accepted by a single POST /api/transactions/batch/ request.
+TRANSACTIONS_BATCH_MAX_OPERATIONS = int(os.environ.get('TRANSACTIONS_BATCH_MAX_OPERATIONS', 1000))
+
+# Rows fetched per server-side cursor round trip, and encoded per streamed chunk, by GET /api/transactions/export/.
+TRANSACTIONS_EXPORT_CHUNK_SIZE = int(os.environ.get('TRANSACTIONS_EXPORT_CHUNK_SIZE', 2000))
+
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# By default every request opens and closes its own connection. DB_CONN_MAX_AGE keeps each worker thread's
+# connection open for that many seconds ('none' for no limit), checked before reuse when DB_CONN_HEALTH_CHECKS is
+# on. DB_POOL instead shares a psycopg connection pool (needs `psycopg[pool]`) between the threads of a process:
+# it keeps DB_POOL_MIN_SIZE to DB_POOL_MAX_SIZE connections open, and a request waits up to DB_POOL_TIMEOUT
+# seconds for a free one. Pooling and DB_CONN_MAX_AGE are exclusive.
+# DB_SERVER_SIDE_BINDING sends parameters separately from the SQL, so psycopg prepares a statement once it has
+# run DB_PREPARE_THRESHOLD times on a connection; the hot deposit, withdraw and balance statements then skip
+# parsing and planning. Prepared statements belong to the server connection, so they pay off only with persistent
+# or pooled connections, and need PgBouncer 1.21+ with max_prepared_statements in transaction pooling mode.
+_conn_max_age = os.environ.get('DB_CONN_MAX_AGE', '0')
+_prepare_threshold = os.environ.get('DB_PREPARE_THRESHOLD', '5')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -110,9 +155,166 @@ DATABASES = {
         'PASSWORD': os.environ['DB_PASSWORD'],
         'HOST': os.environ['DB_HOST'],
         'PORT': os.environ['DB_PORT'],
+        'CONN_MAX_AGE': None if _conn_max_age.lower() == 'none' else int(_conn_max_age),
+        'CONN_HEALTH_CHECKS': os.environ.get('DB_CONN_HEALTH_CHECKS', 'true').lower() == 'true',
+        'OPTIONS': {
+            'server_side_binding': os.environ.get('DB_SERVER_SIDE_BINDING', 'false').lower() == 'true',
+            'prepare_threshold': None if _prepare_threshold.lower() == 'none' else int(_prepare_threshold),
+        },
     }
 }
 
+if os.environ.get('DB_POOL', 'false').lower() == 'true':
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+    }
+
+# Read replicas, as a comma-separated list of host[:port] sharing the primary's database name and credentials.
+# Reads of DB_REPLICA_APPS models during GET/HEAD/OPTIONS requests go to one of them, picked per request; a user
+# who just made a successful write request reads from the primary for DB_REPLICA_PIN_SECONDS, which should exceed
+# the replication lag. Pins are kept in the DB_REPLICA_PIN_CACHE_ALIAS cache, which must be shared (Redis) when
+# several processes serve requests. Tests use the primary's test database for every replica.
+DB_REPLICAS = []
+for _index, _address in enumerate(filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), start=1):
+    _host, _, _port = _address.strip().partition(':')
+    DATABASES[f'replica_{_index}'] = {
+        **DATABASES['default'],
+        'HOST': _host,
+        'PORT': _port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DB_REPLICAS.append(f'replica_{_index}')
+
+DATABASE_ROUTERS = ['replicas.router.ReplicaRouter']
+DB_REPLICA_APPS = ['transactions']
+DB_REPLICA_PIN_SECONDS = int(os.environ.get('DB_REPLICA_PIN_SECONDS', 5))
+DB_REPLICA_PIN_CACHE_ALIAS = os.environ.get('DB_REPLICA_PIN_CACHE_ALIAS', 'default')
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory is per process; set REDIS_URL to share entries (and invalidations) between processes.
+# Eviction is bounded by MAX_ENTRIES locally and by the server's maxmemory-policy on Redis.
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'default',
+            'OPTIONS': {
+                'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 10000)),
+            },
+        }
+    }
+
+# Balance reads are served from this cache alias when enabled. Every write path invalidates the entry on commit, and
+# a read that raced a write never caches what it read (see transactions.services.balance_cache). The alias must be
+# shared (Redis) when several processes serve requests; with a per-process cache, the timeout bounds how long
+# other processes keep serving the previous balance.
+BALANCE_CACHE_ENABLED = os.environ.get('BALANCE_CACHE_ENABLED', 'false').lower() == 'true'
+BALANCE_CACHE_ALIAS = os.environ.get('BALANCE_CACHE_ALIAS', 'default')
+BALANCE_CACHE_TIMEOUT = int(os.environ.get('BALANCE_CACHE_TIMEOUT', 30))
+
+# Balance change notifications. With BALANCE_NOTIFICATIONS_ENABLED, every write that changes a balance sends a
+# Postgres NOTIFY, delivered when it commits, and GET /api/balance/stream/ (served with API_ASYNC_VIEWS, under ASGI)
+# pushes the new balance to the user as a server-sent event. Each process listens on one shared connection,
+# reconnecting after BALANCE_STREAM_RECONNECT_SECONDS when it is lost. Idle streams get a comment every
+# BALANCE_STREAM_KEEPALIVE_SECONDS so proxies keep them open. Postgres serializes the commits of transactions that
+# notify, so leave this off unless streams are served; when on, enable it in every process that writes.
+BALANCE_NOTIFICATIONS_ENABLED = os.environ.get('BALANCE_NOTIFICATIONS_ENABLED', 'false').lower() == 'true'
+BALANCE_STREAM_KEEPALIVE_SECONDS = float(os.environ.get('BALANCE_STREAM_KEEPALIVE_SECONDS', 15))
+BALANCE_STREAM_RECONNECT_SECONDS = float(os.environ.get('BALANCE_STREAM_RECONNECT_SECONDS', 1))
+
+# Deposits and withdrawals sent with an Idempotency-Key header are applied once; their responses are stored in the
+# IdempotencyKey table and cached here so retries are answered without touching the account. purge_idempotency_keys
+# deletes keys older than IDEMPOTENCY_KEY_RETENTION_HOURS, after which a retry is applied again.
+IDEMPOTENCY_CACHE_ALIAS = os.environ.get('IDEMPOTENCY_CACHE_ALIAS', 'default')
+IDEMPOTENCY_CACHE_TIMEOUT = int(os.environ.get('IDEMPOTENCY_CACHE_TIMEOUT', 3600))
+IDEMPOTENCY_KEY_RETENTION_HOURS = int(os.environ.get('IDEMPOTENCY_KEY_RETENTION_HOURS', 24))
+
+# Resolved tokens (with their user and account) are cached for this many seconds. Logging out, deleting a token
+# or saving its user evicts the entry immediately; with a local-memory cache other processes rely on the timeout.
+AUTH_TOKEN_CACHE_ALIAS = os.environ.get('AUTH_TOKEN_CACHE_ALIAS', 'default')
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.environ.get('AUTH_TOKEN_CACHE_TIMEOUT', 60))
+
+# Per-request timings (query count, DB, serializer, auth and view time), aggregated into per-endpoint histograms
+# served in Prometheus format at /metrics/ to the addresses below. The Server-Timing header exposes the same
+# breakdown to clients; disable it if that is not wanted.
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+METRICS_SERVER_TIMING = os.environ.get('METRICS_SERVER_TIMING', 'true').lower() == 'true'
+METRICS_ALLOWED_IPS = os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',')
+
+# Logging
+# https://docs.djangoproject.com/en/5.2/topics/logging/
+# Records are written to stderr as key=value lines (see logs.formatters). With LOG_HANDLER=background a request
+# thread only queues them and a background thread formats and writes them; LOG_HANDLER=sync does that on the
+# request thread instead, which `bench_settings --log-handlers` compares. Project loggers log at LOG_LEVEL, others
+# at WARNING. Below WARNING, LOG_SAMPLE_RATES keeps only a fraction of a logger's records and LOG_RATE_LIMITS caps
+# them per second, both given as comma-separated logger=value pairs that also cover the logger's children, e.g.
+# LOG_SAMPLE_RATES=transactions.views.balance_view=0.1 or LOG_RATE_LIMITS=transactions=100.
+
+
+def _per_logger(value: str) -> dict[str, float]:
+    pairs = (item.partition('=') for item in value.split(',') if item.strip())
+    return {name.strip(): float(setting) for name, _, setting in pairs}
+
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_HANDLER = os.environ.get('LOG_HANDLER', 'background')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'key_value': {'()': 'logs.formatters.KeyValueFormatter'},
+    },
+    'filters': {
+        'sample': {
+            '()': 'logs.filters.SamplingFilter',
+            'rates': _per_logger(os.environ.get('LOG_SAMPLE_RATES', '')),
+        },
+        'rate_limit': {
+            '()': 'logs.filters.RateLimitFilter',
+            'limits': _per_logger(os.environ.get('LOG_RATE_LIMITS', '')),
+        },
+    },
+    'handlers': {
+        'background': {
+            '()': 'logs.handlers.BackgroundHandler',
+            'stream': 'ext://sys.stderr',
+            'maxsize': int(os.environ.get('LOG_QUEUE_SIZE', 10000)),
+            'formatter': 'key_value',
+            'filters': ['sample', 'rate_limit'],
+        },
+        'sync': {
+            'class': 'logging.StreamHandler',
+            'stream': 'ext://sys.stderr',
+            'formatter': 'key_value',
+            'filters': ['sample', 'rate_limit'],
+        },
+    },
+    'root': {
+        'handlers': [LOG_HANDLER],
+        'level': 'WARNING',
+    },
+    'loggers': {
+        'django': {
+            'handlers': [LOG_HANDLER],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        **{app: {'level': LOG_LEVEL} for app in PROJECT_APPS},
+    },
+}
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -1,2 +1 @@
 from config.settings.base import *  # noqa: F403
-
@@ -0,0 +1,12 @@
+"""
+Settings for the test suite, selected in pyproject.toml: the local settings plus what only tests use.
+"""
+from config.settings.local import *  # noqa: F403
+from config.settings.local import DATABASES
+
+# A second database on the local server, standing in for a replica in the replica router tests. It is not in
+# DB_REPLICAS, so nothing is routed to it unless a test does so.
+DATABASES['standin_replica'] = {
+    **DATABASES['default'],
+    'NAME': f"{DATABASES['default']['NAME']}_replica",
+}
@@ -14,25 +14,53 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.conf import settings
 from django.urls import include, path
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 
-urlpatterns = [
+from metrics.views import metrics_view
 
-    path('admin/', admin.site.urls),
+api_urlpatterns = [
     path("api/", include("transactions.urls"), name="apis"),
     path("auth/", include("authentication.urls"), name="auth"),
-    path("schema/", SpectacularAPIView.as_view(), name="full-schema"),
-    path(
-        "schema/swagger-ui/",
-        SpectacularSwaggerView.as_view(url_name="full-schema"),
-        name="swagger-ui-internal",
-    ),
-    path(
-        "schema/redoc/",
-        SpectacularRedocView.as_view(url_name="full-schema"),
-        name="redoc",
-    ),
+]
+
+# The async views expose exactly the same API, so the schema is always generated from the DRF views.
+if settings.API_ASYNC_VIEWS:
+    served_api_urlpatterns = [
+        path("api/", include("transactions.async_urls"), name="apis"),
+        path("auth/", include("authentication.urls"), name="auth"),
+    ]
+else:
+    served_api_urlpatterns = api_urlpatterns
 
+urlpatterns = [
+    *served_api_urlpatterns,
+    path("metrics/", metrics_view, name="metrics"),
 ]
+
+# The admin and the docs are imported only when mounted, so an API-only process never loads them.
+if settings.ADMIN_ENABLED:
+    from django.contrib import admin
+
+    urlpatterns += [
+        path('admin/', admin.site.urls),
+    ]
+
+if settings.API_DOCS_ENABLED:
+    from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
+
+    from api_schema.views import CachedSpectacularAPIView
+
+    urlpatterns += [
+        path("schema/", CachedSpectacularAPIView.as_view(patterns=api_urlpatterns), name="full-schema"),
+        path(
+            "schema/swagger-ui/",
+            SpectacularSwaggerView.as_view(url_name="full-schema"),
+            name="swagger-ui-internal",
+        ),
+        path(
+            "schema/redoc/",
+            SpectacularRedocView.as_view(url_name="full-schema"),
+            name="redoc",
+        ),
+    ]
@@ -27,7 +27,7 @@ createsuperuser:
 	docker compose -f $(DC_BASE) exec app poetry run python manage.py createsuperuser
 
 populate-test-db:
-	docker compose -f $(DC_BASE) exec app poetry run python manage.py populate_test_db
+	docker compose -f $(DC_BASE) exec app poetry run python manage.py populate_test_db $(ARGS)
 
 test:
 	docker compose -f $(DC_BASE) exec app poetry run pytest
@@ -0,0 +1,81 @@
+import gzip
+import hashlib
+import os
+import threading
+
+from pathlib import Path
+
+from django.conf import settings
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+
+RENDERERS = {renderer.format: renderer for renderer in (OpenApiYamlRenderer, OpenApiJsonRenderer)}
+
+
+class SchemaDocument:
+    """One rendering of the schema, with everything needed to serve it precomputed."""
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self.gzipped = gzip.compress(content, mtime=0)
+        self.etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+_documents: dict[str, SchemaDocument] | None = None
+_lock = threading.Lock()
+
+
+def file_name(fmt: str) -> str:
+    return f"openapi.{fmt}"
+
+
+def render(patterns=None) -> dict[str, bytes]:
+    """Generate the schema by introspecting the API views and render it in every served format."""
+    if patterns is None:
+        from config.urls import api_urlpatterns as patterns
+
+    schema = SchemaGenerator(patterns=patterns).get_schema(request=None, public=True)
+    return {fmt: renderer().render(schema, renderer_context={}) for fmt, renderer in RENDERERS.items()}
+
+
+def write(rendered: dict[str, bytes], directory: Path):
+    directory.mkdir(parents=True, exist_ok=True)
+    for fmt, content in rendered.items():
+        path = directory / file_name(fmt)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+
+
+def _read(directory: Path) -> dict[str, bytes] | None:
+    try:
+        return {fmt: (directory / file_name(fmt)).read_bytes() for fmt in RENDERERS}
+    except FileNotFoundError:
+        return None
+
+
+def get_documents(patterns=None) -> dict[str, SchemaDocument]:
+    """Return the schema documents, generating them only once per process.
+
+    With API_SCHEMA_CACHE_DIR set, documents written there (by `build_api_schema` or an earlier process) are
+    served as they are, and a generated schema is saved there for the next process.
+    """
+    global _documents
+    if _documents is not None:
+        return _documents
+
+    with _lock:
+        if _documents is None:
+            directory = Path(settings.API_SCHEMA_CACHE_DIR) if settings.API_SCHEMA_CACHE_DIR else None
+            rendered = _read(directory) if directory else None
+            if rendered is None:
+                rendered = render(patterns)
+                if directory:
+                    write(rendered, directory)
+            _documents = {fmt: SchemaDocument(content) for fmt, content in rendered.items()}
+    return _documents
+
+
+def clear():
+    global _documents
+    _documents = None
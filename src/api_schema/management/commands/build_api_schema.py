@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api_schema import cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates the OpenAPI schema served at /schema/ and writes it to API_SCHEMA_CACHE_DIR, so servers "
+        "load it from disk instead of generating it. Run it whenever the API changes, e.g. when building the image."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir', type=Path, default=None, help="Directory to write to (default: API_SCHEMA_CACHE_DIR)."
+        )
+
+    def handle(self, *args, **options):
+        directory = options['output_dir'] or settings.API_SCHEMA_CACHE_DIR
+        if not directory:
+            raise CommandError("Set API_SCHEMA_CACHE_DIR or pass --output-dir.")
+
+        directory = Path(directory)
+        rendered = cache.render()
+        cache.write(rendered, directory)
+        for fmt, content in rendered.items():
+            self.stdout.write(self.style.SUCCESS(f"Wrote {directory / cache.file_name(fmt)} ({len(content)} bytes)"))
@@ -0,0 +1,74 @@
+import gzip
+import json
+import tempfile
+
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from api_schema import cache
+
+
+class CachedSchemaViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_schema_is_generated_once(self):
+        with mock.patch.object(cache, 'render', wraps=cache.render) as render:
+            first = self.client.get(reverse("full-schema"))
+            second = self.client.get(reverse("full-schema"))
+
+        render.assert_called_once()
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first['Content-Type'], 'application/vnd.oai.openapi')
+        self.assertIn(b'/api/deposit/', first.content)
+        self.assertEqual(first.content, second.content)
+
+    def test_json_is_negotiated(self):
+        response = self.client.get(reverse("full-schema"), {'format': 'json'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/vnd.oai.openapi+json')
+        self.assertIn('/api/transactions/batch/', json.loads(response.content)['paths'])
+
+    def test_etag_answers_not_modified(self):
+        etag = self.client.get(reverse("full-schema"))['ETag']
+
+        response = self.client.get(reverse("full-schema"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_gzip_when_accepted(self):
+        plain = self.client.get(reverse("full-schema"))
+        compressed = self.client.get(reverse("full-schema"), HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        self.assertEqual(compressed['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(compressed.content), plain.content)
+        self.assertEqual(compressed['ETag'], plain['ETag'])
+        self.assertIn('Accept-Encoding', compressed['Vary'])
+
+    def test_gzip_refused_with_zero_quality_is_not_used(self):
+        plain = self.client.get(reverse("full-schema"))
+        response = self.client.get(reverse("full-schema"), HTTP_ACCEPT_ENCODING='gzip;q=0, deflate')
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, plain.content)
+
+    def test_build_command_output_is_served_without_generating(self):
+        with tempfile.TemporaryDirectory() as directory:
+            call_command('build_api_schema', output_dir=directory, stdout=StringIO())
+            (Path(directory) / 'openapi.yaml').write_bytes(b'openapi: 3.0.3\n')
+
+            with override_settings(API_SCHEMA_CACHE_DIR=directory), mock.patch.object(cache, 'render') as render:
+                response = self.client.get(reverse("full-schema"))
+
+        render.assert_not_called()
+        self.assertEqual(response.content, b'openapi: 3.0.3\n')
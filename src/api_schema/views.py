@@ -0,0 +1,31 @@
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from drf_spectacular.views import SpectacularAPIView
+
+from api_schema import cache
+from transactions.services.export import accepts_gzip
+
+
+# Serves the schema generated once per process (see api_schema.cache) instead of introspecting every view on
+# each request. Content negotiation, permissions and the YAML/JSON renderings are the same as
+# SpectacularAPIView's; responses carry an ETag, answer If-None-Match with 304 and are sent gzipped when the
+# client accepts it.
+class CachedSpectacularAPIView(SpectacularAPIView):
+    def _get_schema_response(self, request):
+        renderer = request.accepted_renderer
+        document = cache.get_documents(self.patterns)[renderer.format]
+
+        if document.etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+        elif accepts_gzip(request.headers.get('Accept-Encoding', '')):
+            response = HttpResponse(document.gzipped, content_type=renderer.media_type)
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(document.content, content_type=renderer.media_type)
+
+        response['ETag'] = document.etag
+        response['Cache-Control'] = 'no-cache'
+        response['Content-Disposition'] = f'inline; filename="{self._get_filename(request, None)}"'
+        patch_vary_headers(response, ('Accept', 'Accept-Encoding'))
+        return response
@@ -0,0 +1,20 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from authentication.authentication import invalidate_cached_token
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance: Token, **kwargs):
+    invalidate_cached_token(instance.key)
+
+
+# A cached token carries a snapshot of its user, so changes such as deactivation must evict it.
+@receiver(post_save, sender=User)
+def invalidate_user_tokens(sender, instance: User, created: bool, **kwargs):
+    if created:
+        return
+    for key in Token.objects.filter(user_id=instance.pk).values_list('key', flat=True):
+        invalidate_cached_token(key)
@@ -0,0 +1,56 @@
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from authentication.authentication import token_cache_key
+from transactions.models.account import Account
+
+
+class CachedTokenAuthenticationTest(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user(username="user1", password="testpass")
+        self.token = Token.objects.create(user=self.user)
+        self.account = Account.objects.create(user=self.user, balance=100)
+
+    def _get_history(self, key=None):
+        return self.client.get(
+            reverse("transaction-history"),
+            HTTP_AUTHORIZATION=f"Token {key or self.token.key}"
+        )
+
+    def test_warm_cache_skips_token_lookup(self):
+        with self.assertNumQueries(2):  # token and user in one query + history page
+            self.assertEqual(self._get_history().status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(1):  # history page only
+            self.assertEqual(self._get_history().status_code, status.HTTP_200_OK)
+
+    def test_cache_holds_only_the_users_identity(self):
+        self._get_history()
+
+        cached = caches['default'].get(token_cache_key(self.token.key))
+
+        self.assertEqual(cached, (self.user.id, "user1", True))
+
+    def test_invalid_token_is_rejected(self):
+        response = self._get_history(key="0" * 40)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_invalidates_cached_token(self):
+        self._get_history()
+
+        response = self.client.post(reverse("logout"), HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self._get_history().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivating_user_invalidates_cached_token(self):
+        self._get_history()
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self._get_history().status_code, status.HTTP_401_UNAUTHORIZED)
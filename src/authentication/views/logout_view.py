@@ -20,6 +20,8 @@ class LogoutView(APIView):
     def post(self, request):
         try:
             token = Token.objects.get(user=request.user)
+            # Deleting the token also evicts it from the authentication cache (see authentication.signals),
+            # so it stops working immediately rather than when the cache entry expires.
             token.delete()
         except Token.DoesNotExist:
             pass  # Token may already be deleted or never created
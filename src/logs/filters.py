@@ -0,0 +1,79 @@
+import logging
+import random
+import threading
+import time
+
+
+class PerLogger:
+    """Settings keyed by logger name; a logger without its own entry uses its nearest configured ancestor's."""
+
+    def __init__(self, values: dict[str, float] | None, default: float):
+        self.values = dict(values or {})
+        self.default = default
+        self._resolved = {}
+
+    def __getitem__(self, name: str) -> float:
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        parts = name.split('.')
+        value = next(
+            (self.values[prefix] for prefix in ('.'.join(parts[:end]) for end in range(len(parts), 0, -1))
+             if prefix in self.values),
+            self.default,
+        )
+        self._resolved[name] = value
+        return value
+
+
+# Keeps a random fraction of each logger's records below WARNING, e.g. rates={'transactions.views': 0.1} keeps one
+# in ten of the views' info lines. Kept records are tagged with sample_rate so counts can be scaled back up.
+class SamplingFilter(logging.Filter):
+    def __init__(self, rates: dict[str, float] | None = None, default: float = 1.0):
+        super().__init__()
+        self.rates = PerLogger(rates, default)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates[record.name]
+        if rate >= 1:
+            return True
+        if random.random() >= rate:
+            return False
+        record.sample_rate = rate
+        return True
+
+
+# Lets through at most `limits[logger]` records per second below WARNING from each logger (a token bucket per logger
+# name), in bursts of up to one second's worth but at least one record, so limits below 1 work too: 0.1 lets one
+# record through every ten seconds. The first record let through after some were suppressed says how many with a
+# suppressed field.
+class RateLimitFilter(logging.Filter):
+    def __init__(self, limits: dict[str, float] | None = None, default: float = 0, clock=time.monotonic):
+        """A limit of 0 (the default for loggers not listed) means unlimited."""
+        super().__init__()
+        self.limits = PerLogger(limits, default)
+        self.clock = clock
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        limit = self.limits[record.name]
+        if not limit:
+            return True
+        capacity = max(limit, 1)
+        now = self.clock()
+        with self._lock:
+            tokens, updated, suppressed = self._buckets.get(record.name, (capacity, now, 0))
+            tokens = min(capacity, tokens + (now - updated) * limit)
+            if tokens < 1:
+                self._buckets[record.name] = (tokens, now, suppressed + 1)
+                return False
+            self._buckets[record.name] = (tokens - 1, now, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
@@ -0,0 +1,39 @@
+import json
+import logging
+
+from datetime import UTC, datetime
+
+# Attributes every LogRecord has; anything else on a record came from `extra=` (or a filter) and is a field.
+RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+
+def quote(value) -> str:
+    text = str(value)
+    if not text or any(char in text for char in ' "=\n'):
+        return json.dumps(text)
+    return text
+
+
+# Renders a record as one line of key=value pairs: time, level, logger and message first, then every field passed
+# with `extra=`, e.g. `logger.info("Deposit applied", extra={'user': username, 'amount': amount})`. Values are
+# only turned into strings here, so with BackgroundHandler that happens off the request thread.
+class KeyValueFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {
+            'time': datetime.fromtimestamp(record.created, UTC).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        fields.update(
+            (key, value) for key, value in vars(record).items()
+            if key not in RECORD_ATTRIBUTES and not key.startswith('_')
+        )
+        line = ' '.join(f'{key}={quote(value)}' for key, value in fields.items())
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line += '\n' + record.exc_text
+        if record.stack_info:
+            line += '\n' + self.formatStack(record.stack_info)
+        return line
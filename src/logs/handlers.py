@@ -0,0 +1,75 @@
+import logging
+import os
+import queue
+
+from logging.handlers import QueueHandler, QueueListener
+
+
+# Writes records to a stream from a background thread: the logging call only puts the record on a bounded queue,
+# and formatting and I/O happen in a QueueListener thread. When the queue is full (the writer cannot keep up),
+# records are dropped instead of blocking requests, and a warning with the number dropped is logged once there
+# is room again. The thread is started on first use in each process, so it also runs in forked workers.
+class BackgroundHandler(QueueHandler):
+    def __init__(self, stream=None, maxsize: int = 10000):
+        super().__init__(queue.Queue(maxsize))
+        self.target = logging.StreamHandler(stream)
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Left unformatted for the listener; only a traceback is rendered now, so the frames are not kept alive
+        # while the record waits.
+        if record.exc_info:
+            record.exc_text = (self.target.formatter or logging.Formatter()).formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        # Runs under the handler lock.
+        if self._pid != os.getpid():
+            self._start()
+        try:
+            if self.dropped:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                    'msg': 'Log queue full, records dropped', 'dropped': self.dropped,
+                }))
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        # A listener thread inherited through fork() is not running; neither can the queue's locks be trusted.
+        if self._pid is not None:
+            self.queue = queue.Queue(self.queue.maxsize)
+        self._pid = os.getpid()
+        self._listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+        self._listener.start()
+
+    def flush(self):
+        """Wait until every queued record has been written."""
+        self.acquire()
+        try:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+                self._listener.start()
+        finally:
+            self.release()
+        self.target.flush()
+
+    def close(self):
+        self.acquire()
+        try:
+            if self._listener is not None and self._pid == os.getpid():
+                self._listener.stop()
+            self._listener = None
+            self._pid = None
+        finally:
+            self.release()
+        self.target.close()
+        super().close()
@@ -0,0 +1,156 @@
+import io
+import json
+import logging
+import os
+import sys
+import threading
+
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from logs.filters import RateLimitFilter, SamplingFilter
+from logs.formatters import KeyValueFormatter
+from logs.handlers import BackgroundHandler
+from transactions.models.account import Account
+
+
+def make_record(name='transactions.views.balance_view', level=logging.INFO, msg="Balance requested", **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, (), None)
+    record.__dict__.update(extra)
+    return record
+
+
+class KeyValueFormatterTest(SimpleTestCase):
+    def test_renders_extra_fields_as_key_value_pairs(self):
+        record = make_record(user="user1", balance=Decimal("100.00"), errors={'amount': ['Required']})
+
+        line = KeyValueFormatter().format(record)
+
+        self.assertRegex(line, r'^time=\S+ level=info logger=transactions.views.balance_view ')
+        self.assertIn('msg="Balance requested" user=user1 balance=100.00', line)
+        self.assertIn(f'errors={json.dumps(str({"amount": ["Required"]}))}', line)
+
+    def test_appends_the_traceback(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord('x', logging.ERROR, __file__, 1, "Failed", (), sys.exc_info())
+
+        self.assertIn('ValueError: boom', KeyValueFormatter().format(record).splitlines()[-1])
+
+
+class BackgroundHandlerTest(SimpleTestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.handler = BackgroundHandler(self.stream)
+        self.handler.setFormatter(KeyValueFormatter())
+        self.addCleanup(self.handler.close)
+
+    def test_formats_and_writes_off_the_logging_thread(self):
+        formatted_on = []
+
+        class Value:
+            def __str__(self):
+                formatted_on.append(threading.current_thread())
+                return "value"
+
+        self.handler.handle(make_record(field=Value()))
+        self.handler.flush()
+
+        self.assertIn('field=value', self.stream.getvalue())
+        self.assertNotIn(threading.current_thread(), formatted_on)
+
+    def test_drops_records_when_the_queue_is_full_and_reports_it(self):
+        handler = BackgroundHandler(self.stream, maxsize=2)
+        handler._pid = os.getpid()  # Marked as started without a listener, so nothing drains the queue.
+
+        for _ in range(4):
+            handler.handle(make_record())
+        self.assertEqual(handler.dropped, 2)
+
+        handler.queue.get_nowait()
+        handler.queue.get_nowait()
+        handler.handle(make_record(msg="Later"))
+        self.assertEqual(handler.dropped, 0)
+        self.assertEqual(handler.queue.get_nowait().dropped, 2)
+        self.assertEqual(handler.queue.get_nowait().msg, "Later")
+
+    def test_restarts_the_listener_in_a_forked_process(self):
+        self.handler.handle(make_record())
+        parent_listener = self.handler._listener
+        parent_listener.stop()
+        self.handler._pid = -1  # As seen from a child process.
+
+        self.handler.handle(make_record(msg="In child"))
+        self.handler.flush()
+
+        self.assertIsNot(self.handler._listener, parent_listener)
+        self.assertIn('msg="In child"', self.stream.getvalue())
+
+
+class SamplingFilterTest(SimpleTestCase):
+    def test_samples_records_below_warning_per_logger(self):
+        sampling = SamplingFilter({'transactions.views': 0, 'transactions.views.deposit_view': 1})
+
+        self.assertFalse(sampling.filter(make_record()))
+        self.assertTrue(sampling.filter(make_record(level=logging.WARNING)))
+        self.assertTrue(sampling.filter(make_record(name='transactions.views.deposit_view')))
+        self.assertTrue(sampling.filter(make_record(name='transactions.services.ledger')))
+
+    def test_tags_kept_records_with_the_rate(self):
+        record = make_record()
+
+        while not SamplingFilter({'transactions': 0.5}).filter(record):
+            pass
+
+        self.assertEqual(record.sample_rate, 0.5)
+
+
+class RateLimitFilterTest(SimpleTestCase):
+    def test_limits_records_per_second_and_counts_the_suppressed(self):
+        now = [0.0]
+        limiter = RateLimitFilter({'transactions': 2}, clock=lambda: now[0])
+
+        passed = [limiter.filter(make_record()) for _ in range(5)]
+        self.assertEqual(passed, [True, True, False, False, False])
+        self.assertTrue(limiter.filter(make_record(level=logging.WARNING)))
+        self.assertTrue(limiter.filter(make_record(name='authentication.views')))
+
+        now[0] = 0.5
+        record = make_record()
+        self.assertTrue(limiter.filter(record))
+        self.assertEqual(record.suppressed, 3)
+        self.assertFalse(limiter.filter(make_record()))
+
+    def test_limit_below_one_per_second_lets_one_record_through_per_interval(self):
+        now = [0.0]
+        limiter = RateLimitFilter({'transactions': 0.1}, clock=lambda: now[0])
+
+        self.assertEqual([limiter.filter(make_record()) for _ in range(3)], [True, False, False])
+        now[0] = 9.0
+        self.assertFalse(limiter.filter(make_record()))
+        now[0] = 10.5
+        record = make_record()
+        self.assertTrue(limiter.filter(record))
+        self.assertEqual(record.suppressed, 3)
+
+
+class ViewLoggingTest(TestCase):
+    def test_deposit_logs_a_structured_record(self):
+        user = User.objects.create_user(username="user1", password="testpass")
+        Account.objects.create(user=user, balance=100)
+        token = Token.objects.create(user=user)
+
+        with self.assertLogs('transactions.views.deposit_view', logging.INFO) as logs:
+            self.client.post(
+                reverse("deposit"), data={"amount": "50.00"}, content_type="application/json",
+                headers={"Authorization": f"Token {token.key}"},
+            )
+
+        [record] = logs.records
+        self.assertEqual(record.getMessage(), "Deposit succeeded")
+        self.assertEqual((record.user, record.amount, record.new_balance), ("user1", Decimal("50.00"), 150))
@@ -0,0 +1,141 @@
+import threading
+
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = ','.join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return f'{{{pairs}}}' if pairs else ''
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...], buckets: tuple[float, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # label values -> [observations per bucket (the last one is +Inf), sum of observed values]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0]
+            series[0][index] += 1
+            series[1] += value
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for labels, counts, total in sorted(snapshot):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += count
+                le = bound if bound == '+Inf' else _number(bound)
+                lines.append(f'{self.name}_bucket{_labels((*self.labelnames, "le"), (*labels, le))} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, labels)} {cumulative}')
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], int] = {}
+
+    def inc(self, labels: tuple[str, ...], amount: int = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self) -> list[str]:
+        with self._lock:
+            snapshot = sorted(self._values.items())
+        return counter_lines(self.name, self.documentation, self.labelnames, snapshot)
+
+
+def counter_lines(name: str, documentation: str, labelnames: tuple[str, ...], values) -> list[str]:
+    lines = [f'# HELP {name} {documentation}', f'# TYPE {name} counter']
+    lines += [f'{name}{_labels(labelnames, labels)} {_number(value)}' for labels, value in values]
+    return lines
+
+
+class Registry:
+    """Metrics of this process, rendered in the Prometheus text exposition format.
+
+    Each worker process keeps its own registry; Prometheus aggregates them when scraping every worker.
+    """
+
+    def __init__(self):
+        self._metrics: list[Histogram | Counter] = []
+        self._collectors: list[Callable[[], list[str]]] = []
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        metric = Histogram(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs) -> Counter:
+        metric = Counter(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], list[str]]):
+        """Register a callable returning exposition lines for values kept elsewhere (e.g. cache statistics)."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines += metric.collect()
+        for collector in self._collectors:
+            lines += collector()
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+ENDPOINT_LABELS = ('endpoint', 'method')
+
+request_duration = registry.histogram(
+    'http_request_duration_seconds', 'Time spent serving the request.', ENDPOINT_LABELS, DURATION_BUCKETS
+)
+view_duration = registry.histogram(
+    'http_request_view_seconds', 'Time spent in the view, including authentication and rendering.',
+    ENDPOINT_LABELS, DURATION_BUCKETS
+)
+db_duration = registry.histogram(
+    'http_request_db_seconds', 'Time spent executing database queries.', ENDPOINT_LABELS, DURATION_BUCKETS
+)
+serializer_duration = registry.histogram(
+    'http_request_serializer_seconds', 'Time spent validating and serializing data.', ENDPOINT_LABELS,
+    DURATION_BUCKETS
+)
+auth_duration = registry.histogram(
+    'http_request_auth_seconds', 'Time spent authenticating the request.', ENDPOINT_LABELS, DURATION_BUCKETS
+)
+db_queries = registry.histogram(
+    'http_request_db_queries', 'Database queries executed per request.', ENDPOINT_LABELS, QUERY_COUNT_BUCKETS
+)
+requests_total = registry.counter(
+    'http_requests_total', 'Requests served, by response status.', (*ENDPOINT_LABELS, 'status')
+)
@@ -0,0 +1,12 @@
+from metrics.timing import measure
+
+
+# Reports time spent validating input and building output data as the request's 'serializer' component.
+class TimedSerializerMixin:
+    def run_validation(self, *args, **kwargs):
+        with measure('serializer'):
+            return super().run_validation(*args, **kwargs)
+
+    def to_representation(self, instance):
+        with measure('serializer'):
+            return super().to_representation(instance)
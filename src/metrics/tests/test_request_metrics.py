@@ -0,0 +1,92 @@
+import re
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from metrics.registry import Histogram
+from transactions.models.account import Account
+
+
+def server_timing(response) -> dict[str, str]:
+    return dict(re.findall(r'(\w+);(?:dur|desc)="?([\d.]+)"?', response['Server-Timing']))
+
+
+class RequestMetricsMiddlewareTest(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user(username="user1", password="testpass")
+        self.token = Token.objects.create(user=self.user)
+        self.account = Account.objects.create(user=self.user, balance=100)
+
+    def _deposit(self, amount="10.00"):
+        return self.client.post(
+            reverse("deposit"),
+            data={"amount": amount},
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Token {self.token.key}"
+        )
+
+    def test_server_timing_reports_components(self):
+        response = self._deposit()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timings = server_timing(response)
+        self.assertEqual(set(timings), {'auth', 'serializer', 'db', 'view', 'queries', 'total'})
+        self.assertEqual(timings['queries'], '2')  # token, user and account + the balance update
+        self.assertLessEqual(float(timings['view']), float(timings['total']))
+
+    @override_settings(ROOT_URLCONF='transactions.async_urls')
+    async def test_async_views_report_queries_run_in_worker_threads(self):
+        response = await self.async_client.post(
+            reverse("deposit"),
+            data={"amount": "10.00"},
+            content_type="application/json",
+            headers={"Authorization": f"Token {self.token.key}"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(server_timing(response)['queries'], '2')
+
+    @override_settings(METRICS_SERVER_TIMING=False)
+    def test_server_timing_header_can_be_disabled(self):
+        self.assertNotIn('Server-Timing', self._deposit())
+
+    def test_metrics_endpoint_exports_endpoint_histograms(self):
+        self._deposit()
+        self._deposit(amount="0")
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertRegex(body, r'http_requests_total\{endpoint="api/deposit/",method="POST",status="200"\} \d+')
+        self.assertRegex(body, r'http_requests_total\{endpoint="api/deposit/",method="POST",status="400"\} \d+')
+        self.assertRegex(body, r'http_request_db_queries_bucket\{endpoint="api/deposit/",method="POST",le="\+Inf"\}')
+        self.assertIn('balance_cache_requests_total{result="hit"}', body)
+
+    def test_metrics_endpoint_is_hidden_from_other_addresses(self):
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="203.0.113.7")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class HistogramTest(TestCase):
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram('latency_seconds', 'Latency.', ('endpoint',), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(('a"b',), value)
+
+        self.assertEqual(histogram.collect(), [
+            '# HELP latency_seconds Latency.',
+            '# TYPE latency_seconds histogram',
+            'latency_seconds_bucket{endpoint="a\\"b",le="0.1"} 2',
+            'latency_seconds_bucket{endpoint="a\\"b",le="1.0"} 3',
+            'latency_seconds_bucket{endpoint="a\\"b",le="+Inf"} 4',
+            'latency_seconds_sum{endpoint="a\\"b"} 3.65',
+            'latency_seconds_count{endpoint="a\\"b"} 4',
+        ])
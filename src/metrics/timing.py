@@ -0,0 +1,77 @@
+import time
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class RequestTimings:
+    """Time spent per component ('db', 'serializer', 'auth', ...) while serving one request, in seconds."""
+
+    def __init__(self):
+        self.durations: dict[str, float] = {}
+        self.queries = 0
+        self._active: set[str] = set()
+
+    def add(self, name: str, seconds: float):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar('request_timings', default=None)
+
+
+def current() -> RequestTimings | None:
+    return _current.get()
+
+
+@contextmanager
+def collect() -> Iterator[RequestTimings]:
+    """Collect the timings of everything measured inside the block, including work run via sync_to_async."""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def measure(name: str) -> Iterator[None]:
+    """Add the time spent in the block to the current request's `name` component.
+
+    Nested blocks with the same name (a serializer validating its nested serializers) are only counted once.
+    Outside a request this does nothing.
+    """
+    timings = _current.get()
+    if timings is None or name in timings._active:
+        yield
+        return
+
+    timings._active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+        timings._active.discard(name)
+
+
+def time_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add('db', time.perf_counter() - started)
+        timings.queries += 1
+
+
+def install_query_timer(sender, connection, **kwargs):
+    # Installed once per connection wrapper instead of per request with `connection.execute_wrapper()`: under
+    # ASGI the ORM runs in a worker thread with its own connection, which a wrapper entered by the middleware
+    # on the event loop would not reach. The request is found through the context variable instead.
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
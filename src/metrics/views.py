@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from metrics.registry import registry
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def metrics_view(request):
+    # Not authenticated: only reachable from the addresses in METRICS_ALLOWED_IPS (the scraper, localhost).
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise Http404()
+    return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,50 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from replicas import router
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+# Lets ReplicaRouter send the reads of GET, HEAD and OPTIONS requests to a replica, and pins the user to the
+# primary after any other request that succeeded, so their next reads see what they just wrote.
+class ReplicaReadsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DB_REPLICAS:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        if request.method in SAFE_METHODS:
+            with router.replica_reads(request):
+                return self.get_response(request)
+
+        response = self.get_response(request)
+        if self.should_pin(request, response):
+            router.pin(request.user.id)
+        return response
+
+    async def __acall__(self, request):
+        if request.method in SAFE_METHODS:
+            with router.replica_reads(request):
+                return await self.get_response(request)
+
+        response = await self.get_response(request)
+        if self.should_pin(request, response):
+            await router.apin(request.user.id)
+        return response
+
+    @staticmethod
+    def should_pin(request, response) -> bool:
+        user = getattr(request, 'user', None)
+        return user is not None and user.is_authenticated and response.status_code < 400
@@ -0,0 +1,80 @@
+import random
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def pin_key(user_id: int) -> str:
+    return f"replicas:pin:user:{user_id}"
+
+
+def _pins():
+    return caches[settings.DB_REPLICA_PIN_CACHE_ALIAS]
+
+
+def pin(user_id: int):
+    """Send the user's reads to the primary for the next DB_REPLICA_PIN_SECONDS, so they see their own writes."""
+    _pins().set(pin_key(user_id), True, timeout=settings.DB_REPLICA_PIN_SECONDS)
+
+
+async def apin(user_id: int):
+    await _pins().aset(pin_key(user_id), True, timeout=settings.DB_REPLICA_PIN_SECONDS)
+
+
+class RequestReads:
+    """Where the reads of one read-only request go: a replica picked once per request, unless the user is pinned."""
+
+    def __init__(self, request):
+        self.request = request
+        self._alias = None
+        self._pinned_user_id = None
+
+    def alias(self) -> str | None:
+        # The user is only known once the view has authenticated the request, so check the pin on first use.
+        user = getattr(self.request, 'user', None)
+        if user is not None and user.is_authenticated:
+            if self._pinned_user_id is None:
+                self._pinned_user_id = user.id if _pins().get(pin_key(user.id)) else 0
+            if self._pinned_user_id:
+                return None
+        if self._alias is None:
+            self._alias = random.choice(settings.DB_REPLICAS)
+        return self._alias
+
+
+_reads: ContextVar[RequestReads | None] = ContextVar('replica_reads', default=None)
+
+
+@contextmanager
+def replica_reads(request) -> Iterator[None]:
+    """Let reads made inside the block, including via sync_to_async, go to a replica on behalf of `request`."""
+    token = _reads.set(RequestReads(request))
+    try:
+        yield
+    finally:
+        _reads.reset(token)
+
+
+# Sends reads of DB_REPLICA_APPS models made while serving a read-only request (see ReplicaReadsMiddleware) to
+# one of DB_REPLICAS. Everything else uses the primary: writes, reads in a transaction (row locks, the ledger's
+# checks), reads of a user pinned after a write, and all work outside requests such as management commands.
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        reads = _reads.get()
+        if reads is None or not settings.DB_REPLICAS or model._meta.app_label not in settings.DB_REPLICA_APPS:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return reads.alias()
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the primary's rows, so an object read from one may point at an object from another.
+        databases = {DEFAULT_DB_ALIAS, *settings.DB_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,131 @@
+import csv
+import io
+import json
+
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import transaction
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from replicas import router
+from transactions.models.account import Account
+from transactions.models.transaction import Transaction
+
+REPLICA = 'standin_replica'
+
+
+# The stand-in replica is a separate database that nothing replicates to, seeded with different balances than
+# the primary, so every response shows which database it was read from.
+@override_settings(DB_REPLICAS=[REPLICA])
+class ReplicaRouterTest(TransactionTestCase):
+    databases = {'default', REPLICA}
+
+    def setUp(self):
+        caches['default'].clear()
+        self.user = self.create_user("user1", primary_balance=100, replica_balance=999)
+        self.token = Token.objects.create(user=self.user)
+
+    def create_user(self, username, primary_balance, replica_balance):
+        user = User.objects.create_user(username=username, password="testpass")
+        account = Account.objects.create(user=user, balance=primary_balance)
+        User.objects.using(REPLICA).create(pk=user.pk, username=username)
+        Account.objects.using(REPLICA).create(pk=account.pk, user_id=user.pk, balance=replica_balance)
+        return user
+
+    def get_balance(self, token=None):
+        response = self.client.get(reverse("balance"), HTTP_AUTHORIZATION=f"Token {(token or self.token).key}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()['balance']
+
+    def deposit(self, amount):
+        return self.client.post(
+            reverse("deposit"),
+            data=json.dumps({"amount": amount}),
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Token {self.token.key}"
+        )
+
+    def test_balance_is_read_from_the_replica(self):
+        self.assertEqual(self.get_balance(), '999.00')
+
+    def test_writer_reads_from_the_primary_after_a_write(self):
+        self.assertEqual(self.deposit("50.00").status_code, status.HTTP_200_OK)
+
+        self.assertEqual(self.get_balance(), '150.00')
+        self.assertEqual(Account.objects.using(REPLICA).get().balance, Decimal("999.00"))
+
+    def test_pin_expires(self):
+        self.deposit("50.00")
+        caches['default'].delete(router.pin_key(self.user.id))
+
+        self.assertEqual(self.get_balance(), '999.00')
+
+    def test_failed_write_does_not_pin(self):
+        self.assertEqual(self.deposit("-1").status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(self.get_balance(), '999.00')
+
+    def test_pin_is_per_user(self):
+        other = self.create_user("user2", primary_balance=5, replica_balance=555)
+
+        self.deposit("50.00")
+
+        self.assertEqual(self.get_balance(Token.objects.create(user=other)), '555.00')
+
+    @override_settings(BALANCE_CACHE_ENABLED=True)
+    def test_cached_balance_of_a_transfer_recipient_is_loaded_from_the_primary(self):
+        recipient = self.create_user("user2", primary_balance=5, replica_balance=5)
+        recipient_token = Token.objects.create(user=recipient)
+        self.assertEqual(self.get_balance(recipient_token), '5.00')
+
+        response = self.client.post(
+            reverse("transfer"),
+            data=json.dumps({"to_username": "user2", "amount": "10.00"}),
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Token {self.token.key}"
+        )
+
+        # Only the sender is pinned, and the stand-in replica never catches up, like one that lags.
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_balance(recipient_token), '15.00')
+        self.assertEqual(self.get_balance(recipient_token), '15.00')
+
+    def test_history_and_export_are_read_from_the_replica(self):
+        account = Account.objects.using(REPLICA).get()
+        Transaction.objects.using(REPLICA).create(account=account, transaction_type='deposit', amount=7)
+        headers = {'HTTP_AUTHORIZATION': f"Token {self.token.key}"}
+
+        history = self.client.get(reverse("transaction-history"), **headers)
+        export = self.client.get(reverse("transaction-export"), **headers)
+
+        self.assertEqual([row['amount'] for row in history.json()['results']], ['7.00'])
+        rows = list(csv.reader(io.StringIO(b''.join(export.streaming_content).decode())))
+        self.assertEqual([row[3] for row in rows[1:]], ['7.00'])
+
+    def test_reads_outside_requests_and_in_transactions_use_the_primary(self):
+        self.assertEqual(Account.objects.get().balance, Decimal("100.00"))
+
+        with router.replica_reads(RequestFactory().get("/")):
+            self.assertEqual(Account.objects.get().balance, Decimal("999.00"))
+            with transaction.atomic():
+                self.assertEqual(Account.objects.get().balance, Decimal("100.00"))
+            # Only DB_REPLICA_APPS models are read from replicas; tokens and users always come from the primary.
+            self.assertIsNone(router.ReplicaRouter().db_for_read(Token))
+
+    @override_settings(ROOT_URLCONF='transactions.async_urls')
+    async def test_async_views(self):
+        headers = {"Authorization": f"Token {self.token.key}"}
+
+        before = await self.async_client.get(reverse("balance"), headers=headers)
+        await self.async_client.post(
+            reverse("deposit"), data={"amount": "50.00"}, content_type="application/json", headers=headers
+        )
+        after = await self.async_client.get(reverse("balance"), headers=headers)
+
+        self.assertEqual(before.json(), {'balance': '999.00'})
+        self.assertEqual(after.json(), {'balance': '150.00'})
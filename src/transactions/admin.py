@@ -1,6 +1,9 @@
 from django.contrib import admin
 
-from transactions.models import Account, Transaction
+from transactions.models import Account, AccountBalanceShard, AccountDailyRollup, IdempotencyKey, Transaction
 
 admin.site.register(Account)
+admin.site.register(AccountBalanceShard)
+admin.site.register(AccountDailyRollup)
+admin.site.register(IdempotencyKey)
 admin.site.register(Transaction)
\ No newline at end of file
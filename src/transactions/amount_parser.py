@@ -0,0 +1,71 @@
+from collections.abc import Mapping
+from decimal import Decimal, DecimalException
+
+from rest_framework import serializers
+
+from metrics.timing import measure
+from transactions.serializers import TransactionSerializer
+
+# The bound field of a TransactionSerializer: its limits are the fast path's limits, and it produces the errors.
+AMOUNT_FIELD = TransactionSerializer().fields['amount']
+MAX_DIGITS = AMOUNT_FIELD.max_digits
+DECIMAL_PLACES = AMOUNT_FIELD.decimal_places
+MAX_WHOLE_DIGITS = AMOUNT_FIELD.max_whole_digits
+MIN_VALUE = AMOUNT_FIELD.min_value
+QUANTUM = Decimal(1).scaleb(-DECIMAL_PLACES)
+
+
+def _fast_amount(raw) -> Decimal | None:
+    """Return the amount if `raw` is plainly valid, or None to let the DRF field decide."""
+    # JSON numbers arrive as int or float; DRF parses their str() too. bool is deliberately not accepted here.
+    if type(raw) in (int, float):
+        raw = str(raw)
+    elif type(raw) is not str or len(raw) > AMOUNT_FIELD.MAX_STRING_LENGTH:
+        return None
+    try:
+        value = Decimal(raw.strip())
+    except DecimalException:
+        return None
+    if not value.is_finite():
+        return None
+
+    # Same digit counting as DecimalField.validate_precision.
+    _, digits, exponent = value.as_tuple()
+    if exponent >= 0:
+        total_digits = whole_digits = len(digits) + exponent
+        decimal_places = 0
+    elif len(digits) > -exponent:
+        total_digits = len(digits)
+        whole_digits = total_digits + exponent
+        decimal_places = -exponent
+    else:
+        total_digits = decimal_places = -exponent
+        whole_digits = 0
+    if total_digits > MAX_DIGITS or decimal_places > DECIMAL_PLACES or whole_digits > MAX_WHOLE_DIGITS:
+        return None
+    if value < MIN_VALUE:
+        return None
+    return value.quantize(QUANTUM)
+
+
+def parse_amount(data) -> tuple[Decimal | None, dict | None]:
+    """Validate an `{"amount": ...}` payload like TransactionSerializer, without instantiating one.
+
+    Returns `(amount, None)` or `(None, errors)`, where `errors` is what `TransactionSerializer(data=data).errors`
+    would hold. Valid string and number amounts are checked directly; anything else (missing or null amounts,
+    invalid values) goes through the serializer's own field, so error messages and codes are DRF's.
+    """
+    with measure('serializer'):
+        if not isinstance(data, Mapping):
+            serializer = TransactionSerializer(data=data)
+            serializer.is_valid()
+            return None, serializer.errors
+
+        raw = data.get('amount', serializers.empty)
+        amount = _fast_amount(raw)
+        if amount is not None:
+            return amount, None
+        try:
+            return AMOUNT_FIELD.run_validation(raw), None
+        except serializers.ValidationError as exc:
+            return None, {'amount': exc.detail}
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class TransactionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'transactions'
+
+    def ready(self):
+        from metrics.registry import registry
+        from transactions import signals  # noqa: F401
+        from transactions.services import balance_cache
+
+        registry.add_collector(balance_cache.collect_metrics)
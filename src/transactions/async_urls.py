@@ -0,0 +1,22 @@
+from django.urls import path
+
+from transactions.urls import urlpatterns as sync_urlpatterns
+from transactions.views.async_balance_view import AsyncBalanceView
+from transactions.views.async_deposit_view import AsyncDepositView
+from transactions.views.async_withdraw_view import AsyncWithdrawView
+from transactions.views.balance_stream_view import BalanceStreamView
+
+# Served instead of transactions.urls when API_ASYNC_VIEWS is enabled: the hot endpoints run as native async
+# views, everything else is the same DRF view as in sync mode. The balance stream holds its connection open for as
+# long as the client stays, which only an async server can afford, so it is only served here.
+async_urlpatterns = [
+    path('deposit/', AsyncDepositView.as_view(), name='deposit'),
+    path('withdraw/', AsyncWithdrawView.as_view(), name='withdraw'),
+    path('balance/', AsyncBalanceView.as_view(), name='balance'),
+    path('balance/stream/', BalanceStreamView.as_view(), name='balance-stream'),
+]
+
+urlpatterns = async_urlpatterns + [
+    pattern for pattern in sync_urlpatterns
+    if pattern.name not in {async_pattern.name for async_pattern in async_urlpatterns}
+]
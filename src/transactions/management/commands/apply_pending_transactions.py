@@ -0,0 +1,52 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from transactions.services import ledger
+
+
+class Command(BaseCommand):
+    help = (
+        "Applies pending (write-behind) deposits to account balances in batches: each batch is claimed with "
+        "FOR UPDATE SKIP LOCKED, so several workers can run side by side, and every account in it gets one UPDATE. "
+        "Drains the queue and exits, or keeps polling every --interval seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Pending deposits claimed per batch.")
+        parser.add_argument(
+            '--interval', type=float, default=None,
+            help="Keep running, polling this many seconds after the queue has been drained."
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        if options['interval'] is not None and options['interval'] <= 0:
+            raise CommandError("--interval must be positive.")
+
+        while True:
+            self.stdout.write(json.dumps(self.drain(options['batch_size'])))
+            if options['interval'] is None:
+                return
+            close_old_connections()
+            time.sleep(options['interval'])
+
+    def drain(self, batch_size: int) -> dict:
+        started = time.perf_counter()
+        batches = transactions = accounts = 0
+        while True:
+            batch = ledger.apply_pending_deposits(batch_size)
+            if not batch.transactions:
+                break
+            batches += 1
+            transactions += batch.transactions
+            accounts += batch.accounts
+        return {
+            'batches': batches,
+            'transactions': transactions,
+            'account_updates': accounts,
+            'elapsed_s': round(time.perf_counter() - started, 3),
+        }
@@ -0,0 +1,59 @@
+import json
+import time
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from transactions.amount_parser import parse_amount
+from transactions.serializers import TransactionSerializer
+
+PAYLOADS = {
+    'valid_string': {'amount': '125.50'},
+    'valid_number': {'amount': 125.5},
+    'below_minimum': {'amount': '0.00'},
+    'invalid': {'amount': 'abc'},
+    'missing': {},
+}
+
+
+def validate_with_serializer(data):
+    serializer = TransactionSerializer(data=data)
+    if serializer.is_valid():
+        return serializer.validated_data['amount'], None
+    return None, serializer.errors
+
+
+class Command(BaseCommand):
+    help = (
+        "Microbenchmark of deposit/withdraw payload validation: CPU time per call of TransactionSerializer "
+        "versus the fast-path amount parser, for valid and invalid payloads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=20000, help="Calls per timing run.")
+        parser.add_argument('--repeat', type=int, default=5, help="Timing runs; the fastest one is reported.")
+
+    def handle(self, *args, **options):
+        if options['number'] < 1 or options['repeat'] < 1:
+            raise CommandError("--number and --repeat must be at least 1.")
+
+        report = {}
+        for name, data in PAYLOADS.items():
+            if parse_amount(data) != validate_with_serializer(data):
+                raise CommandError(f"The parser and the serializer disagree on the '{name}' payload.")
+
+            serializer_us = self.time_per_call(validate_with_serializer, data, options)
+            parser_us = self.time_per_call(parse_amount, data, options)
+            report[name] = {
+                'serializer_us': round(serializer_us, 2),
+                'parser_us': round(parser_us, 2),
+                'saved_us': round(serializer_us - parser_us, 2),
+                'speedup': round(serializer_us / parser_us, 1) if parser_us else None,
+            }
+        self.stdout.write(json.dumps(report, indent=2))
+
+    @staticmethod
+    def time_per_call(function, data, options) -> float:
+        # CPU time of this process, so other load on the machine does not inflate the numbers.
+        timer = timeit.Timer(lambda: function(data), timer=time.process_time)
+        return min(timer.repeat(repeat=options['repeat'], number=options['number'])) / options['number'] * 1e6
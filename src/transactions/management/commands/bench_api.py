@@ -0,0 +1,272 @@
+import http.client
+import json
+import random
+import threading
+import time
+
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from urllib.parse import urlsplit
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from transactions.models.account import Account
+from transactions.models.transaction import Transaction
+from transactions.services import sharding
+from transactions.services.reconciliation import with_ledger
+
+ENDPOINTS = {
+    'balance': ('GET', '/api/balance/'),
+    'deposit': ('POST', '/api/deposit/'),
+    'withdraw': ('POST', '/api/withdraw/'),
+    'transfer': ('POST', '/api/transfer/'),
+}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float | None:
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return round(sorted_values[index], 3)
+
+
+def latency_summary(latencies: list[float]) -> dict:
+    values = sorted(latencies)
+    return {
+        'count': len(values),
+        'mean_ms': round(sum(values) / len(values), 3) if values else None,
+        'p50_ms': percentile(values, 50),
+        'p95_ms': percentile(values, 95),
+        'p99_ms': percentile(values, 99),
+        'max_ms': round(values[-1], 3) if values else None,
+    }
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise CommandError(f"Unknown endpoint '{name}' in --mix. Choose from: {', '.join(ENDPOINTS)}.")
+        try:
+            mix[name] = int(weight)
+        except ValueError:
+            raise CommandError(f"Invalid weight for '{name}' in --mix: '{weight}'.")
+    if not any(mix.values()):
+        raise CommandError("--mix needs at least one endpoint with a positive weight.")
+    return mix
+
+
+class Command(BaseCommand):
+    help = (
+        "Drives a configurable mix of balance/deposit/withdraw/transfer requests against a running server, reports "
+        "throughput and latency percentiles as JSON, then checks every benchmark account against its ledger."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://localhost:8000', help="Server to benchmark.")
+        parser.add_argument('--users', type=int, default=10, help="Number of benchmark users/accounts.")
+        parser.add_argument(
+            '--hot-accounts', type=int, default=None,
+            help="Send every request as (and transfer only between) the first N users, to measure contention."
+        )
+        parser.add_argument(
+            '--shards', type=int, default=None,
+            help="Spread the hot accounts' deposits over this many balance shards (0 turns sharding off)."
+        )
+        parser.add_argument('--user-prefix', default='bench_user_', help="Username prefix for benchmark users.")
+        parser.add_argument(
+            '--initial-balance', type=Decimal, default=Decimal('1000.00'),
+            help="Balance given to newly provisioned benchmark accounts."
+        )
+        parser.add_argument('--concurrency', type=int, default=8, help="Number of concurrent client threads.")
+        parser.add_argument('--requests', type=int, default=1000, help="Total number of requests to send.")
+        parser.add_argument(
+            '--duration', type=float, default=None,
+            help="Run for this many seconds instead of a fixed number of requests."
+        )
+        parser.add_argument(
+            '--mix', default='balance=60,deposit=25,withdraw=15',
+            help="Relative weights per endpoint, e.g. 'balance=60,deposit=25,withdraw=15' or 'transfer=1'."
+        )
+        parser.add_argument('--amount', default='1.00', help="Amount used for deposits, withdrawals and transfers.")
+        parser.add_argument('--timeout', type=float, default=10.0, help="Per-request timeout in seconds.")
+        parser.add_argument('--seed', type=int, default=None, help="Random seed for a reproducible request mix.")
+        parser.add_argument('--skip-verify', action='store_true', help="Skip the ledger consistency check.")
+
+    def handle(self, *args, **options):
+        mix = parse_mix(options['mix'])
+        if options['users'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--users and --concurrency must be at least 1.")
+        hot_accounts = options['hot_accounts'] or options['users']
+        if not 1 <= hot_accounts <= options['users']:
+            raise CommandError("--hot-accounts must be between 1 and --users.")
+        if mix.get('transfer') and hot_accounts < 2:
+            raise CommandError("Transfers need at least two accounts.")
+        if options['shards'] is not None and options['shards'] < 0:
+            raise CommandError("--shards must not be negative.")
+
+        credentials = self.provision_users(options['users'], options['user_prefix'], options['initial_balance'])
+        if options['shards'] is not None:
+            for account_id in Account.objects.filter(
+                user__username__in=[username for username, _ in credentials[:hot_accounts]]
+            ).values_list('id', flat=True):
+                sharding.set_shard_count(account_id, options['shards'])
+        run = self.run_load(credentials[:hot_accounts], mix, options)
+        report = {
+            'config': {
+                'base_url': options['base_url'],
+                'users': options['users'],
+                'hot_accounts': hot_accounts,
+                'shards': options['shards'],
+                'concurrency': options['concurrency'],
+                'mix': mix,
+                'amount': options['amount'],
+            },
+            **run,
+        }
+        if not options['skip_verify']:
+            report['consistency'] = self.verify_ledger(options['user_prefix'])
+
+        self.stdout.write(json.dumps(report, indent=2))
+        if report.get('consistency', {}).get('mismatches'):
+            raise CommandError("Ledger check failed: some balances do not match their transactions.")
+
+    def provision_users(self, count: int, prefix: str, initial_balance: Decimal) -> list[tuple[str, str]]:
+        """Create any missing benchmark users, tokens and accounts; return (username, token) pairs by user id."""
+        usernames = [f"{prefix}{i}" for i in range(count)]
+        # Hashing is deliberately slow; one hash is shared by every benchmark user.
+        password = make_password(None)
+
+        with transaction.atomic():
+            existing = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+            User.objects.bulk_create(
+                User(username=username, password=password) for username in usernames if username not in existing
+            )
+            users = list(User.objects.filter(username__in=usernames).order_by('id'))
+
+            with_token = set(Token.objects.filter(user__in=users).values_list('user_id', flat=True))
+            Token.objects.bulk_create(
+                Token(key=Token.generate_key(), user=user) for user in users if user.id not in with_token
+            )
+            with_account = set(Account.objects.filter(user__in=users).values_list('user_id', flat=True))
+            accounts = Account.objects.bulk_create(
+                Account(user=user, balance=initial_balance) for user in users if user.id not in with_account
+            )
+            # Opening deposits keep the "balance equals the sum of transactions" invariant true from the start.
+            if initial_balance > 0:
+                Transaction.objects.bulk_create(
+                    Transaction(
+                        account=account, transaction_type=Transaction.TransactionType.DEPOSIT, amount=initial_balance
+                    )
+                    for account in accounts
+                )
+
+        return list(Token.objects.filter(user__in=users).order_by('user_id').values_list('user__username', 'key'))
+
+    def run_load(self, credentials: list[tuple[str, str]], mix: dict[str, int], options: dict) -> dict:
+        base = urlsplit(options['base_url'])
+        connection_class = http.client.HTTPSConnection if base.scheme == 'https' else http.client.HTTPConnection
+        body = json.dumps({'amount': options['amount']})
+        names, weights = zip(*mix.items())
+
+        duration = options['duration']
+        budget = None if duration else options['requests']
+        deadline = time.perf_counter() + duration if duration else None
+        budget_lock = threading.Lock()
+
+        def claim() -> bool:
+            nonlocal budget
+            if deadline is not None:
+                return time.perf_counter() < deadline
+            with budget_lock:
+                if budget <= 0:
+                    return False
+                budget -= 1
+                return True
+
+        def worker(worker_id: int):
+            rng = random.Random(None if options['seed'] is None else options['seed'] + worker_id)
+            latencies, statuses = defaultdict(list), defaultdict(Counter)
+            conn = None
+            while claim():
+                name = rng.choices(names, weights)[0]
+                method, path = ENDPOINTS[name]
+                if name == 'transfer':
+                    (_, token), (to_username, _) = rng.sample(credentials, 2)
+                    request_body = json.dumps({'amount': options['amount'], 'to_username': to_username})
+                else:
+                    _, token = rng.choice(credentials)
+                    request_body = body
+                headers = {'Authorization': f"Token {token}", 'Content-Type': 'application/json'}
+                started = time.perf_counter()
+                try:
+                    if conn is None:
+                        conn = connection_class(base.hostname, base.port, timeout=options['timeout'])
+                    conn.request(
+                        method, base.path.rstrip('/') + path, body=request_body if method == 'POST' else None,
+                        headers=headers
+                    )
+                    response = conn.getresponse()
+                    response.read()
+                    status = str(response.status)
+                    if response.getheader('Connection', '').lower() == 'close':
+                        conn.close()
+                        conn = None
+                except (OSError, http.client.HTTPException) as exc:
+                    status = type(exc).__name__
+                    if conn is not None:
+                        conn.close()
+                    conn = None
+                latencies[name].append((time.perf_counter() - started) * 1000)
+                statuses[name][status] += 1
+            if conn is not None:
+                conn.close()
+            return latencies, statuses
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            results = list(executor.map(worker, range(options['concurrency'])))
+        elapsed = time.perf_counter() - started
+
+        latencies, statuses = defaultdict(list), defaultdict(Counter)
+        for worker_latencies, worker_statuses in results:
+            for name in names:
+                latencies[name] += worker_latencies[name]
+                statuses[name].update(worker_statuses[name])
+
+        all_latencies = [value for name in names for value in latencies[name]]
+        errors = {
+            name: {status: count for status, count in statuses[name].items() if not status.startswith('2')}
+            for name in names
+        }
+        return {
+            'duration_s': round(elapsed, 3),
+            'requests': len(all_latencies),
+            'throughput_rps': round(len(all_latencies) / elapsed, 2) if elapsed else None,
+            'latency': latency_summary(all_latencies),
+            'endpoints': {
+                name: {**latency_summary(latencies[name]), 'status_codes': dict(statuses[name])} for name in names
+            },
+            'errors': {
+                'total': sum(sum(by_status.values()) for by_status in errors.values()),
+                'by_endpoint': errors,
+            },
+        }
+
+    def verify_ledger(self, prefix: str) -> dict:
+        accounts = with_ledger(Account.objects.filter(user__username__startswith=prefix)).values_list(
+            'id', 'total', 'ledger'
+        )
+        checked, mismatches = 0, []
+        for account_id, balance, ledger_balance in accounts:
+            checked += 1
+            if balance != ledger_balance:
+                mismatches.append({'account_id': account_id, 'balance': str(balance), 'ledger': str(ledger_balance)})
+        return {'accounts_checked': checked, 'mismatches': mismatches}
@@ -0,0 +1,159 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+
+from transactions.management.commands.bench_api import latency_summary
+from transactions.models.account import Account
+
+# Environment overrides of each connection setup compared; see the database settings in config/settings/base.py.
+PROFILES = {
+    'per_request': {'DB_CONN_MAX_AGE': '0', 'DB_POOL': 'false', 'DB_SERVER_SIDE_BINDING': 'false'},
+    'persistent': {'DB_CONN_MAX_AGE': '60', 'DB_POOL': 'false', 'DB_SERVER_SIDE_BINDING': 'false'},
+    'persistent_prepared': {'DB_CONN_MAX_AGE': '60', 'DB_POOL': 'false', 'DB_SERVER_SIDE_BINDING': 'true'},
+    'pooled': {'DB_CONN_MAX_AGE': '0', 'DB_POOL': 'true', 'DB_SERVER_SIDE_BINDING': 'false'},
+    'pooled_prepared': {'DB_CONN_MAX_AGE': '0', 'DB_POOL': 'true', 'DB_SERVER_SIDE_BINDING': 'true'},
+}
+
+# Requests sent in turn; deposits and withdrawals of the same amount keep the balance where it started.
+REQUESTS = [
+    ('balance', 'GET', '/api/balance/'),
+    ('deposit', 'POST', '/api/deposit/'),
+    ('withdraw', 'POST', '/api/withdraw/'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares database connection setups (per-request connections, persistent connections, psycopg's pool, "
+        "each with and without server-side prepared statements) by the per-request latency of balance, deposit "
+        "and withdraw requests served in-process, one process per setup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profiles', default=','.join(PROFILES),
+            help=f"Comma-separated setups to compare, from: {', '.join(PROFILES)}."
+        )
+        parser.add_argument('--requests', type=int, default=1000, help="Requests timed per endpoint and setup.")
+        parser.add_argument('--username', default='bench_connections', help="Benchmark user, created if missing.")
+        parser.add_argument(
+            '--measure', default=None, metavar='TOKEN',
+            help="Internal: measure requests authenticated with this token under the current settings."
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError("--requests must be at least 1.")
+        if options['measure']:
+            with override_settings(BALANCE_CACHE_ENABLED=False, DEPOSIT_WRITE_BEHIND=False):
+                measured = self.measure_requests(options['measure'], options['requests'])
+            self.stdout.write(json.dumps(measured))
+            return
+
+        profiles = options['profiles'].split(',')
+        unknown = [name for name in profiles if name not in PROFILES]
+        if unknown:
+            raise CommandError(f"Unknown profile(s): {', '.join(unknown)}. Choose from: {', '.join(PROFILES)}.")
+
+        token = self.provision_user(options['username'])
+        report = {}
+        for name in profiles:
+            measured = subprocess.run(
+                [
+                    sys.executable, str(settings.BASE_DIR.parent / 'manage.py'), 'bench_connections',
+                    '--measure', token, '--requests', str(options['requests']),
+                ],
+                env={**os.environ, **PROFILES[name]}, capture_output=True, text=True,
+            )
+            if measured.returncode:
+                report[name] = {'error': measured.stderr.strip().splitlines()[-1]}
+                continue
+            report[name] = {'settings': PROFILES[name], **json.loads(measured.stdout.splitlines()[-1])}
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def provision_user(self, username: str) -> str:
+        user, _ = User.objects.get_or_create(username=username)
+        Account.objects.get_or_create(user=user, defaults={'balance': Decimal('1000.00')})
+        token, _ = Token.objects.get_or_create(user=user)
+        return token.key
+
+    def measure_requests(self, token: str, count: int) -> dict:
+        # Unlike bench_settings, requests go through the request_started/request_finished signals, so connections
+        # are opened, reused, returned to the pool or closed exactly as when serving traffic.
+        handler = WSGIHandler()
+        # Django reports every pool checkout as a new connection; server process ids tell real connects apart.
+        connects, backends = 0, set()
+
+        def count_connection(sender, connection, **kwargs):
+            nonlocal connects
+            connects += 1
+            backends.add(connection.connection.info.backend_pid)
+
+        body = json.dumps({'amount': '1.00'}).encode()
+
+        def request(method: str, path: str):
+            environ = {
+                'REQUEST_METHOD': method,
+                'PATH_INFO': path,
+                'QUERY_STRING': '',
+                'SERVER_NAME': 'localhost',
+                'SERVER_PORT': '80',
+                'HTTP_HOST': 'localhost',
+                'REMOTE_ADDR': '127.0.0.1',
+                'HTTP_AUTHORIZATION': f"Token {token}",
+                'HTTP_ACCEPT': 'application/json',
+                'wsgi.url_scheme': 'http',
+                'wsgi.errors': sys.stderr,
+                'wsgi.input': io.BytesIO(body if method == 'POST' else b''),
+            }
+            if method == 'POST':
+                environ.update({'CONTENT_TYPE': 'application/json', 'CONTENT_LENGTH': str(len(body))})
+
+            def start_response(status, headers):
+                if not status.startswith('200'):
+                    raise CommandError(f"{method} {path} answered {status}.")
+
+            handler(environ, start_response).close()
+
+        for _ in range(max(1, count // 10)):
+            for _, method, path in REQUESTS:
+                request(method, path)
+
+        connection_created.connect(count_connection)
+        latencies = {name: [] for name, _, _ in REQUESTS}
+        try:
+            for _ in range(count):
+                for name, method, path in REQUESTS:
+                    started = time.perf_counter()
+                    request(method, path)
+                    latencies[name].append((time.perf_counter() - started) * 1000)
+        finally:
+            connection_created.disconnect(count_connection)
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT count(*) FROM pg_prepared_statements')
+            prepared = cursor.fetchone()[0]
+        connection.close()
+
+        all_latencies = [value for values in latencies.values() for value in values]
+        return {
+            'latency': latency_summary(all_latencies),
+            'endpoints': {name: latency_summary(values) for name, values in latencies.items()},
+            'connects': connects,
+            'server_connections': len(backends),
+            'prepared_statements': prepared,
+        }
@@ -0,0 +1,199 @@
+import io
+import json
+import os
+import secrets
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signals
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, transaction
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+
+from transactions.models.account import Account
+
+# Run in a fresh interpreter: everything a server process does before it can answer its first request.
+STARTUP_SCRIPT = """
+import sys, time, json
+started = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({'setup_ms': (time.perf_counter() - started) * 1000, 'modules': len(sys.modules)}))
+"""
+
+
+class Rollback(Exception):
+    pass
+
+
+def summary_us(seconds: list[float]) -> dict:
+    values = sorted(value * 1e6 for value in seconds)
+    return {
+        'mean_us': round(statistics.fmean(values), 1),
+        'p50_us': round(values[len(values) // 2], 1),
+        'p99_us': round(values[min(len(values) - 1, int(len(values) * 0.99))], 1),
+    }
+
+
+def measure_startup(settings_module: str, runs: int, env: dict) -> dict:
+    setup_ms, process_ms, modules = [], [], 0
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, '-c', STARTUP_SCRIPT],
+            env={**env, 'DJANGO_SETTINGS_MODULE': settings_module},
+            capture_output=True, text=True, check=True,
+        ).stdout
+        process_ms.append((time.perf_counter() - started) * 1000)
+        result = json.loads(output.splitlines()[-1])
+        setup_ms.append(result['setup_ms'])
+        modules = result['modules']
+    return {
+        'setup_ms': round(statistics.median(setup_ms), 1),
+        'process_ms': round(statistics.median(process_ms), 1),
+        'modules_loaded': modules,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares settings modules: process startup/import time, the per-request time of GET /api/balance/ "
+        "through each one's middleware stack, and the marginal cost of every middleware in that stack."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profiles', default='config.settings.local,config.settings.production',
+            help="Comma-separated settings modules to compare."
+        )
+        parser.add_argument('--requests', type=int, default=2000, help="Requests timed per middleware stack.")
+        parser.add_argument('--startup-runs', type=int, default=5, help="Fresh processes started per profile.")
+        parser.add_argument('--path', default='/api/balance/', help="Endpoint requested.")
+        parser.add_argument(
+            '--database', action='store_true',
+            help="Read the balance from the database. By default it is served from the balance cache, so that "
+                 "database round trips do not drown out differences of a few microseconds."
+        )
+        parser.add_argument(
+            '--log-handlers', default=None,
+            help="Comma-separated LOG_HANDLER values (background, sync) to measure each profile under, showing what "
+                 "writing the views' log lines costs per request. By default the environment's LOG_HANDLER is used."
+        )
+        parser.add_argument(
+            '--measure', action='store_true',
+            help="Internal: measure requests under the current settings and print JSON."
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['startup_runs'] < 1:
+            raise CommandError("--requests and --startup-runs must be at least 1.")
+        if options['measure']:
+            with override_settings(BALANCE_CACHE_ENABLED=not options['database']):
+                measured = self.measure_requests(options['path'], options['requests'])
+            self.stdout.write(json.dumps(measured))
+            return
+
+        # Production settings refuse to start without these; a throwaway value is enough for measuring.
+        env = {
+            'DJANGO_SECRET_KEY': secrets.token_urlsafe(50),
+            'DJANGO_ALLOWED_HOSTS': 'localhost',
+            **os.environ,
+        }
+        variants = [
+            (settings_module, log_handler)
+            for settings_module in options['profiles'].split(',')
+            for log_handler in (options['log_handlers'].split(',') if options['log_handlers'] else [None])
+        ]
+        report = {}
+        for settings_module, log_handler in variants:
+            variant_env = env if log_handler is None else {**env, 'LOG_HANDLER': log_handler}
+            requests = subprocess.run(
+                [
+                    sys.executable, str(settings.BASE_DIR.parent / 'manage.py'), 'bench_settings', '--measure',
+                    '--settings', settings_module, '--requests', str(options['requests']), '--path', options['path'],
+                    *(['--database'] if options['database'] else []),
+                ],
+                env=variant_env, capture_output=True, text=True,
+            )
+            name = settings_module if log_handler is None else f"{settings_module} LOG_HANDLER={log_handler}"
+            if requests.returncode:
+                raise CommandError(f"Measuring {name} failed:\n{requests.stderr}")
+            report[name] = {
+                'startup': measure_startup(settings_module, options['startup_runs'], variant_env),
+                **json.loads(requests.stdout.splitlines()[-1]),
+            }
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def measure_requests(self, path: str, count: int) -> dict:
+        # Requests reuse one database connection, as with persistent connections, instead of reconnecting for
+        # each one; that keeps connection setup out of the numbers.
+        signals.request_started.disconnect(close_old_connections)
+        signals.request_finished.disconnect(close_old_connections)
+        stacks = [settings.MIDDLEWARE[:i] for i in range(len(settings.MIDDLEWARE) + 1)]
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(username=f"bench_settings_{secrets.token_hex(4)}")
+                Account.objects.create(user=user, balance=100)
+                token = Token.objects.create(user=user)
+                timings = self.time_stacks(stacks, path, token.key, count)
+                raise Rollback()
+        except Rollback:
+            pass
+        finally:
+            signals.request_started.connect(close_old_connections)
+            signals.request_finished.connect(close_old_connections)
+
+        # Each middleware's cost is the time it adds on top of the ones before it in the stack.
+        medians = [statistics.median(seconds) for seconds in timings]
+        return {
+            'debug': settings.DEBUG,
+            'request': summary_us(timings[-1]),
+            'without_middleware': summary_us(timings[0]),
+            'middleware_cost_us': {
+                middleware: round((medians[i + 1] - medians[i]) * 1e6, 1)
+                for i, middleware in enumerate(settings.MIDDLEWARE)
+            },
+        }
+
+    def time_stacks(self, stacks: list[list[str]], path: str, token: str, count: int) -> list[list[float]]:
+        handlers = []
+        for middleware in stacks:
+            with override_settings(MIDDLEWARE=middleware):
+                handlers.append(WSGIHandler())
+
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': '',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'HTTP_HOST': 'localhost',
+            'REMOTE_ADDR': '127.0.0.1',
+            'HTTP_AUTHORIZATION': f"Token {token}",
+            'HTTP_ACCEPT': 'application/json',
+            'wsgi.url_scheme': 'http',
+            'wsgi.errors': sys.stderr,
+        }
+
+        def start_response(status, headers):
+            if not status.startswith('200'):
+                raise CommandError(f"GET {path} answered {status}.")
+
+        # Stacks take turns request by request, so drift in machine or database load affects all of them alike.
+        timings = [[] for _ in stacks]
+        warmup = count // 10
+        for i in range(warmup + count):
+            for handler, seconds in zip(handlers, timings):
+                started = time.perf_counter()
+                handler({**environ, 'wsgi.input': io.BytesIO()}, start_response)
+                if i >= warmup:
+                    seconds.append(time.perf_counter() - started)
+        return timings
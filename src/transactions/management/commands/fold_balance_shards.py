@@ -0,0 +1,48 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from transactions.models.account_balance_shard import AccountBalanceShard
+from transactions.services import sharding
+
+
+class Command(BaseCommand):
+    help = (
+        "Folds the balance shards of every account that has money in them back into the account row. Runs once, "
+        "or every --interval seconds as a background worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=None,
+            help="Keep running and fold again every this many seconds."
+        )
+
+    def handle(self, *args, **options):
+        if options['interval'] is not None and options['interval'] <= 0:
+            raise CommandError("--interval must be positive.")
+
+        while True:
+            self.stdout.write(json.dumps(self.fold_all()))
+            if options['interval'] is None:
+                return
+            close_old_connections()
+            time.sleep(options['interval'])
+
+    def fold_all(self) -> dict:
+        account_ids = (
+            AccountBalanceShard.objects
+            .exclude(balance=0)
+            .values_list('account_id', flat=True)
+            .distinct()
+            .order_by('account_id')
+        )
+        folded_accounts, folded = 0, 0
+        for account_id in list(account_ids):
+            amount = sharding.fold_account(account_id)
+            if amount:
+                folded_accounts += 1
+                folded += amount
+        return {'accounts': folded_accounts, 'folded': str(folded)}
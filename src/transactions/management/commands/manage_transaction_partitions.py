@@ -0,0 +1,42 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from transactions.services import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Maintains the monthly partitions of the transactions table: creates the partitions for the coming "
+        "months and, with --retain-months, detaches (or with --drop, drops) partitions older than the retention "
+        "window. Meant to run daily, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead', type=int, default=3,
+            help="Make sure partitions exist from the current month through this many months ahead."
+        )
+        parser.add_argument(
+            '--retain-months', type=int, default=None,
+            help="Detach partitions that end before the start of the month this many months ago. Their "
+                 "transactions are no longer listed, so archive them first; their totals are carried forward "
+                 "per account so reconciliation still balances. Off by default."
+        )
+        parser.add_argument('--drop', action='store_true', help="Drop expired partitions instead of detaching them.")
+
+    def handle(self, *args, **options):
+        if options['months_ahead'] < 0:
+            raise CommandError("--months-ahead must not be negative.")
+        if options['retain_months'] is not None and options['retain_months'] < 1:
+            raise CommandError("--retain-months must be at least 1.")
+        if options['drop'] and options['retain_months'] is None:
+            raise CommandError("--drop needs --retain-months.")
+
+        today = timezone.now().date()
+        report = {'created': partitions.ensure_partitions(today, options['months_ahead'])}
+        if options['retain_months'] is not None:
+            expired = partitions.expire_partitions(today, options['retain_months'], drop=options['drop'])
+            report['dropped' if options['drop'] else 'detached'] = expired
+        self.stdout.write(json.dumps(report))
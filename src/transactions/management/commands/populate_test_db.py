@@ -1,14 +1,126 @@
+import multiprocessing
+import random
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.utils import timezone
 from rest_framework.authtoken.models import Token
 
 from transactions.models.account import Account
+from transactions.models.transaction import Transaction
+from transactions.services import rollups
+
+COPY_TRANSACTIONS_SQL = (
+    f"COPY {Transaction._meta.db_table} (created_at, updated_at, account_id, transaction_type, amount) FROM STDIN"
+)
+
+
+def generate_amount(rng: random.Random, options: dict) -> int:
+    """Return an amount in cents drawn from the configured distribution."""
+    max_cents = int(options['max_amount'] * 100)
+    if options['amount_distribution'] == 'lognormal':
+        cents = int(rng.lognormvariate(0, options['amount_sigma']) * float(options['median_amount']) * 100)
+    else:
+        cents = rng.randint(1, max_cents)
+    return max(1, min(cents, max_cents))
+
+
+def generate_history(rng: random.Random, options: dict, now) -> tuple[int, list[tuple]]:
+    """Return (final balance in cents, [(created_at, type, cents), ...]) for one account, oldest first.
+
+    Withdrawals that would overdraw the running balance are turned into deposits, so every generated account
+    ends with a non-negative balance equal to the sum of its transactions.
+    """
+    window = options['days'] * 86400
+    offsets = sorted(rng.random() * window for _ in range(options['transactions_per_account']))
+    balance = 0
+    history = []
+    for offset in reversed(offsets):
+        cents = generate_amount(rng, options)
+        if rng.random() < options['deposit_ratio'] or balance < cents:
+            transaction_type = Transaction.TransactionType.DEPOSIT
+            balance += cents
+        else:
+            transaction_type = Transaction.TransactionType.WITHDRAW
+            balance -= cents
+        history.append((now - timedelta(seconds=offset), transaction_type, cents))
+    return balance, history
+
+
+def populate_chunk(start: int, count: int, password_hash: str, options: dict) -> int:
+    """Create users [start, start + count) with tokens, accounts and transactions; return rows written."""
+    rng = random.Random(None if options['seed'] is None else options['seed'] + start)
+    now = timezone.now()
+    cents = Decimal('0.01')
+
+    with transaction.atomic():
+        users = User.objects.bulk_create(
+            User(username=f"{options['username_prefix']}{i}", password=password_hash)
+            for i in range(start, start + count)
+        )
+        Token.objects.bulk_create(Token(key=Token.generate_key(), user=user) for user in users)
+
+        histories = [generate_history(rng, options, now) for _ in users]
+        accounts = Account.objects.bulk_create(
+            Account(user=user, balance=balance * cents) for user, (balance, _) in zip(users, histories)
+        )
+
+        # COPY streams rows without per-row INSERT overhead, and, unlike bulk_create, keeps the generated
+        # created_at values instead of overwriting them with auto_now_add.
+        rows = 0
+        with connection.cursor() as cursor:
+            with cursor.cursor.copy(COPY_TRANSACTIONS_SQL) as copy:
+                for account, (_, history) in zip(accounts, histories):
+                    for created_at, transaction_type, amount in history:
+                        copy.write_row((created_at, created_at, account.id, transaction_type, amount * cents))
+                        rows += 1
+        rollups.rebuild_accounts([account.id for account in accounts])
+    return rows
 
 
 class Command(BaseCommand):
-    help = "Populates the database with test data (user, token, account)"
+    help = (
+        "Populates the database with test data. Without --users, creates a single user, token and account. "
+        "With --users, bulk-generates users, tokens, accounts and transaction histories."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=None, help="Number of users/accounts to generate.")
+        parser.add_argument(
+            '--transactions-per-account', type=int, default=0, help="Transactions generated for every account."
+        )
+        parser.add_argument('--days', type=int, default=365, help="Spread transactions over the last N days.")
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Accounts created per transaction/COPY.")
+        parser.add_argument('--workers', type=int, default=1, help="Number of processes generating chunks.")
+        parser.add_argument('--username-prefix', default='user_', help="Prefix of generated usernames.")
+        parser.add_argument('--password', default='testpass', help="Password shared by every generated user.")
+        parser.add_argument(
+            '--deposit-ratio', type=float, default=0.6, help="Probability that a transaction is a deposit."
+        )
+        parser.add_argument(
+            '--amount-distribution', choices=['uniform', 'lognormal'], default='lognormal',
+            help="Distribution of transaction amounts."
+        )
+        parser.add_argument(
+            '--median-amount', type=Decimal, default=Decimal('40.00'), help="Median amount (lognormal only)."
+        )
+        parser.add_argument('--amount-sigma', type=float, default=1.0, help="Spread of amounts (lognormal only).")
+        parser.add_argument('--max-amount', type=Decimal, default=Decimal('5000.00'), help="Largest amount.")
+        parser.add_argument('--seed', type=int, default=None, help="Random seed for reproducible data.")
 
     def handle(self, *args, **options):
+        if options['users'] is None:
+            return self.populate_single_user()
+        return self.populate_bulk(options)
+
+    def populate_single_user(self):
         username = "user1"
         password = "testpass"
 
@@ -23,3 +135,42 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f"User {username} created with password {password} "))
         self.stdout.write(self.style.SUCCESS(f"Token: {token.key}"))
         self.stdout.write(self.style.SUCCESS(f"Account created with balance: {account.balance}"))
+
+    def populate_bulk(self, options):
+        total, chunk_size, workers = options['users'], options['chunk_size'], options['workers']
+        if total < 1 or chunk_size < 1 or workers < 1:
+            raise CommandError("--users, --chunk-size and --workers must be at least 1.")
+        if not 0 <= options['deposit_ratio'] <= 1:
+            raise CommandError("--deposit-ratio must be between 0 and 1.")
+
+        prefix = options['username_prefix']
+        if User.objects.filter(username__in=[f"{prefix}0", f"{prefix}{total - 1}"]).exists():
+            raise CommandError(f"Users named '{prefix}N' already exist; choose another --username-prefix.")
+
+        # Password hashing is deliberately slow, so it is done once and the hash is shared by every user.
+        password_hash = make_password(options['password'])
+        chunks = [(start, min(chunk_size, total - start)) for start in range(0, total, chunk_size)]
+
+        started = time.perf_counter()
+        rows = 0
+        if workers == 1:
+            for start, count in chunks:
+                rows += populate_chunk(start, count, password_hash, options)
+                self.stdout.write(f"Created {start + count}/{total} accounts")
+        else:
+            # Forked workers must not share the parent's database socket; each opens its own connection.
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                futures = [
+                    executor.submit(populate_chunk, start, count, password_hash, options) for start, count in chunks
+                ]
+                for done, future in enumerate(futures, start=1):
+                    rows += future.result()
+                    self.stdout.write(f"Created {done}/{len(chunks)} chunks")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {total} users with tokens and accounts and {rows} transactions in {elapsed:.1f}s "
+            f"({rows / elapsed:.0f} transactions/s). Password for every user: {options['password']}"
+        ))
@@ -0,0 +1,32 @@
+import json
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from transactions.services import idempotency
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes stored Idempotency-Key responses older than --older-than-hours (IDEMPOTENCY_KEY_RETENTION_HOURS "
+        "by default). A retry with a deleted key is applied again, so keep them longer than clients retry."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-hours', type=int, default=None,
+            help="Delete keys created more than this many hours ago."
+        )
+
+    def handle(self, *args, **options):
+        hours = options['older_than_hours']
+        if hours is None:
+            hours = settings.IDEMPOTENCY_KEY_RETENTION_HOURS
+        if hours < 0:
+            raise CommandError("--older-than-hours must not be negative.")
+
+        deleted = idempotency.purge(timezone.now() - timedelta(hours=hours))
+        self.stdout.write(json.dumps({'deleted': deleted}))
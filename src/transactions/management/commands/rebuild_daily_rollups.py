@@ -0,0 +1,61 @@
+import json
+import time
+
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from transactions.models.transaction import Transaction
+from transactions.services import rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the per-account daily rollups behind GET /api/statement/summary/ from the transactions, one "
+        "day at a time. Run it once after deploying the rollups to backfill history, or to catch up after "
+        "transactions were loaded or changed outside the ledger. Days in expired partitions (see "
+        "manage_transaction_partitions --retain-months) are skipped, keeping their rollups."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from-date', type=date.fromisoformat, default=None,
+            help="First day (UTC, YYYY-MM-DD) to rebuild. Defaults to the day of the oldest transaction."
+        )
+        parser.add_argument(
+            '--to-date', type=date.fromisoformat, default=None,
+            help="Last day (UTC, YYYY-MM-DD) to rebuild, inclusive. Defaults to today."
+        )
+
+    def handle(self, *args, **options):
+        last_day = options['to_date'] or timezone.now().date()
+        first_day = options['from_date']
+        if first_day is None:
+            oldest = Transaction.objects.aggregate(oldest=Min('created_at'))['oldest']
+            first_day = rollups.day_of(oldest) if oldest else last_day
+        if first_day > last_day:
+            raise CommandError("--from-date must not be after --to-date.")
+        # Days in expired partitions have no transactions left to rebuild from; their rollups are kept as they are.
+        rebuildable_from = rollups.first_rebuildable_day()
+        skipped = 0
+        if rebuildable_from is not None and first_day < rebuildable_from:
+            skipped = (min(rebuildable_from, last_day + timedelta(days=1)) - first_day).days
+            first_day = rebuildable_from
+
+        started = time.perf_counter()
+        days = rows = 0
+        day = first_day
+        while day <= last_day:
+            rows += rollups.rebuild_day(day)
+            days += 1
+            day += timedelta(days=1)
+        self.stdout.write(json.dumps({
+            'from': first_day.isoformat(),
+            'to': last_day.isoformat(),
+            'days': days,
+            'skipped_expired_days': skipped,
+            'rollups': rows,
+            'elapsed_s': round(time.perf_counter() - started, 3),
+        }))
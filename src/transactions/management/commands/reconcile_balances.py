@@ -0,0 +1,129 @@
+import json
+import os
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from transactions.models.account import Account
+from transactions.services.reconciliation import find_drift, repair_drift
+
+
+class Checkpoint:
+    """Progress persisted between runs: every account below `next_id` has been reconciled."""
+
+    def __init__(self, path: Path | None):
+        self.path = path
+        self.state = {'next_id': None, 'drifted': 0, 'repaired': 0}
+        if path and path.exists():
+            self.state.update(json.loads(path.read_text()))
+
+    def save(self):
+        if not self.path:
+            return
+        self.state['updated_at'] = timezone.now().isoformat()
+        tmp_path = self.path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(self.state))
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if self.path and self.path.exists():
+            self.path.unlink()
+
+
+class Command(BaseCommand):
+    help = (
+        "Checks that every account's balance equals the signed sum of its transactions, scanning account-id "
+        "ranges in parallel with one grouped aggregate per range. Drifted accounts are printed as JSON lines "
+        "and can optionally be repaired."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000, help="Account ids per range.")
+        parser.add_argument('--workers', type=int, default=4, help="Ranges reconciled concurrently.")
+        parser.add_argument('--chunk-size', type=int, default=2000, help="Rows fetched per server-side cursor trip.")
+        parser.add_argument('--repair', action='store_true', help="Set drifted balances to their ledger sum.")
+        parser.add_argument('--checkpoint', type=Path, default=None, help="File used to resume an interrupted run.")
+        parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint.")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['workers'] < 1:
+            raise CommandError("--batch-size and --workers must be at least 1.")
+
+        checkpoint = Checkpoint(options['checkpoint'])
+        if options['restart']:
+            checkpoint.clear()
+            checkpoint = Checkpoint(options['checkpoint'])
+
+        bounds = Account.objects.aggregate(first_id=Min('id'), last_id=Max('id'))
+        if bounds['first_id'] is None:
+            self.write_summary(checkpoint, resumed_from=None, elapsed=0)
+            return
+
+        resumed_from = checkpoint.state['next_id']
+        start = max(bounds['first_id'], resumed_from or bounds['first_id'])
+        end = bounds['last_id'] + 1
+        ranges = [
+            (first_id, min(first_id + options['batch_size'], end))
+            for first_id in range(start, end, options['batch_size'])
+        ]
+
+        started = time.perf_counter()
+        pending = {first_id for first_id, _ in ranges}
+        for first_id, drifts, repaired in self.reconcile_ranges(ranges, options):
+            for drift in drifts:
+                self.stdout.write(json.dumps({**drift.as_dict(), 'repaired': options['repair']}))
+            checkpoint.state['drifted'] += len(drifts)
+            checkpoint.state['repaired'] += repaired
+
+            # Ranges finish out of order; the checkpoint only advances past contiguous finished ranges.
+            pending.discard(first_id)
+            checkpoint.state['next_id'] = min(pending) if pending else end
+            checkpoint.save()
+
+        self.write_summary(checkpoint, resumed_from=resumed_from, elapsed=time.perf_counter() - started)
+        checkpoint.clear()
+
+        if checkpoint.state['drifted'] > checkpoint.state['repaired']:
+            raise CommandError(f"{checkpoint.state['drifted']} account(s) do not match their transactions.")
+
+    def reconcile_ranges(self, ranges: list[tuple[int, int]], options: dict):
+        if options['workers'] == 1:
+            for first_id, last_id in ranges:
+                yield self.reconcile_range(first_id, last_id, options)
+            return
+
+        def reconcile_in_thread(first_id, last_id):
+            try:
+                return self.reconcile_range(first_id, last_id, options)
+            finally:
+                # Each worker thread opens its own connection; release it rather than leaving it idle.
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = [executor.submit(reconcile_in_thread, first_id, last_id) for first_id, last_id in ranges]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def reconcile_range(self, first_id: int, last_id: int, options: dict):
+        drifts = list(find_drift(first_id, last_id, chunk_size=options['chunk_size']))
+        repaired = 0
+        if options['repair']:
+            drifts = [repair_drift(drift.account_id) for drift in drifts]
+            drifts = [drift for drift in drifts if drift is not None]
+            repaired = len(drifts)
+        return first_id, drifts, repaired
+
+    def write_summary(self, checkpoint: Checkpoint, resumed_from: int | None, elapsed: float):
+        self.stdout.write(json.dumps({
+            'summary': True,
+            'drifted': checkpoint.state['drifted'],
+            'repaired': checkpoint.state['repaired'],
+            'resumed_from': resumed_from,
+            'elapsed_s': round(elapsed, 3),
+        }))
@@ -0,0 +1,31 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from transactions.models.account import Account
+from transactions.services import sharding
+
+
+class Command(BaseCommand):
+    help = (
+        "Spreads an account's deposits over N balance shards, so concurrent deposits to it stop queueing on one "
+        "row lock. --shards 0 turns sharding off and folds the shards back into the account."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', required=True, help="Owner of the account.")
+        parser.add_argument('--shards', type=int, required=True, help="Number of shards; 0 turns sharding off.")
+
+    def handle(self, *args, **options):
+        if options['shards'] < 0:
+            raise CommandError("--shards must not be negative.")
+        account_id = Account.objects.filter(user__username=options['username']).values_list('id', flat=True).first()
+        if account_id is None:
+            raise CommandError(f"User '{options['username']}' has no account.")
+
+        folded = sharding.set_shard_count(account_id, options['shards'])
+        self.stdout.write(json.dumps({
+            'account_id': account_id,
+            'shard_count': options['shards'],
+            'folded': str(folded),
+        }))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:23
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Build the indexes without blocking writes on an already large transactions table.
+    atomic = False
+
+    dependencies = [
+        ('transactions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='transaction',
+            options={'ordering': ['-created_at', '-id']},
+        ),
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(fields=['account', '-created_at', '-id'], name='txn_account_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(fields=['account', 'transaction_type', '-created_at', '-id'], name='txn_account_type_created_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0003_account_balance_shards'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='status',
+            field=models.CharField(choices=[('applied', 'Applied'), ('pending', 'Pending')], db_default='applied', default='applied', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['id'], name='txn_pending_idx'),
+        ),
+    ]
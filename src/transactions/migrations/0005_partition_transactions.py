@@ -0,0 +1,136 @@
+from datetime import datetime, timezone
+
+from django.db import migrations
+
+TABLE = 'transactions_transaction'
+LEGACY = f'{TABLE}_legacy'
+DEFAULT = f'{TABLE}_default'
+SEQUENCE = f'{TABLE}_id_seq'
+# Monthly partitions created up front after the legacy one; manage_transaction_partitions adds the rest.
+MONTHS_AHEAD = 3
+
+
+def _month_start(index: int) -> datetime:
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _definitions(cursor, table: str) -> tuple[list[str], list[str]]:
+    """CREATE INDEX statements and foreign-key definitions of `table`, primary key excluded."""
+    cursor.execute(
+        """
+        SELECT pg_get_indexdef(indexrelid) FROM pg_index
+        WHERE indrelid = %s::regclass AND NOT indisprimary ORDER BY indexrelid
+        """,
+        [table],
+    )
+    indexes = [row[0] for row in cursor.fetchall()]
+    cursor.execute(
+        """
+        SELECT format('ALTER TABLE %%I ADD CONSTRAINT %%I %%s', %s::text, conname, pg_get_constraintdef(oid))
+        FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f' ORDER BY conname
+        """,
+        [table, table],
+    )
+    return indexes, [row[0] for row in cursor.fetchall()]
+
+
+def _rename_dependents(cursor, table: str, suffix: str):
+    cursor.execute(
+        """
+        SELECT format('ALTER INDEX %%I RENAME TO %%I', index.relname, left(index.relname, 63 - length(%s::text)) || %s::text)
+        FROM pg_index JOIN pg_class index ON index.oid = pg_index.indexrelid
+        WHERE pg_index.indrelid = %s::regclass
+        UNION ALL
+        SELECT format('ALTER TABLE %%I RENAME CONSTRAINT %%I TO %%I', %s::text, conname, left(conname, 63 - length(%s::text)) || %s::text)
+        FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'
+        """,
+        [suffix, suffix, table, table, suffix, suffix, table],
+    )
+    for (statement,) in cursor.fetchall():
+        cursor.execute(statement)
+
+
+def partition(apps, schema_editor):
+    """Turn the transactions table into a table partitioned by month of created_at.
+
+    The existing table is not copied: it is attached as the partition for everything before next month, which
+    covers every row written so far, and later months get their own partitions. A CHECK constraint validated
+    beforehand lets the attach skip scanning it, and its renamed indexes become the partitions of the new table's
+    indexes. Only the index of the new (id, created_at) primary key is built on it, during the attach, which runs
+    with the table locked.
+    """
+    now = datetime.now(timezone.utc)
+    next_month = now.year * 12 + now.month
+    cutover = _month_start(next_month)
+
+    # DDL takes no bind parameters, which matters with server-side binding; bounds are inlined as literals.
+    compose = schema_editor.connection.ops.compose_sql
+
+    with schema_editor.connection.cursor() as cursor:
+        indexes, foreign_keys = _definitions(cursor, TABLE)
+        cursor.execute(f'SELECT max(id) FROM {TABLE}')
+        max_id = cursor.fetchone()[0]
+
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {LEGACY}')
+        # Replaced by the partitioned table's (id, created_at) primary key once attached.
+        cursor.execute(f'ALTER TABLE {LEGACY} DROP CONSTRAINT {TABLE}_pkey')
+        _rename_dependents(cursor, LEGACY, '_legacy')
+        cursor.execute(f'ALTER TABLE {LEGACY} ALTER COLUMN id DROP IDENTITY')
+        cursor.execute(compose(
+            f'ALTER TABLE {LEGACY} ADD CONSTRAINT {LEGACY}_created_at_check CHECK (created_at < %s) NOT VALID',
+            [cutover],
+        ))
+        cursor.execute(f'ALTER TABLE {LEGACY} VALIDATE CONSTRAINT {LEGACY}_created_at_check')
+
+        # Postgres 16 does not allow identity columns on partitioned tables; a sequence owned by the column does
+        # the same job, and is what pg_get_serial_sequence (used by sequence resets) looks for.
+        cursor.execute(f'CREATE TABLE {TABLE} (LIKE {LEGACY} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)')
+        cursor.execute(f'CREATE SEQUENCE {SEQUENCE} OWNED BY {TABLE}.id')
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')")
+        cursor.execute('SELECT setval(%s, %s, %s)', [SEQUENCE, max_id or 1, max_id is not None])
+        # Partitioned tables need the partition key in every unique constraint; ids stay unique via the sequence.
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, created_at)')
+        for statement in indexes + foreign_keys:
+            cursor.execute(statement)
+
+        cursor.execute(
+            compose(f'ALTER TABLE {TABLE} ATTACH PARTITION {LEGACY} FOR VALUES FROM (MINVALUE) TO (%s)', [cutover])
+        )
+        for month in range(next_month, next_month + MONTHS_AHEAD):
+            start, end = _month_start(month), _month_start(month + 1)
+            cursor.execute(compose(
+                f'CREATE TABLE {TABLE}_p{start:%Y%m} PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)', [start, end]
+            ))
+        cursor.execute(f'CREATE TABLE {DEFAULT} PARTITION OF {TABLE} DEFAULT')
+
+
+def unpartition(apps, schema_editor):
+    """Copy every partition back into a single plain table."""
+    with schema_editor.connection.cursor() as cursor:
+        indexes, foreign_keys = _definitions(cursor, TABLE)
+        cursor.execute(f'CREATE TABLE {TABLE}_plain (LIKE {TABLE} INCLUDING DEFAULTS)')
+        # The copied id default refers to the sequence that goes away with the partitioned table.
+        cursor.execute(f'ALTER TABLE {TABLE}_plain ALTER COLUMN id DROP DEFAULT')
+        cursor.execute(f'INSERT INTO {TABLE}_plain SELECT * FROM {TABLE}')
+        cursor.execute(f'SELECT max(id) FROM {TABLE}')
+        max_id = cursor.fetchone()[0]
+        cursor.execute(f'DROP TABLE {TABLE}')
+        cursor.execute(f'ALTER TABLE {TABLE}_plain RENAME TO {TABLE}')
+        cursor.execute(f'ALTER TABLE {TABLE} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY')
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{TABLE}', 'id'), %s, %s)", [max_id or 1, max_id is not None]
+        )
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id)')
+        for statement in indexes + foreign_keys:
+            cursor.execute(statement.replace(' ON ONLY ', ' ON '))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0004_transaction_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0005_partition_transactions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('slot', models.PositiveSmallIntegerField(default=0)),
+                ('deposit_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('withdraw_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='daily_rollups', to='transactions.account')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('account', 'day', 'slot'), name='account_day_slot_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:20
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0008_ledger_carry_forward'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='txn_created_brin_idx'),
+        ),
+    ]
@@ -1,2 +1,6 @@
 from .account import Account  # noqa: F401
+from .account_balance_shard import AccountBalanceShard  # noqa: F401
+from .account_daily_rollup import AccountDailyRollup  # noqa: F401
+from .idempotency_key import IdempotencyKey  # noqa: F401
+from .ledger_carry_forward import LedgerCarryForward  # noqa: F401
 from .transaction import Transaction  # noqa: F401
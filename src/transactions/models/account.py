@@ -7,6 +7,8 @@ from transactions.models.mixins import TimestampedModel
 class Account(TimestampedModel):
     user = models.OneToOneField(User, on_delete=models.PROTECT)
     balance = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # Number of AccountBalanceShard rows deposits are spread over; 0 means deposits update this row.
+    shard_count = models.PositiveSmallIntegerField(default=0)
 
     def __str__(self):
         return f"Account #{self.pk} ({self.user.username})"
@@ -0,0 +1,21 @@
+from django.db import models
+
+from transactions.models.account import Account
+from transactions.models.mixins import TimestampedModel
+
+
+# Part of a sharded account's balance. Deposits to an account with shard_count > 0 are added to one of its
+# shards instead of its own row, so concurrent deposits lock different rows. The account's balance is
+# Account.balance plus the sum of its shards; folding moves the shards back into Account.balance.
+class AccountBalanceShard(TimestampedModel):
+    account = models.ForeignKey(Account, on_delete=models.PROTECT, related_name="shards")
+    index = models.PositiveSmallIntegerField()
+    balance = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"Shard {self.index} of account #{self.account_id}: {self.balance}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['account', 'index'], name='account_shard_index_unique'),
+        ]
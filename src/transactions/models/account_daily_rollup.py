@@ -0,0 +1,24 @@
+from django.db import models
+
+from transactions.models.account import Account
+
+
+# Per-account totals of the applied transactions created on one (UTC) day, kept up to date by the ledger in the
+# same database transaction as the transactions themselves, so statement summaries read one row per day instead
+# of every transaction. Deposits to a balance shard update the slot of that shard (its index + 1) rather than
+# slot 0, so a sharded account's deposits do not all contend on one rollup row; readers sum the slots.
+class AccountDailyRollup(models.Model):
+    account = models.ForeignKey(Account, on_delete=models.PROTECT, related_name="daily_rollups")
+    day = models.DateField()
+    slot = models.PositiveSmallIntegerField(default=0)
+    deposit_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    withdraw_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Account #{self.account_id} on {self.day} (slot {self.slot}): +{self.deposit_sum} -{self.withdraw_sum}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['account', 'day', 'slot'], name='account_day_slot_unique'),
+        ]
@@ -0,0 +1,28 @@
+from django.contrib.auth.models import User
+from django.db import models
+
+from transactions.models.mixins import TimestampedModel
+
+
+# The stored outcome of a deposit or withdrawal sent with an Idempotency-Key header. A retry with the same key
+# is answered from here (or from the cache in front of it) instead of being applied again. The row is inserted
+# before the operation runs, in the same database transaction, so a concurrent retry waits on the unique index
+# and then replays the committed response.
+class IdempotencyKey(TimestampedModel):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="idempotency_keys")
+    key = models.CharField(max_length=255)
+    # Hash of the request path and body, so a key reused for a different request is rejected.
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.JSONField(null=True)
+
+    def __str__(self):
+        return f"Idempotency key {self.key!r} of user #{self.user_id}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='idempotency_key_user_key_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at'], name='idempotency_key_created_idx'),
+        ]
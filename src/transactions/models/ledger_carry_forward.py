@@ -0,0 +1,16 @@
+from django.db import models
+
+from transactions.models.account import Account
+from transactions.models.mixins import TimestampedModel
+
+
+# Net effect on the account's balance of its transactions in partitions that have since been detached or dropped
+# (see partitions.expire_partitions). Reconciliation adds it to the sum of the transactions still in the table.
+class LedgerCarryForward(TimestampedModel):
+    account = models.OneToOneField(
+        Account, on_delete=models.PROTECT, primary_key=True, related_name="ledger_carry_forward"
+    )
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"Account #{self.account_id}: {self.amount} carried forward"
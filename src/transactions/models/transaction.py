@@ -1,3 +1,4 @@
+from django.contrib.postgres.indexes import BrinIndex
 from django.db import models
 
 from transactions.models.account import Account
@@ -9,12 +10,37 @@ class Transaction(TimestampedModel):
         DEPOSIT = 'deposit', 'Deposit'
         WITHDRAW = 'withdraw', 'Withdraw'
 
+    class Status(models.TextChoices):
+        APPLIED = 'applied', 'Applied'
+        # Recorded but not yet added to the account balance; see ledger.apply_pending_deposits.
+        PENDING = 'pending', 'Pending'
+
     account = models.ForeignKey(Account, on_delete=models.PROTECT, related_name="transactions")
     transaction_type = models.CharField(max_length=10, choices=TransactionType.choices)
     amount = models.DecimalField(max_digits=12, decimal_places=2)
+    # db_default covers the raw-SQL and COPY writers, which do not list this column.
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.APPLIED, db_default=Status.APPLIED
+    )
 
     def __str__(self):
         return f"Transaction #{self.pk}: {self.transaction_type} of {self.amount} on {self.created_at}"
 
+    # The table is range-partitioned by month of created_at (migration 0005, manage_transaction_partitions): its
+    # primary key is (id, created_at) in the database, and Postgres cannot build its indexes CONCURRENTLY.
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # Keyset pagination of an account's history walks these in (created_at, id) order,
+            # so reading page N costs the same as reading page 1.
+            models.Index(fields=['account', '-created_at', '-id'], name='txn_account_created_idx'),
+            models.Index(
+                fields=['account', 'transaction_type', '-created_at', '-id'],
+                name='txn_account_type_created_idx'
+            ),
+            # The apply worker claims pending rows oldest first; applied rows, nearly all of them, stay out of it.
+            models.Index(fields=['id'], condition=models.Q(status='pending'), name='txn_pending_idx'),
+            # Bounds rebuild_daily_rollups' scan of one day. Rows arrive in created_at order, so a BRIN index
+            # serves this at a fraction of a B-tree's size and insert cost.
+            BrinIndex(fields=['created_at'], name='txn_created_brin_idx'),
+        ]
@@ -1,11 +1,17 @@
+from datetime import timedelta
 from decimal import Decimal
 
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
 from rest_framework import serializers
 
+from metrics.serializers import TimedSerializerMixin
 from transactions.models.account import Account
+from transactions.models.transaction import Transaction
 
 
-class TransactionSerializer(serializers.Serializer):
+class TransactionSerializer(TimedSerializerMixin, serializers.Serializer):
     amount = serializers.DecimalField(
         max_digits=12,
         decimal_places=2,
@@ -14,7 +20,144 @@ class TransactionSerializer(serializers.Serializer):
     )
 
 
-class BalanceSerializer(serializers.ModelSerializer):
+class TransferSerializer(TransactionSerializer):
+    to_username = serializers.CharField(
+        max_length=150,
+        help_text="Username of the account receiving the amount."
+    )
+
+
+class BalanceSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Account
         fields = ['balance']
+
+
+class BatchOperationSerializer(TimedSerializerMixin, serializers.Serializer):
+    type = serializers.ChoiceField(
+        choices=Transaction.TransactionType.choices,
+        help_text="Operation to apply."
+    )
+    amount = serializers.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        min_value=Decimal("0.01"),
+        help_text="Amount to operate."
+    )
+
+
+class BatchTransactionSerializer(TimedSerializerMixin, serializers.Serializer):
+    class Mode(models.TextChoices):
+        ALL_OR_NOTHING = 'all_or_nothing', 'All or nothing'
+        BEST_EFFORT = 'best_effort', 'Best effort'
+
+    mode = serializers.ChoiceField(
+        choices=Mode.choices,
+        default=Mode.ALL_OR_NOTHING,
+        help_text=(
+            "'all_or_nothing' rejects the whole batch if any operation fails; "
+            "'best_effort' applies every operation that can be applied."
+        )
+    )
+    operations = BatchOperationSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=settings.TRANSACTIONS_BATCH_MAX_OPERATIONS,
+        help_text="Operations applied in order to the authenticated user's account."
+    )
+
+
+class TransactionHistorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Transaction
+        fields = ['id', 'transaction_type', 'amount', 'status', 'created_at']
+
+
+class TransactionHistoryFilterSerializer(TimedSerializerMixin, serializers.Serializer):
+    transaction_type = serializers.ChoiceField(
+        choices=Transaction.TransactionType.choices,
+        required=False,
+        help_text="Only return transactions of this type."
+    )
+
+    # 'from' is a Python keyword, so the date range fields are declared here rather than as attributes.
+    def get_fields(self):
+        fields = super().get_fields()
+        fields['from'] = serializers.DateTimeField(
+            required=False,
+            help_text="Only return transactions created at or after this instant."
+        )
+        fields['to'] = serializers.DateTimeField(
+            required=False,
+            help_text="Only return transactions created before this instant."
+        )
+        return fields
+
+    def validate(self, attrs):
+        if 'from' in attrs and 'to' in attrs and attrs['from'] >= attrs['to']:
+            raise serializers.ValidationError({'to': "Must be later than 'from'."})
+        return attrs
+
+
+class TransactionExportFilterSerializer(TransactionHistoryFilterSerializer):
+    format = serializers.ChoiceField(
+        choices=[('csv', 'CSV'), ('ndjson', 'Newline-delimited JSON')],
+        default='csv',
+        help_text="File format of the export."
+    )
+
+
+class StatementSummaryFilterSerializer(TimedSerializerMixin, serializers.Serializer):
+    class Period(models.TextChoices):
+        DAY = 'day', 'Day'
+        MONTH = 'month', 'Month'
+
+    period = serializers.ChoiceField(
+        choices=Period.choices,
+        default=Period.DAY,
+        help_text="Group the totals by day or by calendar month."
+    )
+
+    # 'from' is a Python keyword, so the date range fields are declared here rather than as attributes.
+    def get_fields(self):
+        fields = super().get_fields()
+        fields['from'] = serializers.DateField(
+            required=False,
+            help_text="First day (UTC) included. Defaults to 30 days before 'to'."
+        )
+        fields['to'] = serializers.DateField(
+            required=False,
+            help_text="Day (UTC) the summary stops before. Defaults to tomorrow, so today is included."
+        )
+        return fields
+
+    def validate(self, attrs):
+        if 'to' not in attrs:
+            attrs['to'] = timezone.now().date() + timedelta(days=1)
+        if 'from' not in attrs:
+            attrs['from'] = attrs['to'] - timedelta(days=30)
+        if attrs['from'] >= attrs['to']:
+            raise serializers.ValidationError({'to': "Must be later than 'from'."})
+        return attrs
+
+
+class StatementTotalsSerializer(TimedSerializerMixin, serializers.Serializer):
+    deposits = serializers.DecimalField(max_digits=14, decimal_places=2)
+    withdrawals = serializers.DecimalField(max_digits=14, decimal_places=2)
+    transactions = serializers.IntegerField()
+
+
+class StatementPeriodSerializer(StatementTotalsSerializer):
+    period_start = serializers.DateField()
+
+
+class StatementSummarySerializer(TimedSerializerMixin, serializers.Serializer):
+    period = serializers.ChoiceField(choices=StatementSummaryFilterSerializer.Period.choices)
+    totals = StatementTotalsSerializer()
+    periods = StatementPeriodSerializer(many=True)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fields['from'] = serializers.DateField()
+        fields['to'] = serializers.DateField()
+        return fields
@@ -0,0 +1,123 @@
+import secrets
+import threading
+
+from collections.abc import Awaitable, Callable
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from metrics.registry import counter_lines
+
+
+class CacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+
+# Counters are per process; aggregate them across workers in the metrics backend.
+stats = CacheStats()
+
+
+def is_enabled() -> bool:
+    return settings.BALANCE_CACHE_ENABLED
+
+
+def generation_key(user_id: int) -> str:
+    return f"balance:user:{user_id}:generation"
+
+
+def cache_key(user_id: int, generation: str) -> str:
+    return f"balance:user:{user_id}:{generation}"
+
+
+def _cache():
+    return caches[settings.BALANCE_CACHE_ALIAS]
+
+
+# A balance is cached under the user's current generation, a random token that every write replaces once it
+# commits. Readers look the generation up before loading the balance, so a reader that loaded a balance just before
+# a write committed stores it under the replaced generation, where nobody looks for it any more. A missing
+# generation (new, expired or evicted) is simply created; being random, it never brings back an old entry.
+def _generation(cache, user_id: int) -> str:
+    generation = cache.get(generation_key(user_id))
+    if generation is None:
+        generation = secrets.token_hex(8)
+        if not cache.add(generation_key(user_id), generation, timeout=settings.BALANCE_CACHE_TIMEOUT):
+            generation = cache.get(generation_key(user_id), generation)
+    return generation
+
+
+async def _ageneration(cache, user_id: int) -> str:
+    generation = await cache.aget(generation_key(user_id))
+    if generation is None:
+        generation = secrets.token_hex(8)
+        if not await cache.aadd(generation_key(user_id), generation, timeout=settings.BALANCE_CACHE_TIMEOUT):
+            generation = await cache.aget(generation_key(user_id), generation)
+    return generation
+
+
+# A balance read from a replica may lag writes that did not pin the user to the primary (the recipient of a
+# transfer, the apply worker, reconciliation), and once cached it would outlive the lag. `load` is therefore given
+# the database to read from: the primary when the balance will be cached, or None to let the router decide.
+def get_balance(user_id: int, load: Callable[[str | None], Decimal]) -> Decimal:
+    """Return the user's cached balance, calling `load` to read it from the database on a miss."""
+    if not is_enabled():
+        return load(None)
+
+    cache = _cache()
+    key = cache_key(user_id, _generation(cache, user_id))
+    balance = cache.get(key)
+    stats.record(hit=balance is not None)
+    if balance is None:
+        balance = load(DEFAULT_DB_ALIAS)
+        cache.set(key, balance, timeout=settings.BALANCE_CACHE_TIMEOUT)
+    return balance
+
+
+async def aget_balance(user_id: int, aload: Callable[[str | None], Awaitable[Decimal]]) -> Decimal:
+    """Async version of get_balance()."""
+    if not is_enabled():
+        return await aload(None)
+
+    cache = _cache()
+    key = cache_key(user_id, await _ageneration(cache, user_id))
+    balance = await cache.aget(key)
+    stats.record(hit=balance is not None)
+    if balance is None:
+        balance = await aload(DEFAULT_DB_ALIAS)
+        await cache.aset(key, balance, timeout=settings.BALANCE_CACHE_TIMEOUT)
+    return balance
+
+
+def invalidate(user_id: int):
+    """Start a new generation of the user's cached balance once the current database transaction commits."""
+    if not is_enabled():
+        return
+    key = generation_key(user_id)
+    transaction.on_commit(
+        lambda: _cache().set(key, secrets.token_hex(8), timeout=settings.BALANCE_CACHE_TIMEOUT)
+    )
+
+
+def collect_metrics() -> list[str]:
+    """Hit and miss counters in Prometheus exposition format, served at /metrics/."""
+    snapshot = stats.snapshot()
+    return counter_lines(
+        'balance_cache_requests_total', 'Balance cache lookups, by result.', ('result',),
+        [(('hit',), snapshot['hits']), (('miss',), snapshot['misses'])]
+    )
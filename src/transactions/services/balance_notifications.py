@@ -0,0 +1,111 @@
+import asyncio
+import logging
+
+from collections.abc import Iterable
+
+import psycopg
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+
+logger = logging.getLogger(__name__)
+
+# Notifications carry the user id; listeners read the new balance themselves.
+CHANNEL = 'balance_changed'
+
+
+def is_enabled() -> bool:
+    return settings.BALANCE_NOTIFICATIONS_ENABLED
+
+
+def notify_column(user_id_param: str = '%(user_id)s') -> str:
+    """A column to append to the final SELECT of a single-statement write, notifying without another round trip.
+
+    The SELECT must only return rows for accounts that were written to.
+    """
+    if not is_enabled():
+        return ''
+    return f", pg_notify('{CHANNEL}', {user_id_param}::text)"
+
+
+def notify(user_ids: Iterable[int]):
+    """Notify that the users' balances changed. Postgres delivers it when the current transaction commits."""
+    if not is_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT pg_notify('{CHANNEL}', user_id::text) FROM unnest(%s::bigint[]) AS user_id", [list(user_ids)]
+        )
+
+
+def _connection_params() -> dict:
+    # Notifications are sent on the primary and are not replicated, so this always listens there.
+    settings_dict = connections[DEFAULT_DB_ALIAS].settings_dict
+    params = {
+        'dbname': settings_dict['NAME'],
+        'user': settings_dict['USER'],
+        'password': settings_dict['PASSWORD'],
+        'host': settings_dict['HOST'],
+        'port': settings_dict['PORT'],
+    }
+    return {key: value for key, value in params.items() if value}
+
+
+class Listener:
+    """Shares one LISTEN connection per process among the balance streams it serves.
+
+    Each subscription gets an asyncio.Event that is set whenever the user's balance changes, and after every
+    (re)connect, since changes made while not listening were missed. The connection is opened on the event loop
+    of the first subscriber and closed when the last one leaves.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[int, set[asyncio.Event]] = {}
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, user_id: int) -> asyncio.Event:
+        changed = asyncio.Event()
+        self._subscribers.setdefault(user_id, set()).add(changed)
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._listen())
+        return changed
+
+    def unsubscribe(self, user_id: int, changed: asyncio.Event):
+        subscribers = self._subscribers.get(user_id, set())
+        subscribers.discard(changed)
+        if not subscribers:
+            self._subscribers.pop(user_id, None)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _wake(self, user_ids: Iterable[int]):
+        for user_id in user_ids:
+            for changed in self._subscribers.get(user_id, ()):
+                changed.set()
+
+    async def _listen(self):
+        # Whatever goes wrong, the listener reconnects: if it stopped, every open stream would only get keepalives.
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(**_connection_params(), autocommit=True) as conn:
+                    await conn.execute(f'LISTEN {CHANNEL}')
+                    self._wake(list(self._subscribers))
+                    async for notification in conn.notifies():
+                        try:
+                            user_id = int(notification.payload)
+                        except ValueError:
+                            logger.warning(
+                                "Balance listener ignored a notification", extra={'payload': notification.payload}
+                            )
+                            continue
+                        self._wake([user_id])
+            except psycopg.OperationalError:
+                logger.warning("Balance listener lost its database connection", exc_info=True)
+            except Exception:
+                logger.exception("Balance listener failed")
+            await asyncio.sleep(settings.BALANCE_STREAM_RECONNECT_SECONDS)
+
+
+listener = Listener()
@@ -0,0 +1,28 @@
+import hashlib
+
+from django.http import HttpRequest, HttpResponseBase, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+# Responses are per user and must be revalidated before reuse; clients and shared caches keep them only for that.
+CACHE_CONTROL = 'private, no-cache'
+
+
+def etag(*parts) -> str:
+    """A strong ETag derived from everything that determines a response's body."""
+    digest = hashlib.sha256('\n'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def matches(request: HttpRequest, tag: str) -> bool:
+    etags = parse_etags(request.headers.get('If-None-Match', ''))
+    return tag in etags or '*' in etags
+
+
+def not_modified(tag: str) -> HttpResponseNotModified:
+    return tag_response(HttpResponseNotModified(), tag)
+
+
+def tag_response(response: HttpResponseBase, tag: str) -> HttpResponseBase:
+    response['ETag'] = tag
+    response['Cache-Control'] = CACHE_CONTROL
+    return response
@@ -0,0 +1,73 @@
+import csv
+import json
+
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+# Columns of an exported statement, in order. Rows are read as tuples, never as model instances or serializers.
+COLUMNS = ('id', 'created_at', 'transaction_type', 'amount', 'status')
+
+
+class _Echo:
+    """File-like object whose write() returns what it is given, so csv.writer produces strings to yield."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _csv_lines(rows: Iterable[tuple]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(COLUMNS)
+    for id_, created_at, transaction_type, amount, status in rows:
+        yield writer.writerow((id_, created_at.isoformat(), transaction_type, amount, status))
+
+
+def _ndjson_lines(rows: Iterable[tuple]) -> Iterator[str]:
+    for id_, created_at, transaction_type, amount, status in rows:
+        yield json.dumps({
+            'id': id_,
+            'created_at': created_at.isoformat(),
+            'transaction_type': transaction_type,
+            'amount': str(amount),
+            'status': status,
+        }, separators=(',', ':')) + '\n'
+
+
+FORMATS = {
+    'csv': ('text/csv', _csv_lines),
+    'ndjson': ('application/x-ndjson', _ndjson_lines),
+}
+
+
+def stream(transactions: QuerySet, export_format: str, chunk_size: int) -> Iterator[bytes]:
+    """Encode `transactions` in `export_format`, `chunk_size` rows per yielded chunk.
+
+    Rows come from a server-side cursor (`QuerySet.iterator`), so only one chunk of rows is held in memory at a
+    time however long the statement is. The generator holds a transaction open while it runs: outside one, Django
+    declares the cursor WITH HOLD, and Postgres would materialize the whole result when the statement commits.
+    """
+    _, encode = FORMATS[export_format]
+    with transaction.atomic(using=transactions.db):
+        lines = encode(transactions.values_list(*COLUMNS).iterator(chunk_size=chunk_size))
+        while chunk := ''.join(islice(lines, chunk_size)):
+            yield chunk.encode()
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, by name or through `*`, with a non-zero q-value."""
+    qualities = {}
+    for item in accept_encoding.split(','):
+        coding, *params = (part.strip() for part in item.split(';'))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
@@ -0,0 +1,132 @@
+import hashlib
+import json
+
+from collections.abc import Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
+
+from transactions.models.idempotency_key import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = IdempotencyKey._meta.get_field('key').max_length
+
+# Claims the key for this request. If another request holds it, the insert waits for that transaction and then
+# returns nothing if it committed.
+RESERVE_SQL = """
+    INSERT INTO {table} (created_at, updated_at, user_id, key, fingerprint)
+    VALUES (%(now)s, %(now)s, %(user_id)s, %(key)s, %(fingerprint)s)
+    ON CONFLICT (user_id, key) DO NOTHING
+    RETURNING id
+"""
+
+
+class KeyReused(Exception):
+    """The key was already used for a request with a different path or body."""
+
+
+class Result:
+    def __init__(self, body, status_code: int, replayed: bool = False):
+        self.body = body
+        self.status_code = status_code
+        self.replayed = replayed
+
+    @property
+    def headers(self) -> dict:
+        return {REPLAYED_HEADER: 'true'} if self.replayed else {}
+
+
+def fingerprint(path: str, data) -> str:
+    payload = json.dumps(data, sort_keys=True, cls=JSONEncoder)
+    return hashlib.sha256(f'{path}\n{payload}'.encode()).hexdigest()
+
+
+def cache_key(user_id: int, key: str) -> str:
+    # Client keys can be up to 255 arbitrary characters; hashing keeps the cache key short and safe for memcached.
+    return f"idempotency:user:{user_id}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def _cache():
+    return caches[settings.IDEMPOTENCY_CACHE_ALIAS]
+
+
+def _remember(user_id: int, key: str, stored: tuple):
+    _cache().set(cache_key(user_id, key), stored, timeout=settings.IDEMPOTENCY_CACHE_TIMEOUT)
+
+
+def _replay(stored: tuple, request_fingerprint: str) -> Result:
+    stored_fingerprint, status_code, body = stored
+    if stored_fingerprint != request_fingerprint:
+        raise KeyReused()
+    return Result(body, status_code, replayed=True)
+
+
+def execute(user_id: int, key: str, request_fingerprint: str, operation: Callable[[], tuple[dict, int]]) -> Result:
+    """Run `operation` (returning a response body and status) once per key, replaying its stored result after.
+
+    The key is reserved, the operation applied and its result stored in one database transaction, so the
+    operation is never applied twice and its result is never lost. Replays read the cache, or on a miss only the
+    key's row.
+    """
+    cached = _cache().get(cache_key(user_id, key))
+    if cached is not None:
+        return _replay(cached, request_fingerprint)
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                RESERVE_SQL.format(table=IdempotencyKey._meta.db_table),
+                {'user_id': user_id, 'key': key, 'fingerprint': request_fingerprint, 'now': timezone.now()},
+            )
+            reserved = cursor.fetchone() is not None
+        if not reserved:
+            stored = (
+                IdempotencyKey.objects
+                .values_list('fingerprint', 'status_code', 'response')
+                .get(user_id=user_id, key=key)
+            )
+            _remember(user_id, key, stored)
+            return _replay(stored, request_fingerprint)
+
+        body, status_code = operation()
+        # Stored as the client received it, so a replay is byte-for-byte the same response.
+        body = json.loads(json.dumps(body, cls=JSONEncoder))
+        IdempotencyKey.objects.filter(user_id=user_id, key=key).update(
+            status_code=status_code, response=body, updated_at=timezone.now()
+        )
+        stored = (request_fingerprint, status_code, body)
+        transaction.on_commit(lambda: _remember(user_id, key, stored))
+    return Result(body, status_code)
+
+
+def run(user_id: int, key: str | None, path: str, data, operation: Callable[[], tuple[dict, int]]) -> Result:
+    """Handle a request that may carry an Idempotency-Key header; without one, `operation` simply runs."""
+    if key is None:
+        return Result(*operation())
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return Result(
+            {'error': f'{HEADER} must be between 1 and {MAX_KEY_LENGTH} characters'}, status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        return execute(user_id, key, fingerprint(path, data), operation)
+    except KeyReused:
+        return Result(
+            {'error': f'{HEADER} was already used for a different request'}, status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+
+
+# Reserving the key and applying the operation share one database transaction, which Django only runs
+# synchronously; the async views hand the whole thing to a thread.
+arun = sync_to_async(run)
+
+
+def purge(older_than) -> int:
+    """Delete the keys created before `older_than`; retries with them are applied again. Returns the count."""
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=older_than).delete()
+    return deleted
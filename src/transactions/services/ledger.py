@@ -0,0 +1,402 @@
+import random
+
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.db import connection, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from transactions.models.account import Account
+from transactions.models.account_balance_shard import AccountBalanceShard
+from transactions.models.transaction import Transaction
+from transactions.services import balance_cache, balance_notifications, rollups, sharding
+
+
+class InsufficientFunds(Exception):
+    pass
+
+
+class SameAccountTransfer(Exception):
+    pass
+
+
+def signed_amount(prefix: str = '') -> Case:
+    """Expression for a Transaction's effect on its account's balance: +amount for deposits, -amount otherwise.
+
+    Pending transactions have not been applied yet and count as 0. `Sum(signed_amount())` over an account's
+    transactions must equal its balance. Pass `prefix` (e.g. 'transactions__') to aggregate across a relation.
+    """
+    return Case(
+        When(**{f'{prefix}status': Transaction.Status.PENDING}, then=Value(Decimal('0.00'))),
+        When(**{f'{prefix}transaction_type': Transaction.TransactionType.DEPOSIT}, then=F(f'{prefix}amount')),
+        default=-F(f'{prefix}amount'),
+    )
+
+
+# Applies the balance change, records the Transaction row and adds it to the account's daily rollup in a single
+# statement, so the database serializes concurrent writers on the account row instead of Python doing a
+# read-modify-write.
+# The optional guard turns a withdrawal into a conditional UPDATE that touches no rows when funds are short.
+# With balance notifications on, the final SELECT also sends the NOTIFY (see balance_notifications.notify_column).
+APPLY_BALANCE_CHANGE_SQL = """
+    WITH updated AS (
+        UPDATE {account_table}
+        SET balance = balance + %(delta)s, updated_at = %(now)s
+        WHERE user_id = %(user_id)s {guard}
+        RETURNING id, balance
+    ), inserted AS (
+        INSERT INTO {transaction_table} (created_at, updated_at, account_id, transaction_type, amount)
+        SELECT %(now)s, %(now)s, id, %(transaction_type)s, %(amount)s FROM updated
+    ), rolled_up AS (
+        {rollup_upsert}
+    )
+    SELECT balance{notify} FROM updated
+"""
+
+SUFFICIENT_FUNDS_GUARD = "AND balance >= %(amount)s"
+
+
+def _apply_balance_change(user_id: int, transaction_type: str, amount: Decimal, guard: str = "") -> Decimal | None:
+    is_deposit = transaction_type == Transaction.TransactionType.DEPOSIT
+    sql = APPLY_BALANCE_CHANGE_SQL.format(
+        account_table=Account._meta.db_table,
+        transaction_table=Transaction._meta.db_table,
+        guard=guard,
+        notify=balance_notifications.notify_column(),
+        rollup_upsert=rollups.upsert_sql(
+            "SELECT id, %(day)s::date, 0, %(deposit_sum)s::numeric, %(withdraw_sum)s::numeric, 1 FROM updated"
+        ),
+    )
+    now = timezone.now()
+    params = {
+        'user_id': user_id,
+        'delta': amount if is_deposit else -amount,
+        'amount': amount,
+        'transaction_type': transaction_type,
+        'now': now,
+        'day': rollups.day_of(now),
+        'deposit_sum': amount if is_deposit else 0,
+        'withdraw_sum': 0 if is_deposit else amount,
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+# Deposits to a sharded account (shard_count > 0) update one of its shards instead of the account row, so
+# concurrent deposits to a hot account lock different rows. `pick` in [0, 1) chooses the shard; it is drawn in
+# Python because random() in the WHERE clause would be evaluated once per candidate row. The balance returned for
+# a sharded account adds the other shards as of the statement's snapshot, so under concurrency it is approximate.
+DEPOSIT_SQL = """
+    WITH target AS (
+        SELECT id, balance, shard_count FROM {account_table} WHERE user_id = %(user_id)s
+    ), updated_account AS (
+        UPDATE {account_table}
+        SET balance = balance + %(amount)s, updated_at = %(now)s
+        WHERE user_id = %(user_id)s AND shard_count = 0
+        RETURNING id, balance
+    ), updated_shard AS (
+        UPDATE {shard_table} AS shard
+        SET balance = shard.balance + %(amount)s, updated_at = %(now)s
+        FROM target
+        WHERE shard.account_id = target.id AND target.shard_count > 0
+            AND shard.index = floor(%(pick)s * target.shard_count)
+        RETURNING target.id, target.balance + shard.balance + (
+            SELECT coalesce(sum(other.balance), 0) FROM {shard_table} AS other
+            WHERE other.account_id = target.id AND other.id <> shard.id
+        ) AS balance, shard.index + 1 AS slot
+    ), applied AS (
+        SELECT id, balance, 0 AS slot FROM updated_account
+        UNION ALL
+        SELECT id, balance, slot FROM updated_shard
+    ), inserted AS (
+        INSERT INTO {transaction_table} (created_at, updated_at, account_id, transaction_type, amount)
+        SELECT %(now)s, %(now)s, id, %(transaction_type)s, %(amount)s FROM applied
+    ), rolled_up AS (
+        {rollup_upsert}
+    )
+    SELECT balance{notify} FROM applied
+"""
+
+# Lets the single-statement withdrawal skip sharded accounts, whose funds are not all in the account row.
+UNSHARDED_GUARD = "AND shard_count = 0"
+
+
+def deposit(user_id: int, amount: Decimal) -> Decimal:
+    """Add `amount` to the user's account, or to one of its shards if it is sharded, and return the new balance."""
+    sql = DEPOSIT_SQL.format(
+        account_table=Account._meta.db_table,
+        shard_table=AccountBalanceShard._meta.db_table,
+        transaction_table=Transaction._meta.db_table,
+        notify=balance_notifications.notify_column(),
+        rollup_upsert=rollups.upsert_sql("SELECT id, %(day)s::date, slot, %(amount)s::numeric, 0, 1 FROM applied"),
+    )
+    now = timezone.now()
+    params = {
+        'user_id': user_id,
+        'amount': amount,
+        'pick': random.random(),
+        'transaction_type': Transaction.TransactionType.DEPOSIT,
+        'now': now,
+        'day': rollups.day_of(now),
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    if row is None:
+        return _deposit_to_account_row(user_id, amount)
+    balance_cache.invalidate(user_id)
+    return row[0]
+
+
+def _deposit_to_account_row(user_id: int, amount: Decimal) -> Decimal:
+    # DEPOSIT_SQL matches no row when the account does not exist, but also when set_shard_count commits between
+    # the statement's snapshot and its lock on the account row: the snapshot's shard_count picks one branch and
+    # the committed one the other. The account row accepts deposits whatever the shard count is.
+    with transaction.atomic():
+        if _apply_balance_change(user_id, Transaction.TransactionType.DEPOSIT, amount) is None:
+            raise Account.DoesNotExist(f"User {user_id} has no account.")
+        new_balance = Account.objects.filter(user_id=user_id).values_list(sharding.total_balance(), flat=True).get()
+    balance_cache.invalidate(user_id)
+    return new_balance
+
+
+def withdraw(user_id: int, amount: Decimal) -> Decimal:
+    """Subtract `amount` from the user's account and return the new balance.
+
+    Raises InsufficientFunds, without writing anything, when the balance is lower than `amount`. Unsharded accounts
+    take a single conditional statement; sharded ones, or a failed attempt, fall back to `_withdraw_locked`.
+    """
+    new_balance = _apply_balance_change(
+        user_id, Transaction.TransactionType.WITHDRAW, amount, guard=f"{SUFFICIENT_FUNDS_GUARD} {UNSHARDED_GUARD}"
+    )
+    if new_balance is None:
+        return _withdraw_locked(user_id, amount)
+    balance_cache.invalidate(user_id)
+    return new_balance
+
+
+def _withdraw_locked(user_id: int, amount: Decimal) -> Decimal:
+    # While the account row is locked nothing can fold its shards, so their unlocked sum can only grow and is
+    # safe to check funds against. The shards are only folded (and locked) when the row alone cannot cover
+    # the withdrawal.
+    with transaction.atomic():
+        account = Account.objects.select_for_update(no_key=True).only('id', 'balance').filter(user_id=user_id).first()
+        if account is None:
+            raise Account.DoesNotExist(f"User {user_id} has no account.")
+        in_shards = sharding.shard_total(account.id)
+        if account.balance + in_shards < amount:
+            raise InsufficientFunds(f"Insufficient funds to withdraw {amount}.")
+        if account.balance < amount:
+            in_shards -= sharding.fold(account)
+
+        new_balance = _apply_balance_change(user_id, Transaction.TransactionType.WITHDRAW, amount)
+    balance_cache.invalidate(user_id)
+    return new_balance + in_shards
+
+
+# The balance change is a single statement, so the async API only needs to move it off the event loop;
+# this is the same thread hand-off Django's own async ORM methods (aget, aupdate, acreate) perform.
+adeposit = sync_to_async(deposit)
+awithdraw = sync_to_async(withdraw)
+
+
+# Records a deposit without applying it: the account row is only read, so this does not wait on its lock.
+ENQUEUE_DEPOSIT_SQL = """
+    INSERT INTO {transaction_table} (created_at, updated_at, account_id, transaction_type, amount, status)
+    SELECT %(now)s, %(now)s, id, %(transaction_type)s, %(amount)s, %(status)s
+    FROM {account_table} WHERE user_id = %(user_id)s
+    RETURNING id
+"""
+
+
+def enqueue_deposit(user_id: int, amount: Decimal) -> int:
+    """Record a pending deposit of `amount` to the user's account and return its Transaction id.
+
+    The balance is unchanged until `apply_pending_deposits` picks the deposit up.
+    """
+    sql = ENQUEUE_DEPOSIT_SQL.format(
+        account_table=Account._meta.db_table,
+        transaction_table=Transaction._meta.db_table,
+    )
+    params = {
+        'user_id': user_id,
+        'amount': amount,
+        'transaction_type': Transaction.TransactionType.DEPOSIT,
+        'status': Transaction.Status.PENDING,
+        'now': timezone.now(),
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+    if row is None:
+        raise Account.DoesNotExist(f"User {user_id} has no account.")
+    return row[0]
+
+
+aenqueue_deposit = sync_to_async(enqueue_deposit)
+
+
+class PendingBatch:
+    def __init__(self, transactions: int, accounts: int):
+        self.transactions = transactions
+        self.accounts = accounts
+
+
+def apply_pending_deposits(batch_size: int) -> PendingBatch:
+    """Apply up to `batch_size` pending deposits, oldest first, in one database transaction.
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED, so concurrent workers take disjoint batches. Claimed deposits
+    are summed per account and each account gets a single UPDATE; accounts are locked in primary-key order, like
+    transfers, so workers and transfers cannot deadlock.
+    """
+    with transaction.atomic():
+        claimed = list(
+            Transaction.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=Transaction.Status.PENDING)
+            .order_by('id')
+            .values_list('id', 'account_id', 'amount', 'created_at')[:batch_size]
+        )
+        if not claimed:
+            return PendingBatch(transactions=0, accounts=0)
+
+        totals = {}
+        for _, account_id, amount, _ in claimed:
+            totals[account_id] = totals.get(account_id, Decimal('0.00')) + amount
+
+        now = timezone.now()
+        Transaction.objects.filter(pk__in=[pk for pk, _, _, _ in claimed]).update(
+            status=Transaction.Status.APPLIED, updated_at=now
+        )
+        accounts = list(
+            Account.objects
+            .select_for_update(no_key=True)
+            .filter(pk__in=totals)
+            .order_by('pk')
+            .values_list('id', 'user_id')
+        )
+        for account_id, user_id in accounts:
+            Account.objects.filter(pk=account_id).update(balance=F('balance') + totals[account_id], updated_at=now)
+            balance_cache.invalidate(user_id)
+        balance_notifications.notify(user_id for _, user_id in accounts)
+        # Deposits count on the day they were made, like in rollups.rebuild_day.
+        rollups.add(
+            (account_id, created_at, Transaction.TransactionType.DEPOSIT, amount)
+            for _, account_id, amount, created_at in claimed
+        )
+
+    return PendingBatch(transactions=len(claimed), accounts=len(accounts))
+
+
+def transfer(from_user_id: int, to_username: str, amount: Decimal) -> Decimal:
+    """Move `amount` from the user's account to `to_username`'s account and return the sender's new balance.
+
+    Both account rows are locked in one statement, in ascending primary-key order, so two transfers between the
+    same accounts in opposite directions wait for each other instead of deadlocking. The locks are FOR NO KEY
+    UPDATE, which does not block the foreign-key checks of concurrent Transaction inserts. Both balances change in
+    one UPDATE and both Transaction rows are written with one bulk INSERT; a sharded sender's shards are folded
+    first if its own row cannot cover the amount. Raises Account.DoesNotExist, SameAccountTransfer or
+    InsufficientFunds without writing anything.
+    """
+    recipient_id = Account.objects.filter(user__username=to_username).values_list('id', flat=True).first()
+    if recipient_id is None:
+        raise Account.DoesNotExist(f"User '{to_username}' has no account.")
+
+    with transaction.atomic():
+        accounts = list(
+            Account.objects
+            .select_for_update(no_key=True)
+            .filter(Q(user_id=from_user_id) | Q(pk=recipient_id))
+            .order_by('pk')
+            .only('id', 'user_id', 'balance')
+        )
+        sender = next((account for account in accounts if account.user_id == from_user_id), None)
+        if sender is None:
+            raise Account.DoesNotExist(f"User {from_user_id} has no account.")
+        if sender.id == recipient_id:
+            raise SameAccountTransfer("Cannot transfer to the same account.")
+        in_shards = sharding.shard_total(sender.id)
+        if sender.balance + in_shards < amount:
+            raise InsufficientFunds(f"Insufficient funds to transfer {amount}.")
+        if sender.balance < amount:
+            in_shards -= sharding.fold(sender)
+
+        Account.objects.filter(pk__in=[sender.id, recipient_id]).update(
+            balance=F('balance') + Case(When(pk=sender.id, then=Value(-amount)), default=Value(amount)),
+            updated_at=timezone.now()
+        )
+        created = Transaction.objects.bulk_create([
+            Transaction(account_id=sender.id, transaction_type=Transaction.TransactionType.WITHDRAW, amount=amount),
+            Transaction(account_id=recipient_id, transaction_type=Transaction.TransactionType.DEPOSIT, amount=amount),
+        ])
+        rollups.add((row.account_id, row.created_at, row.transaction_type, row.amount) for row in created)
+        for account in accounts:
+            balance_cache.invalidate(account.user_id)
+        balance_notifications.notify(account.user_id for account in accounts)
+
+    return sender.balance + in_shards - amount
+
+
+class BatchResult:
+    def __init__(self, accepted: bool, balance: Decimal, results: list[dict]):
+        self.accepted = accepted
+        self.balance = balance
+        self.results = results
+
+
+def apply_batch(user_id: int, operations: list[dict], all_or_nothing: bool = True) -> BatchResult:
+    """Apply `operations` ({'type', 'amount'}) in order to the user's account.
+
+    The account row is locked once, the operations are replayed in memory against its balance, and the
+    outcome is written with one UPDATE for the net change plus one bulk INSERT for the Transaction rows.
+    A withdrawal that would overdraw the running balance is rejected; with `all_or_nothing` that rejects
+    the whole batch and nothing is written. The running balance includes a sharded account's shards, which
+    are folded before writing if the account row alone would go negative.
+    """
+    with transaction.atomic():
+        account = Account.objects.select_for_update(no_key=True).only('id', 'balance').get(user_id=user_id)
+        in_shards = sharding.shard_total(account.id)
+        balance = account.balance + in_shards
+        results = []
+        rows = []
+        rejected = False
+
+        for index, operation in enumerate(operations):
+            transaction_type, amount = operation['type'], operation['amount']
+            result = {'index': index, 'type': transaction_type, 'amount': amount}
+            results.append(result)
+
+            if rejected and all_or_nothing:
+                result['status'] = 'not_applied'
+                continue
+            if transaction_type == Transaction.TransactionType.WITHDRAW and balance < amount:
+                result.update(status='rejected', error='Insufficient funds')
+                rejected = True
+                continue
+
+            balance += amount if transaction_type == Transaction.TransactionType.DEPOSIT else -amount
+            rows.append(Transaction(account_id=account.id, transaction_type=transaction_type, amount=amount))
+            result['status'] = 'applied'
+
+        if rejected and all_or_nothing:
+            for result in results:
+                if result['status'] == 'applied':
+                    result['status'] = 'not_applied'
+            return BatchResult(accepted=False, balance=account.balance + in_shards, results=results)
+
+        if rows:
+            if balance - in_shards < 0:
+                in_shards -= sharding.fold(account)
+            Account.objects.filter(pk=account.id).update(
+                balance=F('balance') + (balance - in_shards - account.balance),
+                updated_at=timezone.now()
+            )
+            Transaction.objects.bulk_create(rows)
+            rollups.add((row.account_id, row.created_at, row.transaction_type, row.amount) for row in rows)
+            balance_cache.invalidate(user_id)
+            balance_notifications.notify([user_id])
+
+    return BatchResult(accepted=True, balance=balance, results=results)
@@ -0,0 +1,143 @@
+from datetime import UTC, date, datetime
+
+from django.db import connection, transaction
+from django.db.backends.utils import truncate_name
+from django.utils import timezone
+
+from transactions.models.ledger_carry_forward import LedgerCarryForward
+from transactions.models.transaction import Transaction
+
+TABLE = Transaction._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+
+
+class Partition:
+    def __init__(self, name: str, lower: datetime | None, upper: datetime | None):
+        self.name = name
+        self.lower = lower
+        self.upper = upper
+
+    @property
+    def is_default(self) -> bool:
+        return self.lower is None and self.upper is None
+
+
+def month_start(day: date, months: int = 0) -> datetime:
+    """Midnight UTC on the first day of the month `months` after the one containing `day`."""
+    index = day.year * 12 + day.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=UTC)
+
+
+def partition_name(start: datetime) -> str:
+    return truncate_name(f'{TABLE}_p{start:%Y%m}', connection.ops.max_name_length())
+
+
+def list_partitions() -> list[Partition]:
+    """Partitions of the transactions table, ordered by lower bound; MINVALUE bounds and the default are None."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT name,
+                   (regexp_match(bound, 'FROM \\(''([^'']+)''\\)'))[1]::timestamptz,
+                   (regexp_match(bound, 'TO \\(''([^'']+)''\\)'))[1]::timestamptz
+            FROM (
+                SELECT child.relname AS name, pg_get_expr(child.relpartbound, child.oid) AS bound
+                FROM pg_inherits
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE pg_inherits.inhparent = %s::regclass
+            ) AS partitions
+            ORDER BY 2 NULLS FIRST, 1
+            """,
+            [TABLE],
+        )
+        return [Partition(name, lower, upper) for name, lower, upper in cursor.fetchall()]
+
+
+def retained_since() -> datetime | None:
+    """Start of the oldest month still attached, or None when no month has been expired (its bound is MINVALUE)."""
+    months = [partition for partition in list_partitions() if not partition.is_default]
+    return months[0].lower if months else None
+
+
+def create_partition(start: datetime, end: datetime) -> str:
+    """Create and attach the partition for [start, end), moving any of its rows out of the default partition.
+
+    The table is built standalone and attached afterwards, so rows that landed in the default partition before
+    their month existed end up in the right place instead of making the attach fail.
+    """
+    name = partition_name(start)
+    qn = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE {qn(name)} (LIKE {qn(TABLE)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM {qn(DEFAULT_PARTITION)} WHERE created_at >= %(start)s AND created_at < %(end)s
+                RETURNING *
+            )
+            INSERT INTO {qn(name)} SELECT * FROM moved
+            """,
+            {'start': start, 'end': end},
+        )
+        # DDL takes no bind parameters (see DB_SERVER_SIDE_BINDING), so the bounds are inlined as literals.
+        cursor.execute(connection.ops.compose_sql(
+            f'ALTER TABLE {qn(TABLE)} ATTACH PARTITION {qn(name)} FOR VALUES FROM (%s) TO (%s)', [start, end]
+        ))
+    return name
+
+
+def ensure_partitions(today: date, months_ahead: int) -> list[str]:
+    """Create the monthly partitions from `today`'s month through `months_ahead` months later; return new names."""
+    covered = [(partition.lower, partition.upper) for partition in list_partitions() if not partition.is_default]
+    created = []
+    for months in range(months_ahead + 1):
+        start, end = month_start(today, months), month_start(today, months + 1)
+        if any((lower is None or lower < end) and (upper is None or start < upper) for lower, upper in covered):
+            continue
+        created.append(create_partition(start, end))
+    return created
+
+
+# Adds each account's net applied amount in a just-detached partition to its carry-forward row. Pending rows are
+# left out, as they have not touched the balance.
+CARRY_FORWARD_SQL = """
+    INSERT INTO {carry_forward_table} AS carried (account_id, amount, created_at, updated_at)
+    SELECT account_id,
+           sum(CASE WHEN transaction_type = %(deposit)s THEN amount ELSE -amount END),
+           %(now)s, %(now)s
+    FROM {partition} WHERE status <> %(pending)s
+    GROUP BY account_id
+    ON CONFLICT (account_id) DO UPDATE
+    SET amount = carried.amount + excluded.amount, updated_at = excluded.updated_at
+"""
+
+
+def expire_partitions(today: date, retain_months: int, drop: bool = False) -> list[str]:
+    """Detach (and with `drop`, drop) partitions entirely older than `retain_months` before `today`'s month.
+
+    Detached partitions stay in the database as plain tables, e.g. to be archived. Their rows no longer count
+    towards any account's transactions, so in the same database transaction their per-account totals are added to
+    LedgerCarryForward, which reconciliation counts instead.
+    """
+    cutoff = month_start(today, -retain_months)
+    qn = connection.ops.quote_name
+    expired = []
+    for partition in list_partitions():
+        if partition.is_default or partition.upper is None or partition.upper > cutoff:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE {qn(TABLE)} DETACH PARTITION {qn(partition.name)}')
+            cursor.execute(
+                CARRY_FORWARD_SQL.format(
+                    carry_forward_table=qn(LedgerCarryForward._meta.db_table), partition=qn(partition.name)
+                ),
+                {
+                    'deposit': Transaction.TransactionType.DEPOSIT,
+                    'pending': Transaction.Status.PENDING,
+                    'now': timezone.now(),
+                },
+            )
+            if drop:
+                cursor.execute(f'DROP TABLE {qn(partition.name)}')
+        expired.append(partition.name)
+    return expired
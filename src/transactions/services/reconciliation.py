@@ -0,0 +1,91 @@
+from collections.abc import Iterator
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import DecimalField, F, OuterRef, QuerySet, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from transactions.models.account import Account
+from transactions.models.ledger_carry_forward import LedgerCarryForward
+from transactions.models.transaction import Transaction
+from transactions.services import balance_cache, balance_notifications, sharding
+from transactions.services.ledger import signed_amount
+
+
+class Drift:
+    def __init__(self, account_id: int, user_id: int, balance: Decimal, ledger: Decimal):
+        self.account_id = account_id
+        self.user_id = user_id
+        self.balance = balance
+        self.ledger = ledger
+
+    def as_dict(self) -> dict:
+        return {
+            'account_id': self.account_id,
+            'balance': str(self.balance),
+            'ledger': str(self.ledger),
+            'difference': str(self.balance - self.ledger),
+        }
+
+
+def _ledger_sum(prefix: str = '') -> Coalesce:
+    return Coalesce(
+        Sum(signed_amount(prefix)),
+        Value(Decimal('0.00')),
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+    )
+
+
+def _carried_forward(account_id: int) -> Decimal:
+    amount = LedgerCarryForward.objects.filter(account_id=account_id).values_list('amount', flat=True).first()
+    return amount or Decimal('0.00')
+
+
+def with_ledger(accounts: QuerySet) -> QuerySet:
+    """Annotate accounts with `total`, their balance including shards, and `ledger`, what it should be.
+
+    The ledger is the signed sum of the account's transactions plus what was carried forward from expired partitions.
+    """
+    carried = Subquery(
+        LedgerCarryForward.objects.filter(account_id=OuterRef('pk')).values('amount'),
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+    )
+    return accounts.annotate(
+        total=sharding.total_balance(),
+        ledger=_ledger_sum('transactions__') + Coalesce(carried, Value(Decimal('0.00'))),
+    )
+
+
+def find_drift(first_id: int, last_id: int, chunk_size: int = 2000) -> Iterator[Drift]:
+    """Yield accounts with first_id <= id < last_id whose balance differs from their ledger (see with_ledger).
+
+    The comparison is one grouped aggregate evaluated by Postgres; only drifted accounts are streamed back.
+    """
+    accounts = (
+        with_ledger(Account.objects.filter(id__gte=first_id, id__lt=last_id))
+        .exclude(total=F('ledger'))
+        .values_list('id', 'user_id', 'total', 'ledger')
+        .order_by('id')
+    )
+    for account_id, user_id, balance, ledger in accounts.iterator(chunk_size=chunk_size):
+        yield Drift(account_id, user_id, balance, ledger)
+
+
+def repair_drift(account_id: int) -> Drift | None:
+    """Set the account's balance to the sum of its transactions and carry-forward; return the drift fixed, if any.
+
+    The account row is locked and its shards folded into it first, so no deposit or withdrawal can land between
+    the sum and the update.
+    """
+    with transaction.atomic():
+        account = Account.objects.select_for_update(no_key=True).only('id', 'user_id', 'balance').get(pk=account_id)
+        sharding.fold(account)
+        ledger = Transaction.objects.filter(account_id=account_id).aggregate(ledger=_ledger_sum())['ledger']
+        ledger += _carried_forward(account_id)
+        if account.balance == ledger:
+            return None
+        Account.objects.filter(pk=account_id).update(balance=ledger, updated_at=timezone.now())
+        balance_cache.invalidate(account.user_id)
+        balance_notifications.notify([account.user_id])
+    return Drift(account.id, account.user_id, account.balance, ledger)
@@ -0,0 +1,170 @@
+from collections.abc import Iterable
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth
+
+from transactions.models.account_daily_rollup import AccountDailyRollup
+from transactions.models.transaction import Transaction
+from transactions.services import partitions
+
+TABLE = AccountDailyRollup._meta.db_table
+
+
+class ExpiredDay(Exception):
+    pass
+
+# Adds to a rollup row, creating it if needed. `{rows}` is a SELECT or VALUES producing
+# (account_id, day, slot, deposit_sum, withdraw_sum, count); the ledger embeds this in its single-statement writes.
+UPSERT_SQL = """
+    INSERT INTO {table} AS rollup (account_id, day, slot, deposit_sum, withdraw_sum, count)
+    {rows}
+    ON CONFLICT (account_id, day, slot) DO UPDATE SET
+        deposit_sum = rollup.deposit_sum + EXCLUDED.deposit_sum,
+        withdraw_sum = rollup.withdraw_sum + EXCLUDED.withdraw_sum,
+        count = rollup.count + EXCLUDED.count
+"""
+
+# Recomputes rollups from the applied transactions matching `{where}`, all in slot 0.
+REBUILD_SQL = """
+    INSERT INTO {rollup_table} (account_id, day, slot, deposit_sum, withdraw_sum, count)
+    SELECT account_id, (created_at AT TIME ZONE 'UTC')::date, 0,
+           coalesce(sum(amount) FILTER (WHERE transaction_type = %(deposit)s), 0),
+           coalesce(sum(amount) FILTER (WHERE transaction_type <> %(deposit)s), 0),
+           count(*)
+    FROM {transaction_table}
+    WHERE status = %(applied)s AND {where}
+    GROUP BY 1, 2
+"""
+
+# Corrects one day's rollups by what they differ from the applied transactions. Both sides are read from the
+# statement's snapshot and the difference is added to the rows, locked in key order like the ledger's upserts, so
+# increments that writers commit after the snapshot are kept and no other lock is taken. The day's totals end up
+# in slot 0, as with REBUILD_SQL; the other slots are brought back to zero. A correction can be negative, which
+# the proposed row of an INSERT may not be even when it conflicts, so only missing rows, whose corrections are
+# never negative, take the inserted values; existing ones look their correction up.
+REBUILD_DAY_SQL = """
+    WITH expected AS (
+        SELECT account_id,
+               coalesce(sum(amount) FILTER (WHERE transaction_type = %(deposit)s), 0) AS deposit_sum,
+               coalesce(sum(amount) FILTER (WHERE transaction_type <> %(deposit)s), 0) AS withdraw_sum,
+               count(*) AS count
+        FROM {transaction_table}
+        WHERE status = %(applied)s AND created_at >= %(start)s AND created_at < %(end)s
+        GROUP BY account_id
+    ), recorded AS (
+        SELECT account_id, deposit_sum, withdraw_sum, count FROM {table} WHERE day = %(day)s AND slot = 0
+    ), corrections AS (
+        SELECT account_id, 0 AS slot,
+               coalesce(expected.deposit_sum, 0) - coalesce(recorded.deposit_sum, 0) AS deposit_sum,
+               coalesce(expected.withdraw_sum, 0) - coalesce(recorded.withdraw_sum, 0) AS withdraw_sum,
+               coalesce(expected.count, 0) - coalesce(recorded.count, 0) AS count
+        FROM expected FULL JOIN recorded USING (account_id)
+        UNION ALL
+        SELECT account_id, slot, -deposit_sum, -withdraw_sum, -count FROM {table} WHERE day = %(day)s AND slot > 0
+    )
+    INSERT INTO {table} AS rollup (account_id, day, slot, deposit_sum, withdraw_sum, count)
+    SELECT account_id, %(day)s::date, slot, greatest(deposit_sum, 0), greatest(withdraw_sum, 0), greatest(count, 0)
+    FROM corrections
+    WHERE deposit_sum <> 0 OR withdraw_sum <> 0 OR count <> 0
+    ORDER BY account_id, slot
+    ON CONFLICT (account_id, day, slot) DO UPDATE SET (deposit_sum, withdraw_sum, count) = (
+        SELECT rollup.deposit_sum + correction.deposit_sum,
+               rollup.withdraw_sum + correction.withdraw_sum,
+               rollup.count + correction.count
+        FROM corrections AS correction
+        WHERE correction.account_id = rollup.account_id AND correction.slot = rollup.slot
+    )
+"""
+
+
+def upsert_sql(rows: str) -> str:
+    return UPSERT_SQL.format(table=TABLE, rows=rows)
+
+
+def day_of(moment: datetime) -> date:
+    """The rollup day of a transaction created at `moment`."""
+    return moment.astimezone(UTC).date()
+
+
+def add(transactions: Iterable[tuple[int, datetime, str, Decimal]]):
+    """Add (account_id, created_at, transaction_type, amount) transactions to their slot-0 rollups.
+
+    Must run in the transaction that applies them. Rows are aggregated first and upserted in key order with one
+    statement, so concurrent writers lock rollup rows in the same order.
+    """
+    totals = {}
+    for account_id, created_at, transaction_type, amount in transactions:
+        key = (account_id, day_of(created_at))
+        deposits, withdrawals, count = totals.get(key, (Decimal('0.00'), Decimal('0.00'), 0))
+        if transaction_type == Transaction.TransactionType.DEPOSIT:
+            deposits += amount
+        else:
+            withdrawals += amount
+        totals[key] = (deposits, withdrawals, count + 1)
+    if not totals:
+        return
+
+    rows = sorted((account_id, day, 0, *sums) for (account_id, day), sums in totals.items())
+    values = ', '.join(['(%s, %s::date, %s, %s::numeric, %s::numeric, %s)'] * len(rows))
+    with connection.cursor() as cursor:
+        cursor.execute(upsert_sql(f'VALUES {values}'), [value for row in rows for value in row])
+
+
+def _rebuild(where: str, params: dict):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            REBUILD_SQL.format(rollup_table=TABLE, transaction_table=Transaction._meta.db_table, where=where),
+            {'deposit': Transaction.TransactionType.DEPOSIT, 'applied': Transaction.Status.APPLIED, **params},
+        )
+
+
+def first_rebuildable_day() -> date | None:
+    """The oldest day whose transactions are all still attached, or None when no month has been expired."""
+    retained_since = partitions.retained_since()
+    return day_of(retained_since) if retained_since else None
+
+
+def rebuild_day(day: date) -> int:
+    """Bring every account's rollups for `day` in line with its transactions; return the number of rows corrected.
+
+    Safe to run while the ledger is writing: see REBUILD_DAY_SQL. Raises ExpiredDay for a day in an expired
+    partition, whose transactions are gone but whose rollups still hold its statement history.
+    """
+    first_day = first_rebuildable_day()
+    if first_day is not None and day < first_day:
+        raise ExpiredDay(f"{day} is in an expired partition; its rollups are all that is left of it.")
+    start = datetime(day.year, day.month, day.day, tzinfo=UTC)
+    sql = REBUILD_DAY_SQL.format(table=TABLE, transaction_table=Transaction._meta.db_table)
+    params = {
+        'deposit': Transaction.TransactionType.DEPOSIT,
+        'applied': Transaction.Status.APPLIED,
+        'day': day,
+        'start': start,
+        'end': start + timedelta(1),
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def rebuild_accounts(account_ids: list[int]):
+    """Build the rollups of accounts that have none yet, e.g. accounts whose history was just bulk-loaded."""
+    _rebuild('account_id = ANY(%(account_ids)s)', {'account_ids': account_ids})
+
+
+def summary(user_id: int, start: date, end: date, period: str) -> list[dict]:
+    """Totals of the user's applied transactions per day or month (`period`) in [start, end), oldest first."""
+    rollups = AccountDailyRollup.objects.filter(account__user_id=user_id, day__gte=start, day__lt=end)
+    if period == 'month':
+        rollups = rollups.annotate(period_start=TruncMonth('day'))
+    else:
+        rollups = rollups.annotate(period_start=F('day'))
+    return list(
+        rollups
+        .values('period_start')
+        .annotate(deposits=Sum('deposit_sum'), withdrawals=Sum('withdraw_sum'), transactions=Sum('count'))
+        .order_by('period_start')
+    )
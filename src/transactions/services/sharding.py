@@ -0,0 +1,80 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from transactions.models.account import Account
+from transactions.models.account_balance_shard import AccountBalanceShard
+
+
+def total_balance() -> Coalesce:
+    """Expression for an Account's balance: its own row plus whatever is still held in its shards.
+
+    Shards are always included, even when shard_count is 0, so money deposited into a shard while sharding was
+    being turned off is never hidden.
+    """
+    shard_sum = (
+        AccountBalanceShard.objects
+        .filter(account_id=OuterRef('pk'))
+        .values('account_id')
+        .annotate(total=Sum('balance'))
+        .values('total')
+    )
+    return F('balance') + Coalesce(
+        Subquery(shard_sum),
+        Value(Decimal('0.00')),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+def shard_total(account_id: int) -> Decimal:
+    """Sum of the account's shard balances, read without locking them."""
+    total = AccountBalanceShard.objects.filter(account_id=account_id).aggregate(total=Sum('balance'))['total']
+    return total or Decimal('0.00')
+
+
+def fold(account: Account) -> Decimal:
+    """Move the account's shard balances into its own row; return the amount moved.
+
+    Must run in a transaction that already holds the account row lock. The shards are locked in index order,
+    which briefly blocks deposits to them.
+    """
+    shards = list(
+        AccountBalanceShard.objects
+        .select_for_update()
+        .filter(account_id=account.id)
+        .exclude(balance=0)
+        .order_by('index')
+        .only('id', 'balance')
+    )
+    folded = sum((shard.balance for shard in shards), Decimal('0.00'))
+    if shards:
+        now = timezone.now()
+        AccountBalanceShard.objects.filter(pk__in=[shard.pk for shard in shards]).update(balance=0, updated_at=now)
+        Account.objects.filter(pk=account.id).update(balance=F('balance') + folded, updated_at=now)
+        account.balance += folded
+    return folded
+
+
+def fold_account(account_id: int) -> Decimal:
+    with transaction.atomic():
+        account = Account.objects.select_for_update(no_key=True).only('id', 'balance').get(pk=account_id)
+        return fold(account)
+
+
+def set_shard_count(account_id: int, shard_count: int) -> Decimal:
+    """Spread the account's future deposits over `shard_count` shards, or stop sharding it with 0.
+
+    Turning sharding off folds the shards back; rows are kept, since a deposit that started before the change
+    may still land in one of them until the next fold. Returns the amount folded.
+    """
+    with transaction.atomic():
+        account = Account.objects.select_for_update(no_key=True).only('id', 'balance').get(pk=account_id)
+        AccountBalanceShard.objects.bulk_create(
+            [AccountBalanceShard(account_id=account.id, index=index) for index in range(shard_count)],
+            ignore_conflicts=True,
+        )
+        Account.objects.filter(pk=account.id).update(shard_count=shard_count, updated_at=timezone.now())
+        return fold(account) if shard_count == 0 else Decimal('0.00')
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from transactions.models.account import Account
+from transactions.services import balance_cache, balance_notifications
+
+
+# The ledger invalidates the balance cache and notifies balance streams itself; this covers saves made through the
+# ORM (admin, shell, fixtures).
+@receiver(post_save, sender=Account)
+def invalidate_cached_balance(sender, instance: Account, **kwargs):
+    balance_cache.invalidate(instance.user_id)
+    balance_notifications.notify([instance.user_id])
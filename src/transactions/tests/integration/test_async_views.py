@@ -0,0 +1,110 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from transactions.models.account import Account
+from transactions.models.transaction import Transaction
+
+
+@override_settings(ROOT_URLCONF='transactions.async_urls')
+class AsyncViewsTest(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user(username="user1", password="testpass")
+        self.token = Token.objects.create(user=self.user)
+        self.account = Account.objects.create(user=self.user, balance=100)
+
+    async def _post(self, url_name, payload, **extra):
+        return await self.async_client.post(
+            reverse(url_name),
+            data=payload,
+            content_type="application/json",
+            headers={"Authorization": f"Token {self.token.key}"},
+            **extra
+        )
+
+    async def test_authenticated_user_can_view_balance(self):
+        response = await self.async_client.get(
+            reverse("balance"),
+            headers={"Authorization": f"Token {self.token.key}"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'balance': '100.00'})
+
+    async def test_etag_matches_the_drf_view(self):
+        headers = {"Authorization": f"Token {self.token.key}"}
+        with self.settings(ROOT_URLCONF='config.urls'):
+            etag = (await self.async_client.get(reverse("balance"), headers=headers))["ETag"]
+
+        response = await self.async_client.get(reverse("balance"), headers={**headers, "If-None-Match": etag})
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_authenticated_user_can_deposit(self):
+        response = await self._post("deposit", {"amount": "50.00"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'message': 'Deposit successful', 'new_balance': 150.0})
+        await self.account.arefresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("150.00"))
+        transaction = await Transaction.objects.aget()
+        self.assertEqual(transaction.transaction_type, Transaction.TransactionType.DEPOSIT)
+
+    @override_settings(DEPOSIT_WRITE_BEHIND=True)
+    async def test_write_behind_deposit_is_accepted_as_pending(self):
+        response = await self._post("deposit", {"amount": "50.00"})
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        transaction = await Transaction.objects.aget()
+        self.assertEqual(
+            response.json(),
+            {'message': 'Deposit accepted', 'transaction_id': transaction.id, 'status': 'pending'}
+        )
+        self.assertEqual(transaction.status, Transaction.Status.PENDING)
+        await self.account.arefresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("100.00"))
+
+    async def test_authenticated_user_can_withdraw(self):
+        response = await self._post("withdraw", {"amount": "40.00"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        await self.account.arefresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("60.00"))
+
+    async def test_withdraw_more_than_balance_returns_400(self):
+        response = await self._post("withdraw", {"amount": "150.00"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {'error': 'Insufficient funds'})
+        self.assertEqual(await Transaction.objects.acount(), 0)
+
+    async def test_validation_errors_match_drf_views(self):
+        for payload in ({"amount": "0"}, {"amount": "nan"}, {}):
+            async_response = await self._post("withdraw", payload)
+            with override_settings(ROOT_URLCONF='config.urls'):
+                sync_response = await self._post("withdraw", payload)
+
+            self.assertEqual(async_response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(async_response.json(), sync_response.json())
+
+    async def test_malformed_json_returns_400(self):
+        response = await self._post("deposit", "{not json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("detail", response.json())
+
+    async def test_unauthenticated_user_gets_drf_style_401(self):
+        response = await self.async_client.get(reverse("balance"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json(), {'detail': 'Authentication credentials were not provided.'})
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+
+    async def test_invalid_token_is_rejected(self):
+        response = await self.async_client.get(reverse("balance"), headers={"Authorization": "Token invalid"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json(), {'detail': 'Invalid token.'})
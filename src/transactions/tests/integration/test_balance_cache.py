@@ -0,0 +1,105 @@
+import json
+
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from transactions.models.account import Account
+from transactions.services import balance_cache
+
+
+@override_settings(BALANCE_CACHE_ENABLED=True, BALANCE_CACHE_ALIAS='default')
+class BalanceCacheTest(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user(username="user1", password="testpass")
+        self.token = Token.objects.create(user=self.user)
+        self.account = Account.objects.create(user=self.user, balance=100)
+
+    def _get_balance(self):
+        response = self.client.get(reverse("balance"), HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()["balance"]
+
+    def _post(self, url_name, payload):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse(url_name),
+                data=json.dumps(payload),
+                content_type="application/json",
+                HTTP_AUTHORIZATION=f"Token {self.token.key}"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_repeated_reads_are_served_from_cache(self):
+        before = balance_cache.stats.snapshot()
+
+        with self.assertNumQueries(2):  # token lookup + balance
+            self.assertEqual(self._get_balance(), "100.00")
+        with self.assertNumQueries(0):  # token and balance both cached
+            self.assertEqual(self._get_balance(), "100.00")
+
+        after = balance_cache.stats.snapshot()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+
+    def test_unchanged_cached_balance_returns_304_without_queries(self):
+        etag = self.client.get(reverse("balance"), HTTP_AUTHORIZATION=f"Token {self.token.key}")["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse("balance"), HTTP_AUTHORIZATION=f"Token {self.token.key}", HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self._post("deposit", {"amount": "25.00"})
+        response = self.client.get(
+            reverse("balance"), HTTP_AUTHORIZATION=f"Token {self.token.key}", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deposit_invalidates_cached_balance(self):
+        self._get_balance()
+        self._post("deposit", {"amount": "25.00"})
+        self.assertEqual(self._get_balance(), "125.00")
+
+    def test_withdraw_invalidates_cached_balance(self):
+        self._get_balance()
+        self._post("withdraw", {"amount": "25.00"})
+        self.assertEqual(self._get_balance(), "75.00")
+
+    def test_batch_invalidates_cached_balance(self):
+        self._get_balance()
+        self._post("transaction-batch", {"operations": [{"type": "deposit", "amount": "1.00"}]})
+        self.assertEqual(self._get_balance(), "101.00")
+
+    def test_saving_account_invalidates_cached_balance(self):
+        self._get_balance()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.account.balance = 7
+            self.account.save()
+        self.assertEqual(self._get_balance(), "7.00")
+
+    def test_balance_read_before_a_write_commits_is_not_cached(self):
+        def load_then_write(using):
+            balance = Decimal("100.00")
+            # The write commits while the reader is between its database read and storing the result.
+            with self.captureOnCommitCallbacks(execute=True):
+                balance_cache.invalidate(self.user.id)
+            return balance
+
+        self.assertEqual(balance_cache.get_balance(self.user.id, load_then_write), Decimal("100.00"))
+
+        self.assertEqual(balance_cache.get_balance(self.user.id, lambda using: Decimal("125.00")), Decimal("125.00"))
+
+    @override_settings(BALANCE_CACHE_ENABLED=False)
+    def test_disabled_cache_always_reads_database(self):
+        with self.assertNumQueries(2):  # token lookup + balance
+            self._get_balance()
+        with self.assertNumQueries(1):  # balance only, the token is still cached
+            self._get_balance()
@@ -0,0 +1,160 @@
+import asyncio
+import json
+
+from contextlib import AsyncExitStack, asynccontextmanager
+from decimal import Decimal
+
+import psycopg
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from transactions.models.account import Account
+from transactions.services import balance_notifications, ledger
+
+
+def balance_of(event: bytes) -> str:
+    name, data = event.decode().strip().split('\n')
+    assert name == 'event: balance'
+    return json.loads(data.removeprefix('data: '))['balance']
+
+
+# Notifications are only delivered once the writing transaction commits, so writes must really commit.
+@override_settings(ROOT_URLCONF='transactions.async_urls', BALANCE_NOTIFICATIONS_ENABLED=True)
+class BalanceStreamTest(TransactionTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user(username="user1", password="testpass")
+        self.token = Token.objects.create(user=self.user)
+        self.account = Account.objects.create(user=self.user, balance=100)
+
+    @asynccontextmanager
+    async def stream(self, token=None):
+        response = await self.async_client.get(
+            reverse("balance-stream"), headers={"Authorization": f"Token {(token or self.token).key}"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = aiter(response.streaming_content)
+        try:
+            yield events
+        finally:
+            await events.aclose()
+
+    async def next_event(self, events) -> bytes:
+        return await asyncio.wait_for(anext(events), timeout=5)
+
+    async def test_stream_sends_the_balance_and_its_changes(self):
+        async with self.stream() as events:
+            self.assertEqual(balance_of(await self.next_event(events)), '100.00')
+
+            await ledger.adeposit(self.user.id, Decimal("50.00"))
+            self.assertEqual(balance_of(await self.next_event(events)), '150.00')
+
+            await ledger.awithdraw(self.user.id, Decimal("30.00"))
+            self.assertEqual(balance_of(await self.next_event(events)), '120.00')
+
+    async def test_transfer_notifies_the_recipient(self):
+        sender = await User.objects.acreate(username="user2")
+        await Account.objects.acreate(user=sender, balance=100)
+        async with self.stream() as events:
+            await self.next_event(events)
+
+            await sync_to_async(ledger.transfer)(sender.id, "user1", Decimal("25.00"))
+
+            self.assertEqual(balance_of(await self.next_event(events)), '125.00')
+
+    @override_settings(BALANCE_STREAM_KEEPALIVE_SECONDS=0.05)
+    async def test_idle_stream_sends_keepalives(self):
+        async with self.stream() as events:
+            await self.next_event(events)
+
+            self.assertEqual(await self.next_event(events), b": keepalive\n\n")
+
+    async def test_streams_share_one_listener(self):
+        async with self.stream() as first, self.stream() as second:
+            await self.next_event(first)
+            await self.next_event(second)
+            listening = balance_notifications.listener._task
+
+            await ledger.adeposit(self.user.id, Decimal("1.00"))
+
+            self.assertEqual(balance_of(await self.next_event(first)), '101.00')
+            self.assertEqual(balance_of(await self.next_event(second)), '101.00')
+            self.assertIs(balance_notifications.listener._task, listening)
+
+    async def test_idle_streams_hold_no_database_connection(self):
+        async with AsyncExitStack() as stack:
+            for _ in range(5):
+                await self.next_event(await stack.enter_async_context(self.stream()))
+
+            # Counted from outside Django: every backend but this one and the shared listener's.
+            async with await psycopg.AsyncConnection.connect(**balance_notifications._connection_params()) as conn:
+                cursor = await conn.execute(
+                    "SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()"
+                    " AND pid <> pg_backend_pid() AND query NOT LIKE 'LISTEN %'"
+                )
+                self.assertEqual((await cursor.fetchone())[0], 0)
+
+    async def test_listener_closes_its_connection_after_the_last_subscriber(self):
+        listener = balance_notifications.Listener()
+        first = listener.subscribe(self.user.id)
+        second = listener.subscribe(self.user.id)
+        listening = listener._task
+        # Subscribers are woken once the listener is connected.
+        await asyncio.wait_for(first.wait(), timeout=5)
+
+        listener.unsubscribe(self.user.id, first)
+        self.assertIs(listener._task, listening)
+        listener.unsubscribe(self.user.id, second)
+
+        self.assertIsNone(listener._task)
+        with self.assertRaises(asyncio.CancelledError):
+            await listening
+
+    async def test_listener_ignores_notifications_that_are_not_user_ids(self):
+        async with self.stream() as events:
+            await self.next_event(events)
+
+            with self.assertLogs('transactions.services.balance_notifications', 'WARNING'):
+                await sync_to_async(self.send_notification)('not-a-user-id')
+                await ledger.adeposit(self.user.id, Decimal("1.00"))
+                self.assertEqual(balance_of(await self.next_event(events)), '101.00')
+
+    @override_settings(BALANCE_STREAM_RECONNECT_SECONDS=0.01)
+    async def test_listener_reconnects_after_an_unexpected_error(self):
+        listener = balance_notifications.Listener()
+        wake = listener._wake
+        calls = []
+
+        def fail_once(user_ids):
+            calls.append(user_ids)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            wake(user_ids)
+
+        listener._wake = fail_once
+        with self.assertLogs('transactions.services.balance_notifications', 'ERROR'):
+            changed = listener.subscribe(self.user.id)
+            await asyncio.wait_for(changed.wait(), timeout=5)
+        listener.unsubscribe(self.user.id, changed)
+
+        self.assertEqual(len(calls), 2)
+
+    def send_notification(self, payload):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [balance_notifications.CHANNEL, payload])
+
+    @override_settings(BALANCE_NOTIFICATIONS_ENABLED=False)
+    async def test_stream_is_not_served_without_notifications(self):
+        response = await self.async_client.get(
+            reverse("balance-stream"), headers={"Authorization": f"Token {self.token.key}"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
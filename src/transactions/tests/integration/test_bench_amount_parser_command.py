@@ -0,0 +1,19 @@
+import json
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from transactions.management.commands.bench_amount_parser import PAYLOADS
+
+
+class BenchAmountParserCommandTest(SimpleTestCase):
+    def test_reports_both_paths_for_every_payload(self):
+        out = StringIO()
+        call_command('bench_amount_parser', number=10, repeat=1, stdout=out)
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(set(report), set(PAYLOADS))
+        for timings in report.values():
+            self.assertEqual(set(timings), {'serializer_us', 'parser_us', 'saved_us', 'speedup'})
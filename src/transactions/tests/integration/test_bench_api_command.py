@@ -0,0 +1,65 @@
+import json
+
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import LiveServerTestCase
+
+from transactions.management.commands.bench_api import Command
+from transactions.models.account import Account
+from transactions.models.ledger_carry_forward import LedgerCarryForward
+from transactions.models.transaction import Transaction
+
+
+class BenchApiCommandTest(LiveServerTestCase):
+    def test_reports_latency_and_verifies_ledger(self):
+        out = StringIO()
+        call_command(
+            'bench_api',
+            base_url=self.live_server_url,
+            users=3,
+            concurrency=4,
+            requests=60,
+            mix='balance=2,deposit=1,withdraw=1',
+            seed=1,
+            stdout=out,
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['requests'], 60)
+        self.assertEqual(report['errors']['total'], 0)
+        self.assertEqual(sum(endpoint['count'] for endpoint in report['endpoints'].values()), 60)
+        self.assertIsNotNone(report['latency']['p99_ms'])
+        self.assertEqual(report['consistency'], {'accounts_checked': 3, 'mismatches': []})
+        self.assertEqual(Account.objects.filter(user__username__startswith='bench_user_').count(), 3)
+
+    def test_transfers_between_hot_accounts_keep_ledger_consistent(self):
+        out = StringIO()
+        call_command(
+            'bench_api',
+            base_url=self.live_server_url,
+            users=5,
+            hot_accounts=2,
+            concurrency=4,
+            requests=40,
+            mix='transfer=1',
+            seed=1,
+            stdout=out,
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['config']['hot_accounts'], 2)
+        self.assertEqual(report['endpoints']['transfer']['status_codes'], {'200': 40})
+        self.assertEqual(report['consistency']['mismatches'], [])
+        balances = Account.objects.filter(user__username__startswith='bench_user_').values_list('balance', flat=True)
+        # Transfers only move money between the two hot accounts.
+        self.assertEqual(sum(balances), 5 * 1000)
+        self.assertEqual(sorted(balances)[1:4], [1000, 1000, 1000])
+
+    def test_ledger_check_counts_carried_forward_totals(self):
+        account = Account.objects.create(user=User.objects.create_user(username='bench_user_0'), balance=30)
+        Transaction.objects.create(account=account, transaction_type=Transaction.TransactionType.DEPOSIT, amount=10)
+        LedgerCarryForward.objects.create(account=account, amount=20)
+
+        self.assertEqual(Command().verify_ledger('bench_user_'), {'accounts_checked': 1, 'mismatches': []})
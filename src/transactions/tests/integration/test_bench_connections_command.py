@@ -0,0 +1,33 @@
+import json
+
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TransactionTestCase
+
+from transactions.management.commands.bench_connections import Command
+from transactions.models.account import Account
+
+
+# Requests open and close connections as in production, which a TestCase's wrapping transaction would not survive.
+class BenchConnectionsCommandTest(TransactionTestCase):
+    def test_measures_each_endpoint_under_the_current_settings(self):
+        token = Command().provision_user('bench_connections')
+        out = StringIO()
+
+        call_command('bench_connections', measure=token, requests=5, stdout=out)
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(list(report['endpoints']), ['balance', 'deposit', 'withdraw'])
+        self.assertEqual(report['latency']['count'], 15)
+        # Per-request (and pooled) connections are set up for every request; a persistent one only once, in warmup.
+        persistent = connection.settings_dict['CONN_MAX_AGE'] != 0
+        self.assertEqual(report['connects'], 0 if persistent else 15)
+        self.assertEqual(Account.objects.get(user__username='bench_connections').balance, Decimal('1000.00'))
+
+    def test_rejects_unknown_profiles(self):
+        with self.assertRaisesMessage(CommandError, "Unknown profile(s): pgbouncer"):
+            call_command('bench_connections', profiles='persistent,pgbouncer')
@@ -0,0 +1,30 @@
+import json
+import os
+
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from transactions.management.commands.bench_settings import measure_startup
+
+
+class BenchSettingsCommandTest(TestCase):
+    def test_measures_every_middleware_of_the_current_settings(self):
+        out = StringIO()
+        call_command('bench_settings', measure=True, requests=20, stdout=out)
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(list(report['middleware_cost_us']), settings.MIDDLEWARE)
+        self.assertGreater(report['request']['p50_us'], 0)
+        self.assertFalse(User.objects.filter(username__startswith="bench_settings_").exists())
+
+    def test_production_settings_load_fewer_modules(self):
+        env = {**os.environ, 'DJANGO_SECRET_KEY': 'test', 'DJANGO_ALLOWED_HOSTS': 'localhost'}
+
+        production = measure_startup('config.settings.production', runs=1, env=env)
+        local = measure_startup('config.settings.local', runs=1, env=env)
+
+        self.assertLess(production['modules_loaded'], local['modules_loaded'])
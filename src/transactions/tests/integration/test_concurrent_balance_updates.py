@@ -0,0 +1,84 @@
+import json
+
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, TransactionTestCase
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from transactions.models.account import Account
+from transactions.models.transaction import Transaction
+
+THREADS = 8
+REQUESTS_PER_THREAD = 25
+
+
+# Runs outside TestCase's wrapping transaction so that every thread commits on its own connection,
+# which is the only way concurrent requests can actually race on the account row.
+class ConcurrentBalanceUpdatesTest(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="user1", password="testpass")
+        self.token = Token.objects.create(user=self.user)
+        self.account = Account.objects.create(user=self.user, balance=100)
+
+    def _post_many(self, url_name, amount, count):
+        def worker(_):
+            client = Client()
+            status_codes = []
+            try:
+                for _ in range(count):
+                    response = client.post(
+                        reverse(url_name),
+                        data=json.dumps({"amount": amount}),
+                        content_type="application/json",
+                        HTTP_AUTHORIZATION=f"Token {self.token.key}"
+                    )
+                    status_codes.append(response.status_code)
+            finally:
+                connection.close()
+            return status_codes
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            return [code for codes in executor.map(worker, range(THREADS)) for code in codes]
+
+    def test_concurrent_deposits_lose_no_updates(self):
+        status_codes = self._post_many("deposit", "1.00", REQUESTS_PER_THREAD)
+
+        self.assertEqual(status_codes, [status.HTTP_200_OK] * THREADS * REQUESTS_PER_THREAD)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("100.00") + THREADS * REQUESTS_PER_THREAD)
+        self.assertEqual(Transaction.objects.count(), THREADS * REQUESTS_PER_THREAD)
+
+    def test_concurrent_withdrawals_never_overdraw(self):
+        status_codes = self._post_many("withdraw", "1.00", REQUESTS_PER_THREAD)
+
+        # 100.00 covers exactly 100 of the 200 withdrawals; the rest must be rejected, not applied.
+        self.assertEqual(status_codes.count(status.HTTP_200_OK), 100)
+        self.assertEqual(status_codes.count(status.HTTP_400_BAD_REQUEST), THREADS * REQUESTS_PER_THREAD - 100)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("0.00"))
+        self.assertEqual(Transaction.objects.count(), 100)
+
+    def test_concurrent_mixed_operations_match_transaction_log(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            deposits = executor.submit(self._post_many, "deposit", "3.00", REQUESTS_PER_THREAD)
+            withdrawals = executor.submit(self._post_many, "withdraw", "2.00", REQUESTS_PER_THREAD)
+            applied_deposits = deposits.result().count(status.HTTP_200_OK)
+            applied_withdrawals = withdrawals.result().count(status.HTTP_200_OK)
+
+        self.account.refresh_from_db()
+        expected = Decimal("100.00") + 3 * applied_deposits - 2 * applied_withdrawals
+        self.assertEqual(self.account.balance, expected)
+        self.assertGreaterEqual(self.account.balance, 0)
+        self.assertEqual(
+            Transaction.objects.filter(transaction_type=Transaction.TransactionType.DEPOSIT).count(),
+            applied_deposits
+        )
+        self.assertEqual(
+            Transaction.objects.filter(transaction_type=Transaction.TransactionType.WITHDRAW).count(),
+            applied_withdrawals
+        )
@@ -0,0 +1,133 @@
+import json
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from transactions.models.account import Account
+from transactions.models.transaction import Transaction
+
+
+class BatchTransactionViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="user1", password="testpass")
+        self.token = Token.objects.create(user=self.user)
+        self.account = Account.objects.create(user=self.user, balance=100)
+
+        self.url = reverse("transaction-batch")
+
+    def _post(self, payload, **extra):
+        return self.client.post(
+            self.url,
+            data=json.dumps(payload),
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Token {self.token.key}",
+            **extra
+        )
+
+    def test_authenticated_user_can_apply_batch(self):
+        payload = {
+            "operations": [
+                {"type": "deposit", "amount": "50.00"},
+                {"type": "withdraw", "amount": "120.00"},
+                {"type": "deposit", "amount": "0.50"},
+            ]
+        }
+        response = self._post(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Decimal(str(response.json()["new_balance"])), Decimal("30.50"))
+        self.assertEqual([r["status"] for r in response.json()["results"]], ["applied"] * 3)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("30.50"))
+        self.assertEqual(
+            list(Transaction.objects.order_by("id").values_list("transaction_type", "amount")),
+            [
+                (Transaction.TransactionType.DEPOSIT, Decimal("50.00")),
+                (Transaction.TransactionType.WITHDRAW, Decimal("120.00")),
+                (Transaction.TransactionType.DEPOSIT, Decimal("0.50")),
+            ]
+        )
+
+    def test_all_or_nothing_batch_is_rejected_as_a_whole(self):
+        payload = {
+            "mode": "all_or_nothing",
+            "operations": [
+                {"type": "deposit", "amount": "10.00"},
+                {"type": "withdraw", "amount": "500.00"},
+                {"type": "deposit", "amount": "10.00"},
+            ]
+        }
+        response = self._post(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("insufficient", response.json()["error"].lower())
+        self.assertEqual(
+            [r["status"] for r in response.json()["results"]],
+            ["not_applied", "rejected", "not_applied"]
+        )
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("100.00"))
+        self.assertEqual(Transaction.objects.count(), 0)
+
+    def test_best_effort_batch_applies_what_it_can(self):
+        payload = {
+            "mode": "best_effort",
+            "operations": [
+                {"type": "withdraw", "amount": "80.00"},
+                {"type": "withdraw", "amount": "30.00"},
+                {"type": "deposit", "amount": "5.00"},
+                {"type": "withdraw", "amount": "25.00"},
+            ]
+        }
+        response = self._post(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()["results"]
+        self.assertEqual([r["status"] for r in results], ["applied", "rejected", "applied", "applied"])
+        self.assertEqual(results[1]["error"], "Insufficient funds")
+        self.assertEqual(Decimal(str(response.json()["new_balance"])), Decimal("0.00"))
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("0.00"))
+        self.assertEqual(Transaction.objects.count(), 3)
+
+    def test_invalid_operation_returns_400_per_operation(self):
+        payload = {
+            "operations": [
+                {"type": "deposit", "amount": "10.00"},
+                {"type": "refund", "amount": "0"},
+            ]
+        }
+        response = self._post(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.json()["operations"]
+        self.assertNotIn("0", errors)
+        self.assertIn("type", errors["1"])
+        self.assertIn("amount", errors["1"])
+        self.assertEqual(Transaction.objects.count(), 0)
+
+    def test_empty_batch_returns_400(self):
+        response = self._post({"operations": []})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("operations", response.json())
+
+    def test_too_many_operations_returns_400(self):
+        operations = [{"type": "deposit", "amount": "1.00"}] * (settings.TRANSACTIONS_BATCH_MAX_OPERATIONS + 1)
+        response = self._post({"operations": operations})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("operations", response.json())
+        self.assertEqual(Transaction.objects.count(), 0)
+
+    def test_unauthenticated_user_cannot_apply_batch(self):
+        response = self.client.post(
+            self.url,
+            data=json.dumps({"operations": [{"type": "deposit", "amount": "1.00"}]}),
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,120 @@
+import json
+
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from transactions.models.account import Account
+from transactions.models.transaction import Transaction
+
+
+def create_user_with_account(username, balance):
+    user = User.objects.create_user(username=username, password="testpass")
+    Account.objects.create(user=user, balance=balance)
+    return Token.objects.create(user=user)
+
+
+def post_transfer(client, token, to_username, amount):
+    return client.post(
+        reverse("transfer"),
+        data=json.dumps({"to_username": to_username, "amount": amount}),
+        content_type="application/json",
+        HTTP_AUTHORIZATION=f"Token {token.key}"
+    )
+
+
+class TransferViewTest(TestCase):
+    def setUp(self):
+        self.token = create_user_with_account("user1", 100)
+        create_user_with_account("user2", 50)
+
+    def assertBalances(self, user1, user2):
+        self.assertEqual(Account.objects.get(user__username="user1").balance, Decimal(user1))
+        self.assertEqual(Account.objects.get(user__username="user2").balance, Decimal(user2))
+
+    def test_authenticated_user_can_transfer(self):
+        response = post_transfer(self.client, self.token, "user2", "30.00")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'message': 'Transfer successful', 'new_balance': 70.0})
+        self.assertBalances("70.00", "80.00")
+        self.assertEqual(
+            set(Transaction.objects.values_list('account__user__username', 'transaction_type', 'amount')),
+            {
+                ("user1", Transaction.TransactionType.WITHDRAW, Decimal("30.00")),
+                ("user2", Transaction.TransactionType.DEPOSIT, Decimal("30.00")),
+            }
+        )
+
+    def test_transfer_more_than_balance_writes_nothing(self):
+        response = post_transfer(self.client, self.token, "user2", "100.01")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {'error': 'Insufficient funds'})
+        self.assertBalances("100.00", "50.00")
+        self.assertEqual(Transaction.objects.count(), 0)
+
+    def test_unknown_recipient_returns_400(self):
+        response = post_transfer(self.client, self.token, "nobody", "10.00")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {'error': 'Recipient not found'})
+        self.assertEqual(Transaction.objects.count(), 0)
+
+    def test_transfer_to_own_account_returns_400(self):
+        response = post_transfer(self.client, self.token, "user1", "10.00")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), {'error': 'Cannot transfer to your own account'})
+        self.assertBalances("100.00", "50.00")
+
+    def test_invalid_amount_returns_400(self):
+        response = post_transfer(self.client, self.token, "user2", "0.00")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("amount", response.json())
+
+    def test_unauthenticated_user_cannot_transfer(self):
+        response = self.client.post(reverse("transfer"), data={"to_username": "user2", "amount": "1.00"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+THREADS_PER_DIRECTION = 4
+TRANSFERS_PER_THREAD = 25
+
+
+# Opposite-direction transfers between the same two accounts would deadlock if each locked its own account
+# first; locking in primary-key order makes them queue instead.
+class ConcurrentTransfersTest(TransactionTestCase):
+    def test_opposite_direction_transfers_do_not_deadlock(self):
+        tokens = {
+            "user1": create_user_with_account("user1", 1000),
+            "user2": create_user_with_account("user2", 1000),
+        }
+
+        def worker(direction):
+            sender, recipient = direction
+            client = Client()
+            try:
+                return [
+                    post_transfer(client, tokens[sender], recipient, "1.00").status_code
+                    for _ in range(TRANSFERS_PER_THREAD)
+                ]
+            finally:
+                connection.close()
+
+        directions = [("user1", "user2"), ("user2", "user1")] * THREADS_PER_DIRECTION
+        with ThreadPoolExecutor(max_workers=len(directions)) as executor:
+            status_codes = [code for codes in executor.map(worker, directions) for code in codes]
+
+        self.assertEqual(status_codes, [status.HTTP_200_OK] * len(directions) * TRANSFERS_PER_THREAD)
+        self.assertEqual(
+            sorted(Account.objects.values_list('balance', flat=True)), [Decimal("1000.00"), Decimal("1000.00")]
+        )
+        self.assertEqual(Transaction.objects.count(), 2 * len(directions) * TRANSFERS_PER_THREAD)
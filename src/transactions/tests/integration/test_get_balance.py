@@ -38,3 +38,28 @@ class BalanceViewTest(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.json(), {'balance': '-0.01'})
+
+    def test_unchanged_balance_returns_304(self):
+        first = self.client.get(self.url, HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+        response = self.client.get(
+            self.url, HTTP_AUTHORIZATION=f"Token {self.token.key}", HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], first["ETag"])
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+    def test_changed_balance_returns_200_with_a_new_etag(self):
+        first = self.client.get(self.url, HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.account.balance = 300
+        self.account.save()
+
+        response = self.client.get(
+            self.url, HTTP_AUTHORIZATION=f"Token {self.token.key}", HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'balance': '300.00'})
+        self.assertNotEqual(response["ETag"], first["ETag"])
@@ -0,0 +1,130 @@
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from transactions.models.account import Account
+from transactions.models.transaction import Transaction
+
+
+class TransactionHistoryViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="user1", password="testpass")
+        self.token = Token.objects.create(user=self.user)
+        self.account = Account.objects.create(user=self.user, balance=100)
+
+        self.url = reverse("transaction-history")
+        self.start = datetime(2025, 1, 1, tzinfo=UTC)
+
+    def _create_transactions(self, account, count, transaction_type=Transaction.TransactionType.DEPOSIT, day=0):
+        transactions = Transaction.objects.bulk_create(
+            Transaction(account=account, transaction_type=transaction_type, amount=Decimal("1.00"))
+            for _ in range(count)
+        )
+        # auto_now_add ignores explicit values, so timestamps are pinned after insertion.
+        Transaction.objects.filter(pk__in=[t.pk for t in transactions]).update(
+            created_at=self.start + timedelta(days=day)
+        )
+        return transactions
+
+    def _get(self, url=None, **params):
+        return self.client.get(url or self.url, params, HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_authenticated_user_can_view_history(self):
+        older = self._create_transactions(self.account, 1, day=0)[0]
+        newer = self._create_transactions(self.account, 1, Transaction.TransactionType.WITHDRAW, day=1)[0]
+
+        response = self._get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.json()["next"])
+        results = response.json()["results"]
+        self.assertEqual([r["id"] for r in results], [newer.pk, older.pk])
+        self.assertEqual(results[0]["transaction_type"], "withdraw")
+        self.assertEqual(results[0]["amount"], "1.00")
+
+    def test_cursor_walks_every_transaction_exactly_once(self):
+        # Many rows share the same created_at, so the id tie-breaker decides page boundaries.
+        first_day = self._create_transactions(self.account, 7, day=0)
+        second_day = self._create_transactions(self.account, 6, day=1)
+
+        seen = []
+        url, params = None, {"page_size": 4}
+        while True:
+            response = self._get(url, **params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.json()["results"]), 4)
+            seen += [r["id"] for r in response.json()["results"]]
+            url, params = response.json()["next"], {}
+            if url is None:
+                break
+
+        self.assertEqual(seen, [t.pk for t in reversed(second_day)] + [t.pk for t in reversed(first_day)])
+
+    def test_history_can_be_filtered_by_type_and_date_range(self):
+        self._create_transactions(self.account, 2, day=0)
+        withdrawals = self._create_transactions(self.account, 2, Transaction.TransactionType.WITHDRAW, day=5)
+        self._create_transactions(self.account, 2, Transaction.TransactionType.WITHDRAW, day=10)
+
+        date_range = {
+            "from": (self.start + timedelta(days=1)).isoformat(),
+            "to": (self.start + timedelta(days=10)).isoformat(),
+        }
+        response = self._get(transaction_type="withdraw", **date_range)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(r["id"] for r in response.json()["results"]),
+            sorted(t.pk for t in withdrawals)
+        )
+
+    def test_history_excludes_other_accounts(self):
+        other_user = User.objects.create_user(username="user2", password="testpass")
+        other_account = Account.objects.create(user=other_user, balance=100)
+        self._create_transactions(other_account, 3)
+
+        response = self._get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"], [])
+
+    def test_unchanged_page_returns_304(self):
+        self._create_transactions(self.account, 3)
+        first = self._get(page_size=2)
+
+        response = self.client.get(
+            self.url, {"page_size": 2}, HTTP_AUTHORIZATION=f"Token {self.token.key}", HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertNotEqual(self._get(page_size=3)["ETag"], first["ETag"])
+
+    def test_page_etag_changes_with_its_rows(self):
+        [pending] = self._create_transactions(self.account, 1)
+        etag = self._get()["ETag"]
+
+        Transaction.objects.filter(pk=pending.pk).update(status=Transaction.Status.PENDING, updated_at=self.start)
+        updated = self._get()
+        self._create_transactions(self.account, 1, day=1)
+        added = self._get()
+
+        self.assertEqual(len({etag, updated["ETag"], added["ETag"]}), 3)
+
+    def test_invalid_filters_return_400(self):
+        response = self._get(transaction_type="refund", **{"from": "yesterday"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("transaction_type", response.json())
+        self.assertIn("from", response.json())
+
+    def test_invalid_cursor_returns_404(self):
+        response = self._get(cursor="not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unauthenticated_user_cannot_view_history(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,176 @@
+import json
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from transactions.models.account import Account
+from transactions.models.idempotency_key import IdempotencyKey
+from transactions.models.transaction import Transaction
+
+
+class IdempotencyKeyTest(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user(username="user1", password="testpass")
+        self.token = Token.objects.create(user=self.user)
+        self.account = Account.objects.create(user=self.user, balance=100)
+
+    def _post(self, url_name, amount, key, token=None):
+        headers = {"Authorization": f"Token {(token or self.token).key}"}
+        if key is not None:
+            headers["Idempotency-Key"] = key
+        return self.client.post(
+            reverse(url_name), data=json.dumps({"amount": amount}), content_type="application/json", headers=headers
+        )
+
+    def test_retried_deposit_is_applied_once(self):
+        first = self._post("deposit", "50.00", "key-1")
+        retry = self._post("deposit", "50.00", "key-1")
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Idempotent-Replayed", first)
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.content, first.content)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("150.00"))
+        self.assertEqual(Transaction.objects.count(), 1)
+
+    def test_replay_from_the_table_when_not_cached(self):
+        first = self._post("withdraw", "40.00", "key-1")
+        caches['default'].clear()
+        retry = self._post("withdraw", "40.00", "key-1")
+
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.json(), first.json())
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("60.00"))
+
+    def test_cached_replay_does_not_query_the_database(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._post("deposit", "50.00", "key-1")
+
+        # The token is cached too, so a cached replay never reaches the database.
+        with self.assertNumQueries(0):
+            self._post("deposit", "50.00", "key-1")
+
+    def test_rejected_withdrawal_is_replayed(self):
+        first = self._post("withdraw", "150.00", "key-1")
+        self._post("deposit", "100.00", None)
+        retry = self._post("withdraw", "150.00", "key-1")
+
+        self.assertEqual(first.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(retry.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(retry.json(), {'error': 'Insufficient funds'})
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("200.00"))
+
+    def test_key_reused_for_a_different_request_is_rejected(self):
+        self._post("deposit", "50.00", "key-1")
+        different_amount = self._post("deposit", "60.00", "key-1")
+        different_endpoint = self._post("withdraw", "50.00", "key-1")
+
+        self.assertEqual(different_amount.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(different_endpoint.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("150.00"))
+
+    def test_keys_are_scoped_to_the_user(self):
+        other = User.objects.create_user(username="user2")
+        Account.objects.create(user=other, balance=0)
+
+        self._post("deposit", "50.00", "key-1")
+        response = self._post("deposit", "50.00", "key-1", token=Token.objects.create(user=other))
+
+        self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(response.json()["new_balance"], 50.0)
+
+    def test_invalid_amount_does_not_use_the_key(self):
+        self._post("deposit", "-1", "key-1")
+        response = self._post("deposit", "50.00", "key-1")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Idempotent-Replayed", response)
+
+    def test_overlong_key_returns_400(self):
+        response = self._post("deposit", "50.00", "k" * 256)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Transaction.objects.count(), 0)
+
+    @override_settings(DEPOSIT_WRITE_BEHIND=True)
+    def test_write_behind_deposit_is_enqueued_once(self):
+        first = self._post("deposit", "50.00", "key-1")
+        retry = self._post("deposit", "50.00", "key-1")
+
+        self.assertEqual(first.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Transaction.objects.count(), 1)
+
+    @override_settings(ROOT_URLCONF='transactions.async_urls')
+    async def test_async_views_replay(self):
+        headers = {"Authorization": f"Token {self.token.key}", "Idempotency-Key": "key-1"}
+        responses = [
+            await self.async_client.post(
+                reverse("deposit"), data={"amount": "50.00"}, content_type="application/json", headers=headers
+            )
+            for _ in range(2)
+        ]
+
+        self.assertEqual(responses[1]["Idempotent-Replayed"], "true")
+        self.assertEqual(responses[1].content, responses[0].content)
+        self.assertEqual(await Transaction.objects.acount(), 1)
+
+    def test_purge_deletes_old_keys(self):
+        self._post("deposit", "50.00", "old")
+        self._post("deposit", "50.00", "new")
+        IdempotencyKey.objects.filter(key="old").update(created_at=timezone.now() - timedelta(hours=25))
+        out = StringIO()
+
+        call_command("purge_idempotency_keys", stdout=out)
+
+        self.assertEqual(json.loads(out.getvalue()), {'deleted': 1})
+        self.assertEqual(list(IdempotencyKey.objects.values_list("key", flat=True)), ["new"])
+
+
+# Concurrent retries must commit on their own connections to race on the key, as in
+# test_concurrent_balance_updates.
+class ConcurrentIdempotencyKeyTest(TransactionTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user(username="user1", password="testpass")
+        self.token = Token.objects.create(user=self.user)
+        self.account = Account.objects.create(user=self.user, balance=100)
+
+    def test_concurrent_retries_apply_once(self):
+        def worker(_):
+            try:
+                return Client().post(
+                    reverse("withdraw"),
+                    data=json.dumps({"amount": "10.00"}),
+                    content_type="application/json",
+                    headers={"Authorization": f"Token {self.token.key}", "Idempotency-Key": "key-1"},
+                ).json()
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            bodies = list(executor.map(worker, range(8)))
+
+        self.assertEqual(bodies, [{'message': 'Withdrawal successful', 'new_balance': 90.0}] * 8)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("90.00"))
+        self.assertEqual(Transaction.objects.count(), 1)
@@ -0,0 +1,129 @@
+import json
+
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from transactions.models.account import Account
+from transactions.models.ledger_carry_forward import LedgerCarryForward
+from transactions.models.transaction import Transaction
+from transactions.services import partitions
+
+
+def partition_of(transaction):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT tableoid::regclass::text FROM {partitions.TABLE} WHERE id = %s", [transaction.pk]
+        )
+        return cursor.fetchone()[0]
+
+
+def table_exists(name):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+        return cursor.fetchone()[0]
+
+
+class TransactionPartitionsTest(TestCase):
+    def setUp(self):
+        self.account = Account.objects.create(user=User.objects.create_user(username="user1"), balance=0)
+
+    def create_transaction(self, created_at=None):
+        transaction = Transaction.objects.create(
+            account=self.account, transaction_type=Transaction.TransactionType.DEPOSIT, amount=Decimal("1.00")
+        )
+        if created_at:
+            Transaction.objects.filter(pk=transaction.pk).update(created_at=created_at)
+        return transaction
+
+    def test_orm_reads_and_writes_through_the_partitioned_table(self):
+        transaction = self.create_transaction()
+
+        current_month = partitions.partition_name(partitions.month_start(transaction.created_at.date()))
+        self.assertEqual(Transaction.objects.get(pk=transaction.pk).amount, Decimal("1.00"))
+        self.assertIn(partition_of(transaction), {'transactions_transaction_legacy', current_month})
+
+    def test_creates_missing_months_once(self):
+        self.assertEqual(
+            partitions.ensure_partitions(date(2030, 1, 10), months_ahead=1),
+            ['transactions_transaction_p203001', 'transactions_transaction_p203002']
+        )
+        self.assertEqual(partitions.ensure_partitions(date(2030, 1, 31), months_ahead=1), [])
+
+    def test_new_partition_takes_over_its_rows_from_the_default_partition(self):
+        transaction = self.create_transaction(created_at=datetime(2031, 5, 20, tzinfo=UTC))
+        self.assertEqual(partition_of(transaction), partitions.DEFAULT_PARTITION)
+
+        partitions.ensure_partitions(date(2031, 5, 1), months_ahead=0)
+
+        self.assertEqual(partition_of(transaction), 'transactions_transaction_p203105')
+
+    def test_date_bounded_queries_only_scan_matching_partitions(self):
+        partitions.ensure_partitions(date(2030, 1, 1), months_ahead=2)
+
+        plan = Transaction.objects.filter(
+            account=self.account,
+            created_at__gte=datetime(2030, 2, 3, tzinfo=UTC),
+            created_at__lt=datetime(2030, 2, 10, tzinfo=UTC),
+        ).explain()
+
+        self.assertIn('transactions_transaction_p203002', plan)
+        self.assertNotIn('transactions_transaction_p203001', plan)
+        self.assertNotIn('transactions_transaction_legacy', plan)
+        self.assertNotIn(partitions.DEFAULT_PARTITION, plan)
+
+    def test_expired_partitions_are_detached_or_dropped(self):
+        partitions.ensure_partitions(date(2030, 1, 1), months_ahead=2)
+
+        detached = partitions.expire_partitions(date(2030, 4, 15), retain_months=2)
+
+        self.assertIn('transactions_transaction_p203001', detached)
+        self.assertNotIn('transactions_transaction_p203002', detached)
+        self.assertTrue(table_exists('transactions_transaction_p203001'))
+        self.assertNotIn('transactions_transaction_p203001', [p.name for p in partitions.list_partitions()])
+
+        dropped = partitions.expire_partitions(date(2030, 5, 1), retain_months=2, drop=True)
+
+        self.assertEqual(dropped, ['transactions_transaction_p203002'])
+        self.assertFalse(table_exists('transactions_transaction_p203002'))
+
+    def test_expired_transactions_are_carried_forward_so_reconciliation_finds_no_drift(self):
+        partitions.ensure_partitions(date(2030, 1, 1), months_ahead=1)
+        self.create_transaction(created_at=datetime(2030, 1, 5, tzinfo=UTC))
+        withdrawal = self.create_transaction(created_at=datetime(2030, 1, 6, tzinfo=UTC))
+        Transaction.objects.filter(pk=withdrawal.pk).update(
+            transaction_type=Transaction.TransactionType.WITHDRAW, amount=Decimal("0.25")
+        )
+        self.create_transaction(created_at=datetime(2030, 2, 5, tzinfo=UTC))
+        Account.objects.filter(pk=self.account.pk).update(balance=Decimal("1.75"))
+
+        partitions.expire_partitions(date(2030, 3, 1), retain_months=1)
+        out = StringIO()
+        call_command('reconcile_balances', workers=1, stdout=out)
+
+        self.assertEqual(LedgerCarryForward.objects.get(account=self.account).amount, Decimal("0.75"))
+        self.assertEqual(json.loads(out.getvalue().splitlines()[-1])['drifted'], 0)
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("1.75"))
+
+    def test_command_creates_upcoming_partitions(self):
+        out = StringIO()
+
+        call_command('manage_transaction_partitions', months_ahead=6, stdout=out)
+        report = json.loads(out.getvalue())
+        call_command('manage_transaction_partitions', months_ahead=6, stdout=out)
+
+        self.assertTrue(report['created'])
+        self.assertEqual(json.loads(out.getvalue().splitlines()[-1]), {'created': []})
+        upper_bounds = [p.upper for p in partitions.list_partitions() if p.upper]
+        self.assertEqual(max(upper_bounds), partitions.month_start(timezone.now().date(), 7))
+
+    def test_command_needs_retention_to_drop(self):
+        with self.assertRaises(CommandError):
+            call_command('manage_transaction_partitions', drop=True, stdout=StringIO())
@@ -0,0 +1,45 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from transactions.models.account import Account
+from transactions.models.transaction import Transaction
+from transactions.services.ledger import signed_amount
+
+
+class PopulateTestDbCommandTest(TestCase):
+    def test_without_options_creates_single_user(self):
+        call_command('populate_test_db', stdout=StringIO())
+
+        account = Account.objects.get(user__username="user1")
+        self.assertEqual(account.balance, 100)
+        self.assertTrue(Token.objects.filter(user=account.user).exists())
+
+    def test_bulk_mode_generates_consistent_histories(self):
+        call_command(
+            'populate_test_db',
+            users=7,
+            transactions_per_account=20,
+            days=30,
+            chunk_size=3,
+            seed=42,
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(User.objects.filter(username__startswith="user_").count(), 7)
+        self.assertEqual(Token.objects.count(), 7)
+        self.assertEqual(Transaction.objects.count(), 7 * 20)
+        self.assertTrue(User.objects.get(username="user_0").check_password("testpass"))
+
+        oldest = Transaction.objects.order_by('created_at').first().created_at
+        self.assertGreaterEqual(oldest, timezone.now() - timedelta(days=30, minutes=1))
+
+        for account in Account.objects.annotate(ledger=Sum(signed_amount('transactions__'))):
+            self.assertEqual(account.balance, account.ledger)
+            self.assertGreaterEqual(account.balance, 0)
@@ -0,0 +1,90 @@
+import json
+import tempfile
+
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase
+
+from transactions.models.account import Account
+from transactions.models.transaction import Transaction
+
+
+def create_account(username, balance, deposits=(), withdrawals=()):
+    account = Account.objects.create(user=User.objects.create_user(username=username), balance=balance)
+    history = [(Transaction.TransactionType.DEPOSIT, amount) for amount in deposits]
+    history += [(Transaction.TransactionType.WITHDRAW, amount) for amount in withdrawals]
+    Transaction.objects.bulk_create(
+        Transaction(account=account, transaction_type=transaction_type, amount=amount)
+        for transaction_type, amount in history
+    )
+    return account
+
+
+def run_reconcile(**options):
+    out = StringIO()
+    call_command('reconcile_balances', stdout=out, **options)
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    return [line for line in lines if not line.get('summary')], lines[-1]
+
+
+class ReconcileBalancesCommandTest(TestCase):
+    def setUp(self):
+        self.consistent = create_account("user1", Decimal("70.00"), deposits=["100.00"], withdrawals=["30.00"])
+        self.drifted = create_account("user2", Decimal("55.00"), deposits=["50.00"])
+        self.empty = create_account("user3", Decimal("0.00"))
+
+    def test_reports_drift_and_fails(self):
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('reconcile_balances', workers=1, batch_size=2, stdout=out)
+
+        drifts = [json.loads(line) for line in out.getvalue().splitlines()][:-1]
+        self.assertEqual(drifts, [{
+            'account_id': self.drifted.id,
+            'balance': '55.00',
+            'ledger': '50.00',
+            'difference': '5.00',
+            'repaired': False,
+        }])
+        self.drifted.refresh_from_db()
+        self.assertEqual(self.drifted.balance, Decimal("55.00"))
+
+    def test_repair_sets_balance_to_ledger_sum(self):
+        drifts, summary = run_reconcile(workers=1, repair=True)
+
+        self.assertEqual([d['account_id'] for d in drifts], [self.drifted.id])
+        self.assertEqual((summary['drifted'], summary['repaired']), (1, 1))
+        self.drifted.refresh_from_db()
+        self.assertEqual(self.drifted.balance, Decimal("50.00"))
+
+        drifts, summary = run_reconcile(workers=1)
+        self.assertEqual(drifts, [])
+
+    def test_resumes_from_checkpoint(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = Path(directory) / "reconcile.json"
+            # Pretend a previous run already reconciled every account before the drifted one.
+            checkpoint.write_text(json.dumps({'next_id': self.empty.id, 'drifted': 0, 'repaired': 0}))
+
+            drifts, summary = run_reconcile(workers=1, batch_size=1, checkpoint=checkpoint)
+
+            self.assertEqual(drifts, [])
+            self.assertEqual(summary['resumed_from'], self.empty.id)
+            self.assertFalse(checkpoint.exists())
+
+
+class ParallelReconcileBalancesCommandTest(TransactionTestCase):
+    def test_parallel_workers_find_every_drift(self):
+        accounts = [create_account(f"user{i}", Decimal("10.00"), deposits=["10.00"]) for i in range(6)]
+        drifted = {accounts[1].id, accounts[4].id}
+        Account.objects.filter(id__in=drifted).update(balance=Decimal("11.00"))
+
+        drifts, summary = run_reconcile(workers=3, batch_size=2, repair=True)
+
+        self.assertEqual({d['account_id'] for d in drifts}, drifted)
+        self.assertEqual(summary['repaired'], 2)
+        self.assertFalse(Account.objects.exclude(balance=Decimal("10.00")).exists())
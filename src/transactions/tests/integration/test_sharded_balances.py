@@ -0,0 +1,220 @@
+import json
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client, TestCase, TransactionTestCase
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from transactions.models.account import Account
+from transactions.models.account_balance_shard import AccountBalanceShard
+from transactions.models.transaction import Transaction
+from transactions.services import ledger, sharding
+from transactions.services.reconciliation import find_drift, repair_drift
+
+SHARDS = 4
+
+
+def post_amount(client, url_name, token, amount):
+    return client.post(
+        reverse(url_name),
+        data=json.dumps({"amount": amount}),
+        content_type="application/json",
+        HTTP_AUTHORIZATION=f"Token {token.key}"
+    )
+
+
+def shard_balances(account):
+    shards = AccountBalanceShard.objects.filter(account=account).order_by('index')
+    return list(shards.values_list('balance', flat=True))
+
+
+class ShardedBalanceTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="merchant", password="testpass")
+        self.token = Token.objects.create(user=self.user)
+        self.account = Account.objects.create(user=self.user, balance=100)
+        Transaction.objects.create(
+            account=self.account, transaction_type=Transaction.TransactionType.DEPOSIT, amount=Decimal("100.00")
+        )
+        sharding.set_shard_count(self.account.id, SHARDS)
+
+    def total(self):
+        return Account.objects.annotate(total=sharding.total_balance()).values_list('total', flat=True).get(
+            pk=self.account.pk
+        )
+
+    def test_deposits_go_to_shards_not_the_account_row(self):
+        for _ in range(20):
+            response = post_amount(self.client, "deposit", self.token, "5.00")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['new_balance'], 200.0)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("100.00"))
+        self.assertEqual(sum(shard_balances(self.account)), Decimal("100.00"))
+        self.assertEqual(self.total(), Decimal("200.00"))
+
+    def test_balance_view_includes_shards(self):
+        ledger.deposit(self.user.id, Decimal("25.00"))
+
+        response = self.client.get(reverse("balance"), HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+        self.assertEqual(response.json(), {'balance': '125.00'})
+
+    def test_withdraw_covered_by_the_account_row_leaves_shards_alone(self):
+        ledger.deposit(self.user.id, Decimal("50.00"))
+
+        self.assertEqual(ledger.withdraw(self.user.id, Decimal("80.00")), Decimal("70.00"))
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("20.00"))
+        self.assertEqual(sum(shard_balances(self.account)), Decimal("50.00"))
+
+    def test_withdraw_beyond_the_account_row_folds_the_shards(self):
+        ledger.deposit(self.user.id, Decimal("50.00"))
+
+        self.assertEqual(ledger.withdraw(self.user.id, Decimal("130.00")), Decimal("20.00"))
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("20.00"))
+        self.assertEqual(shard_balances(self.account), [Decimal("0.00")] * SHARDS)
+
+    def test_withdraw_more_than_the_total_writes_nothing(self):
+        ledger.deposit(self.user.id, Decimal("50.00"))
+
+        with self.assertRaises(ledger.InsufficientFunds):
+            ledger.withdraw(self.user.id, Decimal("150.01"))
+
+        self.assertEqual(self.total(), Decimal("150.00"))
+        self.assertEqual(Transaction.objects.filter(transaction_type=Transaction.TransactionType.WITHDRAW).count(), 0)
+
+    def test_transfer_and_batch_spend_shard_funds(self):
+        User.objects.create_user(username="customer", password="testpass")
+        Account.objects.create(user=User.objects.get(username="customer"), balance=0)
+        ledger.deposit(self.user.id, Decimal("50.00"))
+
+        self.assertEqual(ledger.transfer(self.user.id, "customer", Decimal("120.00")), Decimal("30.00"))
+        result = ledger.apply_batch(self.user.id, [
+            {'type': Transaction.TransactionType.DEPOSIT, 'amount': Decimal("10.00")},
+            {'type': Transaction.TransactionType.WITHDRAW, 'amount': Decimal("40.00")},
+        ])
+
+        self.assertTrue(result.accepted)
+        self.assertEqual(result.balance, Decimal("0.00"))
+        self.assertEqual(self.total(), Decimal("0.00"))
+
+    def test_sharded_accounts_reconcile(self):
+        ledger.deposit(self.user.id, Decimal("50.00"))
+        self.assertEqual(list(find_drift(self.account.id, self.account.id + 1)), [])
+
+        AccountBalanceShard.objects.filter(account=self.account, index=0).update(balance=Decimal("999.00"))
+        drift = repair_drift(self.account.id)
+
+        self.assertEqual(drift.ledger, Decimal("150.00"))
+        self.assertEqual(self.total(), Decimal("150.00"))
+
+    def test_fold_command_moves_shards_into_the_account(self):
+        ledger.deposit(self.user.id, Decimal("50.00"))
+        out = StringIO()
+
+        call_command("fold_balance_shards", stdout=out)
+
+        self.assertEqual(json.loads(out.getvalue()), {'accounts': 1, 'folded': '50.00'})
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("150.00"))
+        self.assertEqual(shard_balances(self.account), [Decimal("0.00")] * SHARDS)
+
+    def test_unsharding_folds_and_deposits_return_to_the_account_row(self):
+        ledger.deposit(self.user.id, Decimal("50.00"))
+
+        call_command("shard_account", username="merchant", shards=0, stdout=StringIO())
+        ledger.deposit(self.user.id, Decimal("1.00"))
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.shard_count, 0)
+        self.assertEqual(self.account.balance, Decimal("151.00"))
+        self.assertEqual(sum(shard_balances(self.account)), Decimal("0.00"))
+
+
+class ConcurrentShardedDepositsTest(TransactionTestCase):
+    def test_concurrent_deposits_and_folds_lose_no_updates(self):
+        user = User.objects.create_user(username="merchant", password="testpass")
+        token = Token.objects.create(user=user)
+        account = Account.objects.create(user=user, balance=0)
+        sharding.set_shard_count(account.id, SHARDS)
+
+        def deposit_many(_):
+            client = Client()
+            try:
+                return [post_amount(client, "deposit", token, "1.00").status_code for _ in range(25)]
+            finally:
+                connection.close()
+
+        def fold_many():
+            try:
+                for _ in range(10):
+                    sharding.fold_account(account.id)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=9) as executor:
+            folding = executor.submit(fold_many)
+            status_codes = [code for codes in executor.map(deposit_many, range(8)) for code in codes]
+            folding.result()
+
+        self.assertEqual(status_codes, [status.HTTP_200_OK] * 200)
+        total = Account.objects.annotate(total=sharding.total_balance()).values_list('total', flat=True).get(
+            pk=account.pk
+        )
+        self.assertEqual(total, Decimal("200.00"))
+        self.assertEqual(Transaction.objects.count(), 200)
+
+    def test_deposit_racing_a_shard_count_change_lands_on_the_account_row(self):
+        user = User.objects.create_user(username="merchant", password="testpass")
+        account = Account.objects.create(user=user, balance=0)
+        locked, release = threading.Event(), threading.Event()
+
+        def shard_while_held():
+            try:
+                with transaction.atomic():
+                    sharding.set_shard_count(account.id, SHARDS)
+                    locked.set()
+                    release.wait(timeout=10)
+            finally:
+                connection.close()
+
+        def deposit():
+            try:
+                return ledger.deposit(user.id, Decimal("5.00"))
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            sharding_change = executor.submit(shard_while_held)
+            locked.wait(timeout=10)
+            depositing = executor.submit(deposit)
+            # The deposit has taken its snapshot (shard_count = 0) once it is waiting on the account row lock.
+            with connection.cursor() as cursor:
+                for _ in range(100):
+                    cursor.execute("SELECT count(*) FROM pg_stat_activity WHERE wait_event_type = 'Lock'")
+                    if cursor.fetchone()[0]:
+                        break
+                    time.sleep(0.05)
+            release.set()
+            sharding_change.result()
+            new_balance = depositing.result()
+
+        self.assertEqual(new_balance, Decimal("5.00"))
+        account.refresh_from_db()
+        self.assertEqual(account.shard_count, SHARDS)
+        self.assertEqual(account.balance, Decimal("5.00"))
+        self.assertEqual(Transaction.objects.filter(account=account).count(), 1)
@@ -0,0 +1,180 @@
+import json
+
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from transactions.models.account import Account
+from transactions.models.account_daily_rollup import AccountDailyRollup
+from transactions.models.transaction import Transaction
+from transactions.services import ledger, partitions, rollups, sharding
+
+
+class StatementSummaryTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="user1", password="testpass")
+        self.token = Token.objects.create(user=self.user)
+        self.account = Account.objects.create(user=self.user, balance=100)
+        other = User.objects.create_user(username="user2", password="testpass")
+        Account.objects.create(user=other, balance=0)
+        self.today = timezone.now().date()
+
+    def get_summary(self, **params):
+        return self.client.get(
+            reverse("statement-summary"), params, HTTP_AUTHORIZATION=f"Token {self.token.key}"
+        )
+
+    def rollup_rows(self):
+        return list(
+            AccountDailyRollup.objects
+            .filter(account=self.account, deposit_sum__gt=0)
+            .order_by('day', 'slot')
+            .values_list('day', 'slot', 'deposit_sum', 'withdraw_sum', 'count')
+        )
+
+    def test_every_ledger_write_updates_todays_rollup(self):
+        ledger.deposit(self.user.id, Decimal("50.00"))
+        ledger.withdraw(self.user.id, Decimal("20.00"))
+        ledger.transfer(self.user.id, "user2", Decimal("10.00"))
+        ledger.apply_batch(self.user.id, [
+            {'type': Transaction.TransactionType.DEPOSIT, 'amount': Decimal("5.00")},
+            {'type': Transaction.TransactionType.WITHDRAW, 'amount': Decimal("1.00")},
+        ])
+
+        self.assertEqual(self.rollup_rows(), [(self.today, 0, Decimal("55.00"), Decimal("31.00"), 5)])
+        self.assertEqual(
+            AccountDailyRollup.objects.get(account__user__username="user2").deposit_sum, Decimal("10.00")
+        )
+
+    def test_summary_endpoint_returns_daily_totals(self):
+        ledger.deposit(self.user.id, Decimal("50.00"))
+        ledger.withdraw(self.user.id, Decimal("20.00"))
+
+        response = self.get_summary()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(body['period'], 'day')
+        self.assertEqual(body['totals'], {'deposits': '50.00', 'withdrawals': '20.00', 'transactions': 2})
+        self.assertEqual(
+            body['periods'],
+            [{'period_start': self.today.isoformat(), 'deposits': '50.00', 'withdrawals': '20.00', 'transactions': 2}]
+        )
+
+    def test_monthly_summary_groups_rebuilt_history(self):
+        for created_at, amount in [
+            (datetime(2025, 6, 3, 10, tzinfo=UTC), "10.00"),
+            (datetime(2025, 6, 28, 23, 59, tzinfo=UTC), "20.00"),
+            (datetime(2025, 7, 1, 0, 0, tzinfo=UTC), "40.00"),
+        ]:
+            transaction = Transaction.objects.create(
+                account=self.account, transaction_type=Transaction.TransactionType.DEPOSIT, amount=Decimal(amount)
+            )
+            Transaction.objects.filter(pk=transaction.pk).update(created_at=created_at)
+        call_command("rebuild_daily_rollups", from_date=date(2025, 6, 1), to_date=date(2025, 7, 31), stdout=StringIO())
+
+        response = self.get_summary(**{'from': '2025-06-01', 'to': '2025-08-01', 'period': 'month'})
+
+        self.assertEqual(
+            [(row['period_start'], row['deposits'], row['transactions']) for row in response.json()['periods']],
+            [('2025-06-01', '30.00', 2), ('2025-07-01', '40.00', 1)]
+        )
+
+    def test_sharded_deposits_use_their_shards_slot(self):
+        sharding.set_shard_count(self.account.id, 2)
+        for _ in range(10):
+            ledger.deposit(self.user.id, Decimal("1.00"))
+
+        self.assertTrue(all(slot in (1, 2) for _, slot, _, _, _ in self.rollup_rows()))
+        self.assertEqual(self.get_summary().json()['totals']['deposits'], '10.00')
+
+    def test_pending_deposits_count_once_applied(self):
+        ledger.enqueue_deposit(self.user.id, Decimal("7.00"))
+        self.assertEqual(self.get_summary().json()['periods'], [])
+
+        ledger.apply_pending_deposits(batch_size=10)
+
+        self.assertEqual(self.get_summary().json()['totals']['deposits'], '7.00')
+
+    def test_rebuild_reproduces_incremental_rollups(self):
+        ledger.deposit(self.user.id, Decimal("50.00"))
+        ledger.withdraw(self.user.id, Decimal("20.00"))
+        ledger.transfer(self.user.id, "user2", Decimal("10.00"))
+        incremental = self.get_summary().json()
+        AccountDailyRollup.objects.all().delete()
+        out = StringIO()
+
+        call_command("rebuild_daily_rollups", stdout=out)
+
+        self.assertEqual(json.loads(out.getvalue())['rollups'], 2)
+        self.assertEqual(self.get_summary().json(), incremental)
+
+    def test_rebuild_day_corrects_rollups_in_place(self):
+        sharding.set_shard_count(self.account.id, 2)
+        for _ in range(4):
+            ledger.deposit(self.user.id, Decimal("1.00"))
+        ledger.withdraw(self.user.id, Decimal("3.00"))
+        AccountDailyRollup.objects.filter(account=self.account, slot=0).update(count=F('count') + 5)
+        rows = AccountDailyRollup.objects.filter(account=self.account).order_by('slot')
+        shard_slots = list(rows.filter(slot__gt=0).values_list('slot', flat=True))
+
+        corrected = rollups.rebuild_day(self.today)
+
+        self.assertEqual(corrected, 1 + len(shard_slots))
+        self.assertEqual(
+            list(rows.values_list('slot', 'deposit_sum', 'withdraw_sum', 'count')),
+            [(0, Decimal("4.00"), Decimal("3.00"), 5)] + [(slot, 0, 0, 0) for slot in shard_slots],
+        )
+        self.assertEqual(rollups.rebuild_day(self.today), 0)
+
+    def test_rebuild_skips_days_in_expired_partitions(self):
+        for day in (5, 6):
+            transaction = Transaction.objects.create(
+                account=self.account, transaction_type=Transaction.TransactionType.DEPOSIT, amount=Decimal("4.00")
+            )
+            Transaction.objects.filter(pk=transaction.pk).update(created_at=datetime(2030, day, 1, tzinfo=UTC))
+        call_command("rebuild_daily_rollups", from_date=date(2030, 5, 1), to_date=date(2030, 6, 1), stdout=StringIO())
+        partitions.ensure_partitions(date(2030, 5, 1), months_ahead=1)
+        partitions.expire_partitions(date(2030, 7, 1), retain_months=1)
+        out = StringIO()
+
+        call_command("rebuild_daily_rollups", from_date=date(2030, 5, 1), to_date=date(2030, 6, 1), stdout=out)
+
+        report = json.loads(out.getvalue())
+        self.assertEqual((report['skipped_expired_days'], report['days']), (31, 1))
+        self.assertEqual(
+            self.rollup_rows(),
+            [(date(2030, 5, 1), 0, Decimal("4.00"), 0, 1), (date(2030, 6, 1), 0, Decimal("4.00"), 0, 1)],
+        )
+        with self.assertRaises(rollups.ExpiredDay):
+            rollups.rebuild_day(date(2030, 5, 1))
+
+    def test_rebuild_accounts_builds_bulk_loaded_history(self):
+        Transaction.objects.bulk_create([
+            Transaction(account=self.account, transaction_type=Transaction.TransactionType.DEPOSIT, amount=5),
+            Transaction(account=self.account, transaction_type=Transaction.TransactionType.WITHDRAW, amount=2),
+        ])
+
+        rollups.rebuild_accounts([self.account.id])
+
+        self.assertEqual(self.rollup_rows(), [(self.today, 0, Decimal("5.00"), Decimal("2.00"), 2)])
+
+    def test_invalid_range_returns_400(self):
+        response = self.get_summary(**{'from': '2025-07-01', 'to': '2025-06-01'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('to', response.json())
+
+    def test_requires_authentication(self):
+        response = self.client.get(reverse("statement-summary"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
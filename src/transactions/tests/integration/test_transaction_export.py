@@ -0,0 +1,125 @@
+import csv
+import gzip
+import io
+import json
+
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from transactions.models.account import Account
+from transactions.models.transaction import Transaction
+from transactions.services import export
+
+
+@override_settings(TRANSACTIONS_EXPORT_CHUNK_SIZE=3)
+class TransactionExportTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="user1", password="testpass")
+        self.token = Token.objects.create(user=self.user)
+        account = Account.objects.create(user=self.user, balance=0)
+        deposit, withdraw = Transaction.TransactionType.DEPOSIT, Transaction.TransactionType.WITHDRAW
+        self.transactions = Transaction.objects.bulk_create(
+            Transaction(
+                account=account, transaction_type=deposit if i % 3 else withdraw, amount=Decimal(i) + Decimal("0.50")
+            )
+            for i in range(10)
+        )
+        other = Account.objects.create(user=User.objects.create_user(username="user2"), balance=0)
+        Transaction.objects.create(account=other, transaction_type=Transaction.TransactionType.DEPOSIT, amount=1)
+
+    def export(self, **params):
+        return self.client.get(reverse("transaction-export"), params, HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_csv_export_streams_every_own_transaction_oldest_first(self):
+        response = self.export()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="statement.csv"')
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], ['id', 'created_at', 'transaction_type', 'amount', 'status'])
+        self.assertEqual([int(row[0]) for row in rows[1:]], [transaction.pk for transaction in self.transactions])
+        self.assertEqual(rows[1][2:], ['withdraw', '0.50', 'applied'])
+
+    def test_ndjson_export(self):
+        response = self.export(format='ndjson')
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 10)
+        first = json.loads(lines[0])
+        self.assertEqual(
+            first,
+            {
+                'id': self.transactions[0].pk,
+                'created_at': first['created_at'],
+                'transaction_type': 'withdraw',
+                'amount': '0.50',
+                'status': 'applied',
+            }
+        )
+
+    def test_gzip_export_when_accepted(self):
+        response = self.client.get(
+            reverse("transaction-export"), {'format': 'ndjson'},
+            HTTP_AUTHORIZATION=f"Token {self.token.key}", HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        lines = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()
+        self.assertEqual(len(lines), 10)
+
+    def test_gzip_refused_with_zero_quality_is_not_used(self):
+        for accept_encoding in ('gzip;q=0, deflate', 'deflate', '*;q=0', 'br, *;q=0.5, gzip; q=0.0'):
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.client.get(
+                    reverse("transaction-export"), {'format': 'ndjson'},
+                    HTTP_AUTHORIZATION=f"Token {self.token.key}", HTTP_ACCEPT_ENCODING=accept_encoding
+                )
+
+                self.assertFalse(response.has_header('Content-Encoding'))
+                self.assertEqual(len(b''.join(response.streaming_content).decode().splitlines()), 10)
+
+    def test_export_filters(self):
+        response = self.export(format='ndjson', transaction_type='withdraw')
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['transaction_type'] for line in lines], ['withdraw'] * 4)
+
+    def test_invalid_format_returns_json_400(self):
+        response = self.export(format='xml')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('format', response.json())
+
+    def test_requires_authentication(self):
+        response = self.client.get(reverse("transaction-export"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TransactionExportCursorTest(TransactionTestCase):
+    def test_cursor_is_not_materialized_with_hold(self):
+        account = Account.objects.create(user=User.objects.create_user(username="user1"), balance=0)
+        Transaction.objects.bulk_create(
+            Transaction(account=account, transaction_type=Transaction.TransactionType.DEPOSIT, amount=1)
+            for _ in range(5)
+        )
+
+        chunks = export.stream(Transaction.objects.order_by('id'), 'ndjson', chunk_size=2)
+        next(chunks)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT is_holdable FROM pg_cursors")
+            holdable = [row[0] for row in cursor.fetchall()]
+        rest = list(chunks)
+
+        self.assertEqual(holdable, [False])
+        self.assertEqual(len(b''.join(rest).splitlines()), 3)
@@ -0,0 +1,130 @@
+import json
+
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.reverse import reverse
+
+from transactions.models.account import Account
+from transactions.models.transaction import Transaction
+from transactions.services import ledger
+from transactions.services.reconciliation import find_drift
+
+
+def post_deposit(client, token, amount):
+    return client.post(
+        reverse("deposit"),
+        data=json.dumps({"amount": amount}),
+        content_type="application/json",
+        HTTP_AUTHORIZATION=f"Token {token.key}"
+    )
+
+
+@override_settings(DEPOSIT_WRITE_BEHIND=True)
+class WriteBehindDepositTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="user1", password="testpass")
+        self.token = Token.objects.create(user=self.user)
+        self.account = Account.objects.create(user=self.user, balance=100)
+        Transaction.objects.create(
+            account=self.account, transaction_type=Transaction.TransactionType.DEPOSIT, amount=Decimal("100.00")
+        )
+
+    def test_deposit_is_accepted_as_pending_without_changing_the_balance(self):
+        response = post_deposit(self.client, self.token, "50.00")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        pending = Transaction.objects.get(status=Transaction.Status.PENDING)
+        self.assertEqual(
+            response.json(),
+            {'message': 'Deposit accepted', 'transaction_id': pending.id, 'status': 'pending'}
+        )
+        self.assertEqual(pending.amount, Decimal("50.00"))
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal("100.00"))
+
+    def test_pending_deposits_show_in_history_and_do_not_count_as_drift(self):
+        post_deposit(self.client, self.token, "50.00")
+
+        response = self.client.get(reverse("transaction-history"), HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+        self.assertEqual([row['status'] for row in response.json()['results']], ['pending', 'applied'])
+        self.assertEqual(list(find_drift(self.account.id, self.account.id + 1)), [])
+
+    def test_invalid_deposit_is_rejected_without_recording_anything(self):
+        response = post_deposit(self.client, self.token, "0.00")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Transaction.objects.count(), 1)
+
+    def test_worker_applies_each_accounts_deposits_with_one_update(self):
+        other = User.objects.create_user(username="user2", password="testpass")
+        Account.objects.create(user=other, balance=0)
+        for amount in ("10.00", "20.00", "30.00"):
+            ledger.enqueue_deposit(self.user.id, Decimal(amount))
+        ledger.enqueue_deposit(other.id, Decimal("5.00"))
+        out = StringIO()
+
+        # Claim, mark applied, lock the accounts, one UPDATE per account, one rollup upsert, plus this test's
+        # savepoint pair.
+        with self.assertNumQueries(8):
+            self.assertEqual(ledger.apply_pending_deposits(batch_size=100).accounts, 2)
+        call_command("apply_pending_transactions", stdout=out)
+
+        self.assertEqual(json.loads(out.getvalue())['transactions'], 0)
+        self.assertEqual(Account.objects.get(user=self.user).balance, Decimal("160.00"))
+        self.assertEqual(Account.objects.get(user=other).balance, Decimal("5.00"))
+        self.assertFalse(Transaction.objects.filter(status=Transaction.Status.PENDING).exists())
+        self.assertEqual(list(find_drift(self.account.id, self.account.id + 2)), [])
+
+    def test_worker_command_drains_the_queue_in_batches(self):
+        for _ in range(5):
+            ledger.enqueue_deposit(self.user.id, Decimal("1.00"))
+        out = StringIO()
+
+        call_command("apply_pending_transactions", batch_size=2, stdout=out)
+
+        report = json.loads(out.getvalue())
+        self.assertEqual((report['batches'], report['transactions'], report['account_updates']), (3, 5, 3))
+        self.assertEqual(Account.objects.get(user=self.user).balance, Decimal("105.00"))
+
+    def test_enqueue_for_a_user_without_account_raises(self):
+        user = User.objects.create_user(username="no_account", password="testpass")
+
+        with self.assertRaises(Account.DoesNotExist):
+            ledger.enqueue_deposit(user.id, Decimal("1.00"))
+
+
+class ConcurrentApplyWorkersTest(TransactionTestCase):
+    def test_concurrent_workers_apply_every_deposit_exactly_once(self):
+        users = [User.objects.create_user(username=f"user{i}", password="testpass") for i in range(5)]
+        for user in users:
+            Account.objects.create(user=user, balance=0)
+        for i in range(200):
+            ledger.enqueue_deposit(users[i % len(users)].id, Decimal("1.00"))
+
+        def drain(_):
+            applied = 0
+            try:
+                while batch := ledger.apply_pending_deposits(batch_size=7):
+                    if not batch.transactions:
+                        return applied
+                    applied += batch.transactions
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            applied = sum(executor.map(drain, range(4)))
+
+        self.assertEqual(applied, 200)
+        self.assertEqual(
+            list(Account.objects.order_by('user_id').values_list('balance', flat=True)), [Decimal("40.00")] * 5
+        )
+        self.assertFalse(Transaction.objects.filter(status=Transaction.Status.PENDING).exists())
@@ -0,0 +1,71 @@
+from decimal import Decimal
+
+from django.http import QueryDict
+from django.test import SimpleTestCase
+
+from transactions.amount_parser import parse_amount
+from transactions.serializers import TransactionSerializer
+
+PAYLOADS = [
+    {'amount': '100.00'},
+    {'amount': '0.01'},
+    {'amount': ' 12.5 '},
+    {'amount': '9999999999.99'},
+    {'amount': '1e2'},
+    {'amount': 100},
+    {'amount': 10.5},
+    {'amount': '0'},
+    {'amount': '0.00'},
+    {'amount': '-5'},
+    {'amount': '0.001'},
+    {'amount': '1.000'},
+    {'amount': '12345678901'},
+    {'amount': '10000000000.00'},
+    {'amount': '1e20'},
+    {'amount': 'nan'},
+    {'amount': 'Infinity'},
+    {'amount': '-inf'},
+    {'amount': 'abc'},
+    {'amount': ''},
+    {'amount': '1' * 1001},
+    {'amount': None},
+    {'amount': True},
+    {'amount': ['1.00']},
+    {'amount': {'value': '1.00'}},
+    {'amount': 0.001},
+    {'amount': 10 ** 12},
+    {'other': '1.00'},
+    {},
+    QueryDict('amount=15.25'),
+    QueryDict('amount='),
+    QueryDict('amount=1&amount=abc'),
+    None,
+    ['1.00'],
+    '1.00',
+]
+
+
+class ParseAmountTest(SimpleTestCase):
+    def test_matches_transaction_serializer(self):
+        for data in PAYLOADS:
+            with self.subTest(data=data):
+                serializer = TransactionSerializer(data=data)
+                if serializer.is_valid():
+                    expected = (serializer.validated_data['amount'], None)
+                else:
+                    expected = (None, serializer.errors)
+
+                amount, errors = parse_amount(data)
+
+                self.assertEqual((amount, errors), expected)
+                if errors is not None:
+                    # Codes matter too: they end up in exception handlers and logs.
+                    self.assertEqual(
+                        {field: [e.code for e in detail] for field, detail in errors.items()},
+                        {field: [e.code for e in detail] for field, detail in expected[1].items()},
+                    )
+                else:
+                    self.assertEqual(str(amount), str(expected[0]))
+
+    def test_valid_amount_is_quantized(self):
+        self.assertEqual(parse_amount({'amount': '7.5'}), (Decimal('7.50'), None))
@@ -1,11 +1,21 @@
 from django.urls import path
 
 from transactions.views.balance_view import BalanceView
+from transactions.views.batch_transaction_view import BatchTransactionView
 from transactions.views.deposit_view import DepositView
+from transactions.views.statement_summary_view import StatementSummaryView
+from transactions.views.transaction_export_view import TransactionExportView
+from transactions.views.transaction_history_view import TransactionHistoryView
+from transactions.views.transfer_view import TransferView
 from transactions.views.withdraw_view import WithdrawView
 
 urlpatterns = [
     path('deposit/', DepositView.as_view(), name='deposit'),
     path('withdraw/', WithdrawView.as_view(), name='withdraw'),
     path('balance/', BalanceView.as_view(), name='balance'),
+    path('transfer/', TransferView.as_view(), name='transfer'),
+    path('transactions/', TransactionHistoryView.as_view(), name='transaction-history'),
+    path('transactions/export/', TransactionExportView.as_view(), name='transaction-export'),
+    path('transactions/batch/', BatchTransactionView.as_view(), name='transaction-batch'),
+    path('statement/summary/', StatementSummaryView.as_view(), name='statement-summary'),
 ]
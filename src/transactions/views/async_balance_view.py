@@ -0,0 +1,29 @@
+import logging
+
+from django.http import HttpRequest, HttpResponseBase
+from rest_framework import status
+
+from transactions.models.account import Account
+from transactions.serializers import BalanceSerializer
+from transactions.services import balance_cache, etags
+from transactions.services.sharding import total_balance
+from transactions.views.async_api_view import AsyncAPIView
+
+logger = logging.getLogger(__name__)
+
+
+# Async version of BalanceView, served when API_ASYNC_VIEWS is enabled.
+class AsyncBalanceView(AsyncAPIView):
+    async def get(self, request: HttpRequest) -> HttpResponseBase:
+        balance = await balance_cache.aget_balance(
+            request.user.id,
+            lambda using: Account.objects.db_manager(using).annotate(total=total_balance()).values_list(
+                'total', flat=True
+            ).aget(user_id=request.user.id)
+        )
+        tag = etags.etag('json', balance)
+        if etags.matches(request, tag):
+            return etags.not_modified(tag)
+        logger.info("Balance requested", extra={'user': request.user.username, 'balance': balance})
+        serializer = BalanceSerializer({'balance': balance})
+        return etags.tag_response(self.respond(serializer.data, status=status.HTTP_200_OK), tag)
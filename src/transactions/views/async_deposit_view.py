@@ -0,0 +1,35 @@
+import logging
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, JsonResponse
+from rest_framework import status
+
+from transactions.amount_parser import parse_amount
+from transactions.services import idempotency
+from transactions.views.async_api_view import AsyncAPIView
+from transactions.views.deposit_view import DepositView
+
+logger = logging.getLogger(__name__)
+
+
+# Async version of DepositView, served when API_ASYNC_VIEWS is enabled. The deposit itself is DepositView.perform,
+# moved off the event loop; only parsing and the response differ.
+class AsyncDepositView(AsyncAPIView):
+    async def post(self, request: HttpRequest) -> JsonResponse:
+        data = self.parse_data(request)
+        amount, errors = parse_amount(data)
+        if errors is None:
+            key = request.headers.get(idempotency.HEADER)
+            if key is not None:
+                result = await idempotency.arun(
+                    request.user.id, key, request.path, data,
+                    lambda: DepositView.perform(request.user, amount)
+                )
+                response = self.respond(result.body, status=result.status_code)
+                for header, value in result.headers.items():
+                    response[header] = value
+                return response
+            body, status_code = await sync_to_async(DepositView.perform)(request.user, amount)
+            return self.respond(body, status=status_code)
+        logger.warning("Deposit rejected: invalid data", extra={'user': request.user.username, 'errors': errors})
+        return self.respond(errors, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,75 @@
+import asyncio
+import json
+import logging
+
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest, StreamingHttpResponse
+from rest_framework import exceptions
+from rest_framework.utils.encoders import JSONEncoder
+
+from transactions.models.account import Account
+from transactions.serializers import BalanceSerializer
+from transactions.services import balance_notifications
+from transactions.services.sharding import total_balance
+from transactions.views.async_api_view import AsyncAPIView
+
+logger = logging.getLogger(__name__)
+
+
+def read_balance(user_id: int) -> Decimal:
+    # Each stream reads from its request's own thread, whose connection would otherwise stay open for as long as
+    # the client is connected. Closing it after every read keeps idle streams off the database (with pooling on,
+    # the connection goes back to the pool).
+    try:
+        return (
+            Account.objects.using(DEFAULT_DB_ALIAS)
+            .annotate(total=total_balance())
+            .values_list('total', flat=True)
+            .get(user_id=user_id)
+        )
+    finally:
+        connections[DEFAULT_DB_ALIAS].close()
+
+
+def balance_event(balance) -> str:
+    data = json.dumps(BalanceSerializer({'balance': balance}).data, cls=JSONEncoder)
+    return f"event: balance\ndata: {data}\n\n"
+
+
+# Streams the authenticated user's balance as server-sent events: the current balance first, then the new one
+# each time it changes. A connected client costs an idle coroutine and a subscription to the process's shared
+# LISTEN connection; the balance is only read when a notification arrives. It is read from the primary and not
+# from the balance cache, whose entry may not have been invalidated yet when the notification arrives.
+class BalanceStreamView(AsyncAPIView):
+    async def get(self, request: HttpRequest) -> StreamingHttpResponse:
+        if not balance_notifications.is_enabled():
+            raise exceptions.NotFound()
+        logger.info("Balance stream opened", extra={'user': request.user.username})
+        response = StreamingHttpResponse(self.events(request.user.id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Tells nginx not to buffer the stream.
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def events(self, user_id: int):
+        # Subscribing before the first read means a change made in between is not missed.
+        changed = balance_notifications.listener.subscribe(user_id)
+        sent = None
+        try:
+            while True:
+                changed.clear()
+                balance = await sync_to_async(read_balance)(user_id)
+                if balance != sent:
+                    yield balance_event(balance)
+                    sent = balance
+                while not changed.is_set():
+                    try:
+                        await asyncio.wait_for(changed.wait(), timeout=settings.BALANCE_STREAM_KEEPALIVE_SECONDS)
+                    except TimeoutError:
+                        yield ": keepalive\n\n"
+        finally:
+            balance_notifications.listener.unsubscribe(user_id, changed)
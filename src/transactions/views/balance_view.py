@@ -1,24 +1,37 @@
 import logging
 
-from drf_spectacular.utils import OpenApiExample, OpenApiResponse, extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiExample, OpenApiParameter, OpenApiResponse, extend_schema
 from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from transactions.models.account import Account
 from transactions.serializers import BalanceSerializer
+from transactions.services import balance_cache, etags
+from transactions.services.sharding import total_balance
 
 logger = logging.getLogger(__name__)
 
+IF_NONE_MATCH_PARAMETER = OpenApiParameter(
+    'If-None-Match', OpenApiTypes.STR, OpenApiParameter.HEADER,
+    description="ETag of a previous response; 304 with no body is returned while it still matches."
+)
 
+
+# The ETag is derived from the balance itself, so a poll that finds it unchanged gets a 304 without serializing
+# or rendering anything, and without touching the database when the balance is cached.
 class BalanceView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     @extend_schema(
+        parameters=[IF_NONE_MATCH_PARAMETER],
         responses={
             200: OpenApiResponse(
                 response=BalanceSerializer,
                 description="Current balance of the authenticated user's account."
-            )
+            ),
+            304: OpenApiResponse(description="The balance has not changed since the ETag was issued", response=None),
         },
         description="Retrieve the current balance of the authenticated user's account.",
         examples=[
@@ -30,7 +43,15 @@ class BalanceView(APIView):
         ]
     )
     def get(self, request):
-        account = request.user.account
-        logger.info(f"User {request.user.username} requested balance. Current balance: {account.balance}")
-        serializer = BalanceSerializer(account)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        balance = balance_cache.get_balance(
+            request.user.id,
+            lambda using: Account.objects.db_manager(using).annotate(total=total_balance()).values_list(
+                'total', flat=True
+            ).get(user_id=request.user.id)
+        )
+        tag = etags.etag(request.accepted_renderer.format, balance)
+        if etags.matches(request, tag):
+            return etags.not_modified(tag)
+        logger.info("Balance requested", extra={'user': request.user.username, 'balance': balance})
+        serializer = BalanceSerializer({'balance': balance})
+        return etags.tag_response(Response(serializer.data, status=status.HTTP_200_OK), tag)
@@ -0,0 +1,94 @@
+import logging
+
+from drf_spectacular.utils import OpenApiExample, OpenApiResponse, extend_schema
+from rest_framework import permissions, status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from transactions.serializers import BatchTransactionSerializer
+from transactions.services import ledger
+
+logger = logging.getLogger(__name__)
+
+
+class BatchTransactionView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        request=BatchTransactionSerializer,
+        responses={
+            200: OpenApiResponse(
+                description="Batch processed. Each operation reports whether it was applied.",
+                response=None
+            ),
+            400: OpenApiResponse(
+                description="Invalid data, or an all-or-nothing batch rejected because of insufficient funds",
+                response=None
+            )
+        },
+        description=(
+            "Apply a list of deposits and withdrawals, in order, to the authenticated user's account "
+            "with a single balance update."
+        ),
+        examples=[
+            OpenApiExample(
+                'All-or-nothing batch example',
+                value={
+                    "mode": "all_or_nothing",
+                    "operations": [
+                        {"type": "deposit", "amount": "100.00"},
+                        {"type": "withdraw", "amount": "30.00"}
+                    ]
+                },
+                request_only=True
+            ),
+            OpenApiExample(
+                'Best-effort batch response example',
+                value={
+                    "message": "Batch processed",
+                    "new_balance": 70.0,
+                    "results": [
+                        {"index": 0, "type": "withdraw", "amount": 30.0, "status": "applied"},
+                        {
+                            "index": 1,
+                            "type": "withdraw",
+                            "amount": 500.0,
+                            "status": "rejected",
+                            "error": "Insufficient funds"
+                        }
+                    ]
+                },
+                response_only=True
+            )
+        ]
+    )
+    def post(self, request: Request) -> Response:
+        serializer = BatchTransactionSerializer(data=request.data)
+        if serializer.is_valid():
+            operations = serializer.validated_data['operations']
+            all_or_nothing = serializer.validated_data['mode'] == BatchTransactionSerializer.Mode.ALL_OR_NOTHING
+            result = ledger.apply_batch(request.user.id, operations, all_or_nothing=all_or_nothing)
+
+            if not result.accepted:
+                logger.warning(
+                    "Batch rejected: insufficient funds",
+                    extra={'user': request.user.username, 'operations': len(operations)}
+                )
+                return Response(
+                    {'error': 'Insufficient funds', 'balance': result.balance, 'results': result.results},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            logger.info(
+                "Batch processed",
+                extra={'user': request.user.username, 'operations': len(operations), 'new_balance': result.balance}
+            )
+            return Response(
+                {'message': 'Batch processed', 'new_balance': result.balance, 'results': result.results},
+                status=status.HTTP_200_OK
+            )
+        logger.warning(
+            "Batch rejected: invalid data", extra={'user': request.user.username, 'errors': serializer.errors}
+        )
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -2,36 +2,58 @@ import logging
 
 from decimal import Decimal
 
-from django.db import transaction
-from drf_spectacular.utils import OpenApiExample, OpenApiResponse, extend_schema
+from django.conf import settings
+from django.contrib.auth.models import User
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiExample, OpenApiParameter, OpenApiResponse, extend_schema
 from rest_framework import permissions, status
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from transactions.models import Account
-from transactions.models.transaction import Transaction
+from transactions.amount_parser import parse_amount
 from transactions.serializers import TransactionSerializer
+from transactions.services import idempotency, ledger
 
 logger = logging.getLogger(__name__)
 
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    idempotency.HEADER, OpenApiTypes.STR, OpenApiParameter.HEADER,
+    description=(
+        "Optional client-chosen key, unique per operation. A retry with the same key and body is not applied "
+        "again: it gets the first response back, with an Idempotent-Replayed: true header."
+    )
+)
+
 
 class DepositView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     @extend_schema(
         request=TransactionSerializer,
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
         responses={
             200: OpenApiResponse(
                 description="Deposit successful",
                 response=None
             ),
+            202: OpenApiResponse(
+                description="Deposit recorded as pending; the balance is updated shortly (write-behind mode)",
+                response=None
+            ),
             400: OpenApiResponse(
                 description="Invalid data",
                 response=None
+            ),
+            422: OpenApiResponse(
+                description="Idempotency-Key already used for a different request",
+                response=None
             )
         },
-        description="Deposit an amount into the authenticated user's account.",
+        description=(
+            "Deposit an amount into the authenticated user's account. With DEPOSIT_WRITE_BEHIND enabled, the "
+            "deposit is recorded as pending and applied to the balance by the apply_pending_transactions worker."
+        ),
         examples=[
             OpenApiExample(
                 'Valid deposit example',
@@ -46,23 +68,28 @@ class DepositView(APIView):
         ]
     )
     def post(self, request: Request) -> Response:
-        serializer = TransactionSerializer(data=request.data)
-        if serializer.is_valid():
-            amount: Decimal = serializer.validated_data['amount']
-            account: Account = request.user.account
+        amount, errors = parse_amount(request.data)
+        if errors is None:
+            result = idempotency.run(
+                request.user.id, request.headers.get(idempotency.HEADER), request.path, request.data,
+                lambda: self.perform(request.user, amount)
+            )
+            return Response(result.body, status=result.status_code, headers=result.headers)
+        logger.warning("Deposit rejected: invalid data", extra={'user': request.user.username, 'errors': errors})
+        return Response(errors, status=status.HTTP_400_BAD_REQUEST)
 
-            with transaction.atomic():
-                account.balance += amount
-                account.save()
-                Transaction.objects.create(
-                    account=account,
-                    transaction_type=Transaction.TransactionType.DEPOSIT,
-                    amount=amount
-                )
-            logger.info(f"User {request.user.username} deposited {amount}. New balance: {account.balance}")
-            return Response(
-                {'message': 'Deposit successful', 'new_balance': account.balance},
-                status=status.HTTP_200_OK
+    @staticmethod
+    def perform(user: User, amount: Decimal) -> tuple[dict, int]:
+        """Deposit `amount` into the user's account; return the response body and status."""
+        if settings.DEPOSIT_WRITE_BEHIND:
+            transaction_id = ledger.enqueue_deposit(user.id, amount)
+            logger.info(
+                "Deposit queued", extra={'user': user.username, 'amount': amount, 'transaction_id': transaction_id}
+            )
+            return (
+                {'message': 'Deposit accepted', 'transaction_id': transaction_id, 'status': 'pending'},
+                status.HTTP_202_ACCEPTED
             )
-        logger.warning(f"User {request.user.username} failed to deposit. Errors: {serializer.errors}")
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        new_balance = ledger.deposit(user.id, amount)
+        logger.info("Deposit succeeded", extra={'user': user.username, 'amount': amount, 'new_balance': new_balance})
+        return {'message': 'Deposit successful', 'new_balance': new_balance}, status.HTTP_200_OK
@@ -0,0 +1,71 @@
+import logging
+
+from decimal import Decimal
+
+from drf_spectacular.utils import OpenApiExample, OpenApiResponse, extend_schema
+from rest_framework import permissions, status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from transactions.serializers import StatementSummaryFilterSerializer, StatementSummarySerializer
+from transactions.services import rollups
+
+logger = logging.getLogger(__name__)
+
+
+class StatementSummaryView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        parameters=[StatementSummaryFilterSerializer],
+        responses={
+            200: OpenApiResponse(
+                response=StatementSummarySerializer,
+                description="Deposit and withdrawal totals of the authenticated user's account, per day or month."
+            ),
+            400: OpenApiResponse(description="Invalid filters", response=None),
+        },
+        description=(
+            "Summarize the authenticated user's applied transactions between two days, grouped by day or month. "
+            "Served from per-day rollups, so the cost grows with the number of days, not of transactions. "
+            "Periods without transactions are omitted."
+        ),
+        examples=[
+            OpenApiExample(
+                'Monthly summary',
+                value={
+                    "from": "2025-06-01",
+                    "to": "2025-08-01",
+                    "period": "month",
+                    "totals": {"deposits": "1500.00", "withdrawals": "420.50", "transactions": 12},
+                    "periods": [
+                        {"period_start": "2025-06-01", "deposits": "1000.00", "withdrawals": "300.00",
+                         "transactions": 7},
+                        {"period_start": "2025-07-01", "deposits": "500.00", "withdrawals": "120.50",
+                         "transactions": 5},
+                    ]
+                },
+                response_only=True
+            )
+        ]
+    )
+    def get(self, request: Request) -> Response:
+        filters = StatementSummaryFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            logger.warning(
+                "Summary rejected: invalid filters", extra={'user': request.user.username, 'errors': filters.errors}
+            )
+            return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        start, end, period = (filters.validated_data[key] for key in ('from', 'to', 'period'))
+        periods = rollups.summary(request.user.id, start, end, period)
+        totals = {
+            'deposits': sum((row['deposits'] for row in periods), Decimal('0.00')),
+            'withdrawals': sum((row['withdrawals'] for row in periods), Decimal('0.00')),
+            'transactions': sum(row['transactions'] for row in periods),
+        }
+        serializer = StatementSummarySerializer(
+            {'from': start, 'to': end, 'period': period, 'totals': totals, 'periods': periods}
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
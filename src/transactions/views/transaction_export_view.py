@@ -0,0 +1,86 @@
+import logging
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from rest_framework import permissions, status
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from transactions.models.transaction import Transaction
+from transactions.serializers import TransactionExportFilterSerializer
+from transactions.services import export
+
+logger = logging.getLogger(__name__)
+
+
+# `format` picks the export format here, not a DRF renderer; errors are always rendered with the first renderer.
+class ExportContentNegotiation(DefaultContentNegotiation):
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class TransactionExportView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    content_negotiation_class = ExportContentNegotiation
+
+    @extend_schema(
+        parameters=[
+            TransactionExportFilterSerializer,
+            OpenApiParameter(
+                'Accept-Encoding', OpenApiTypes.STR, OpenApiParameter.HEADER,
+                description="Send `gzip` to receive the export gzip-compressed."
+            ),
+        ],
+        responses={
+            (200, 'text/csv'): OpenApiResponse(
+                response=OpenApiTypes.STR,
+                description="The statement, oldest transaction first, with a header row."
+            ),
+            (200, 'application/x-ndjson'): OpenApiResponse(
+                response=OpenApiTypes.STR,
+                description="The statement, oldest transaction first, one JSON object per line."
+            ),
+            400: OpenApiResponse(description="Invalid filters", response=None),
+        },
+        description=(
+            "Download all of the authenticated user's transactions, oldest first, as CSV or newline-delimited "
+            "JSON. The file is streamed from a database cursor, so exports of any length are supported."
+        ),
+    )
+    def get(self, request: Request) -> Response | StreamingHttpResponse:
+        filters = TransactionExportFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            logger.warning(
+                "Export rejected: invalid filters", extra={'user': request.user.username, 'errors': filters.errors}
+            )
+            return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = Transaction.objects.filter(account__user_id=request.user.id).order_by('created_at', 'id')
+        if 'transaction_type' in filters.validated_data:
+            queryset = queryset.filter(transaction_type=filters.validated_data['transaction_type'])
+        if 'from' in filters.validated_data:
+            queryset = queryset.filter(created_at__gte=filters.validated_data['from'])
+        if 'to' in filters.validated_data:
+            queryset = queryset.filter(created_at__lt=filters.validated_data['to'])
+
+        # The rows are read while the response streams, after the request has left the middleware; choose the
+        # database (a replica, unless the user is pinned to the primary) now.
+        queryset = queryset.using(queryset.db)
+
+        export_format = filters.validated_data['format']
+        content_type, _ = export.FORMATS[export_format]
+        content = export.stream(queryset, export_format, settings.TRANSACTIONS_EXPORT_CHUNK_SIZE)
+        gzipped = export.accepts_gzip(request.headers.get('Accept-Encoding', ''))
+        response = StreamingHttpResponse(compress_sequence(content) if gzipped else content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="statement.{export_format}"'
+        if gzipped:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        logger.info("Export started", extra={'user': request.user.username, 'export_format': export_format})
+        return response
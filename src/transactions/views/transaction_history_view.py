@@ -0,0 +1,95 @@
+import logging
+
+from django.http import HttpResponseNotModified
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiExample, OpenApiParameter, OpenApiResponse, extend_schema, inline_serializer
+from rest_framework import permissions, serializers, status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from transactions.models.transaction import Transaction
+from transactions.pagination import KeysetPagination
+from transactions.serializers import TransactionHistoryFilterSerializer, TransactionHistorySerializer
+from transactions.services import etags
+from transactions.views.balance_view import IF_NONE_MATCH_PARAMETER
+
+logger = logging.getLogger(__name__)
+
+
+# A page's ETag covers the request URL and the id and updated_at of each row on it (plus whether there is a next
+# page), which determine the whole body; an unchanged page gets a 304 without being serialized or rendered.
+class TransactionHistoryView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    @extend_schema(
+        parameters=[
+            TransactionHistoryFilterSerializer,
+            OpenApiParameter('cursor', OpenApiTypes.STR, description="Cursor returned in `next`."),
+            OpenApiParameter(
+                'page_size', OpenApiTypes.INT,
+                description=f"Results per page (max {KeysetPagination.max_page_size})."
+            ),
+            IF_NONE_MATCH_PARAMETER,
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=inline_serializer(
+                    name='TransactionHistoryPage',
+                    fields={
+                        'next': serializers.URLField(allow_null=True),
+                        'results': TransactionHistorySerializer(many=True),
+                    }
+                ),
+                description="A page of the authenticated user's transactions, newest first."
+            ),
+            304: OpenApiResponse(description="The page has not changed since the ETag was issued", response=None),
+            400: OpenApiResponse(description="Invalid filters", response=None),
+            404: OpenApiResponse(description="Invalid cursor", response=None),
+        },
+        description="List the authenticated user's transactions, newest first, using cursor pagination.",
+        examples=[
+            OpenApiExample(
+                'Transaction history page',
+                value={
+                    "next": "http://localhost:8000/api/transactions/?cursor=MjAyNS0wNy0xN1QyMjowODowMCswMDowMHw0Mg%3D%3D",
+                    "results": [
+                        {
+                            "id": 43,
+                            "transaction_type": "deposit",
+                            "amount": "100.00",
+                            "created_at": "2025-07-17T22:09:00Z"
+                        }
+                    ]
+                },
+                response_only=True
+            )
+        ]
+    )
+    def get(self, request: Request) -> Response | HttpResponseNotModified:
+        filters = TransactionHistoryFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            logger.warning(
+                "History rejected: invalid filters", extra={'user': request.user.username, 'errors': filters.errors}
+            )
+            return Response(filters.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = Transaction.objects.filter(account__user_id=request.user.id)
+        if 'transaction_type' in filters.validated_data:
+            queryset = queryset.filter(transaction_type=filters.validated_data['transaction_type'])
+        if 'from' in filters.validated_data:
+            queryset = queryset.filter(created_at__gte=filters.validated_data['from'])
+        if 'to' in filters.validated_data:
+            queryset = queryset.filter(created_at__lt=filters.validated_data['to'])
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        tag = etags.etag(
+            request.accepted_renderer.format, request.build_absolute_uri(), paginator.has_next,
+            *(f"{row.pk}:{row.updated_at.isoformat()}" for row in page)
+        )
+        if etags.matches(request, tag):
+            return etags.not_modified(tag)
+        serializer = TransactionHistorySerializer(page, many=True)
+        return etags.tag_response(paginator.get_paginated_response(serializer.data), tag)
@@ -0,0 +1,90 @@
+import logging
+
+from decimal import Decimal
+
+from drf_spectacular.utils import OpenApiExample, OpenApiResponse, extend_schema
+from rest_framework import permissions, status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from transactions.models.account import Account
+from transactions.serializers import TransferSerializer
+from transactions.services import ledger
+
+logger = logging.getLogger(__name__)
+
+
+class TransferView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(
+        request=TransferSerializer,
+        responses={
+            200: OpenApiResponse(
+                description="Transfer successful",
+                response=None
+            ),
+            400: OpenApiResponse(
+                description="Invalid data, unknown recipient, transfer to oneself or insufficient funds",
+                response=None
+            )
+        },
+        description=(
+            "Move an amount from the authenticated user's account to another user's account, "
+            "atomically."
+        ),
+        examples=[
+            OpenApiExample(
+                'Valid transfer example',
+                value={"to_username": "user2", "amount": "25.00"},
+                request_only=True
+            ),
+            OpenApiExample(
+                'Transfer response example',
+                value={"message": "Transfer successful", "new_balance": 75.0},
+                response_only=True
+            )
+        ]
+    )
+    def post(self, request: Request) -> Response:
+        serializer = TransferSerializer(data=request.data)
+        if serializer.is_valid():
+            amount: Decimal = serializer.validated_data['amount']
+            to_username: str = serializer.validated_data['to_username']
+
+            try:
+                new_balance = ledger.transfer(request.user.id, to_username, amount)
+            except Account.DoesNotExist:
+                logger.warning(
+                    "Transfer rejected: unknown recipient",
+                    extra={'user': request.user.username, 'recipient': to_username}
+                )
+                return Response({'error': 'Recipient not found'}, status=status.HTTP_400_BAD_REQUEST)
+            except ledger.SameAccountTransfer:
+                return Response(
+                    {'error': 'Cannot transfer to your own account'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            except ledger.InsufficientFunds:
+                logger.warning(
+                    "Transfer rejected: insufficient funds",
+                    extra={'user': request.user.username, 'amount': amount, 'recipient': to_username}
+                )
+                return Response({'error': 'Insufficient funds'}, status=status.HTTP_400_BAD_REQUEST)
+
+            logger.info(
+                "Transfer succeeded",
+                extra={
+                    'user': request.user.username, 'amount': amount, 'recipient': to_username,
+                    'new_balance': new_balance,
+                }
+            )
+            return Response(
+                {'message': 'Transfer successful', 'new_balance': new_balance},
+                status=status.HTTP_200_OK
+            )
+        logger.warning(
+            "Transfer rejected: invalid data", extra={'user': request.user.username, 'errors': serializer.errors}
+        )
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
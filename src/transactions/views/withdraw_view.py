@@ -2,16 +2,17 @@ import logging
 
 from decimal import Decimal
 
-from django.db import transaction
+from django.contrib.auth.models import User
 from drf_spectacular.utils import OpenApiExample, OpenApiResponse, extend_schema
 from rest_framework import permissions, status
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from transactions.models import Account
-from transactions.models.transaction import Transaction
+from transactions.amount_parser import parse_amount
 from transactions.serializers import TransactionSerializer
+from transactions.services import idempotency, ledger
+from transactions.views.deposit_view import IDEMPOTENCY_KEY_PARAMETER
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +22,7 @@ class WithdrawView(APIView):
 
     @extend_schema(
         request=TransactionSerializer,
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
         responses={
             200: OpenApiResponse(
                 description="Withdrawal successful",
@@ -29,6 +31,10 @@ class WithdrawView(APIView):
             400: OpenApiResponse(
                 description="Invalid data or insufficient funds",
                 response=None
+            ),
+            422: OpenApiResponse(
+                description="Idempotency-Key already used for a different request",
+                response=None
             )
         },
         description="Withdraw an amount from the authenticated user's account.",
@@ -46,35 +52,28 @@ class WithdrawView(APIView):
         ]
     )
     def post(self, request: Request) -> Response:
-        serializer = TransactionSerializer(data=request.data)
-        if serializer.is_valid():
-            amount: Decimal = serializer.validated_data['amount']
-            account: Account = request.user.account
+        amount, errors = parse_amount(request.data)
+        if errors is None:
+            result = idempotency.run(
+                request.user.id, request.headers.get(idempotency.HEADER), request.path, request.data,
+                lambda: self.perform(request.user, amount)
+            )
+            return Response(result.body, status=result.status_code, headers=result.headers)
+        logger.warning("Withdrawal rejected: invalid data", extra={'user': request.user.username, 'errors': errors})
+        return Response(errors, status=status.HTTP_400_BAD_REQUEST)
 
-            logger.info(f"User {request.user.username} is attempting to withdraw {amount}.")
+    @staticmethod
+    def perform(user: User, amount: Decimal) -> tuple[dict, int]:
+        """Withdraw `amount` from the user's account; return the response body and status."""
+        logger.info("Withdrawal attempted", extra={'user': user.username, 'amount': amount})
 
-            if account.balance < amount:
-                logger.warning(
-                    f"User {request.user.username} attempted to withdraw {amount} but has insufficient "
-                    f"funds (balance: {account.balance})."
-                )
-                return Response(
-                    {'error': 'Insufficient funds'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+        try:
+            new_balance = ledger.withdraw(user.id, amount)
+        except ledger.InsufficientFunds:
+            logger.warning("Withdrawal rejected: insufficient funds", extra={'user': user.username, 'amount': amount})
+            return {'error': 'Insufficient funds'}, status.HTTP_400_BAD_REQUEST
 
-            with transaction.atomic():
-                account.balance -= amount
-                account.save()
-                Transaction.objects.create(
-                    account=account,
-                    transaction_type=Transaction.TransactionType.WITHDRAW,
-                    amount=amount
-                )
-            logger.info(f"User {request.user.username} successfully withdrew {amount}. New balance: {account.balance}")
-            return Response(
-                {'message': 'Withdrawal successful', 'new_balance': account.balance},
-                status=status.HTTP_200_OK
-            )
-        logger.warning(f"User {request.user.username} submitted invalid withdrawal data. Errors: {serializer.errors}")
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        logger.info(
+            "Withdrawal succeeded", extra={'user': user.username, 'amount': amount, 'new_balance': new_balance}
+        )
+        return {'message': 'Withdrawal successful', 'new_balance': new_balance}, status.HTTP_200_OK